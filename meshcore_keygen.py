@@ -56,14 +56,41 @@ import multiprocessing as mp
 import platform
 import subprocess
 import argparse
+import bz2
+import cProfile
+import contextlib
+import faulthandler
+import gzip
 import hashlib
+import heapq
+import io
+import ipaddress
+import itertools
+import lzma
+import math
+import pstats
+import queue
 import secrets
+import shlex
+import shutil
+import signal
+import socket
+import socketserver
+import sqlite3
+import struct
+import tempfile
 import gc
+import json
+import sys
 import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass
 from typing import Optional, Tuple, Dict, Any, List
 from enum import Enum
+from fractions import Fraction
 from multiprocessing import Manager
 import concurrent.futures
 
@@ -77,8 +104,8 @@ try:
     PSUTIL_AVAILABLE = True
 except ImportError:
     PSUTIL_AVAILABLE = False
-    print("Warning: psutil not installed. Health monitoring will be limited.")
-    print("Install with: pip install psutil")
+    print("Warning: psutil not installed. Health monitoring will be limited.", file=sys.stderr)
+    print("Install with: pip install psutil", file=sys.stderr)
 
 # Try to import tqdm for progress bars
 try:
@@ -86,8 +113,29 @@ try:
     TQDM_AVAILABLE = True
 except ImportError:
     TQDM_AVAILABLE = False
-    print("Warning: tqdm not installed. Progress bars will be disabled.")
-    print("Install with: pip install tqdm")
+    print("Warning: tqdm not installed. Progress bars will be disabled.", file=sys.stderr)
+    print("Install with: pip install tqdm", file=sys.stderr)
+
+# Try to import numpy for --corpus-analyze
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Peak resident memory for the duplicate check summary (Unix only)
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Worker heartbeats use multiprocessing.shared_memory (Python 3.8+)
+try:
+    from multiprocessing import shared_memory
+    SHARED_MEMORY_AVAILABLE = True
+except ImportError:
+    SHARED_MEMORY_AVAILABLE = False
 
 
 class VanityMode(Enum):
@@ -166,6 +214,17 @@ class VanityConfig:
     watchlist_patterns: List[WatchlistPattern] = None  # Loaded watchlist patterns
     health_check: bool = True # Default to True for health monitoring
     verbose: bool = False # Default to False for clean output
+    metrics_port: Optional[int] = None  # Serve Prometheus metrics on this port
+    metrics_bind: str = '127.0.0.1'  # Address the metrics endpoint listens on
+    events_file: Optional[str] = None  # JSONL telemetry sink ('-' for stdout)
+    profile_dir: Optional[str] = None  # Directory for per-worker cProfile dumps
+    profile_window: int = 30  # Seconds each worker runs under the profiler
+    stage_sample: int = 1000  # Time the pipeline stages of every Nth key (0 disables)
+    hits_db: Optional[str] = None  # SQLite file for watchlist and main hits instead of key files
+    control_socket: Optional[str] = None  # Unix socket accepting runtime control commands
+    cpu_budget: Optional[float] = None  # Percent of all cores the workers may use together
+    idle_priority: bool = False  # Run workers under SCHED_IDLE / nice 19
+    proc_root: str = '/proc'  # Where host CPU statistics are read for contention detection
 
 
 @dataclass
@@ -187,6 +246,106 @@ class BatchResult:
     attempts: int
     found_key: Optional[KeyInfo] = None
     batch_completed: bool = True
+    retired: bool = False  # Worker left the pool after a 'workers' control command
+
+
+def config_to_dict(config: VanityConfig) -> Dict[str, Any]:
+    """Return a JSON-serializable view of a VanityConfig."""
+    data = {}
+    for name in VanityConfig.__dataclass_fields__:
+        value = getattr(config, name)
+        if isinstance(value, Enum):
+            value = value.value
+        elif name == 'watchlist_patterns':
+            value = [pattern.pattern for pattern in value] if value else []
+        data[name] = value
+    return data
+
+
+# Pipeline stages timed by the sampled per-stage instrumentation
+KEYGEN_STAGES = ('entropy', 'hashing', 'scalarmult', 'matching', 'watchlist')
+
+
+# Upper bounds (seconds) of the batch latency histogram buckets
+BATCH_LATENCY_BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, float('inf'))
+
+
+def worker_stats_key(worker_id: int) -> str:
+    """Return the shared state key a worker publishes its statistics under."""
+    return f'worker_{worker_id}_stats'
+
+
+def new_worker_stats(worker_id: int) -> Dict[str, Any]:
+    """Create an empty per-worker statistics record."""
+    return {
+        'worker_id': worker_id,
+        'pid': os.getpid(),
+        'attempts': 0,
+        'batches': 0,
+        'batch_time_total': 0.0,
+        'last_rate': 0.0,
+        'latency_buckets': [0] * len(BATCH_LATENCY_BUCKETS),
+        'watchlist_hits': {},
+        'memory_usage': 0,
+        'cpu_usage': 0.0,
+        'stage_samples': 0,
+        'stage_ns': {stage: 0 for stage in KEYGEN_STAGES},
+        'cpu_time': 0.0,  # CPU seconds used by the search loop
+        'throttled': 0.0,  # Seconds slept by the CPU budget governor
+        'priority': None,  # Scheduling policy applied by --idle-priority
+        'updated': time.time()
+    }
+
+
+def merge_stage_stats(stats_list: List[Dict[str, Any]]) -> Tuple[int, Dict[str, int]]:
+    """Sum the sampled stage timings of several worker statistics records."""
+    samples = 0
+    stage_ns = {stage: 0 for stage in KEYGEN_STAGES}
+    for stats in stats_list:
+        if not stats:
+            continue
+        samples += stats.get('stage_samples', 0)
+        for stage, ns in stats.get('stage_ns', {}).items():
+            stage_ns[stage] = stage_ns.get(stage, 0) + ns
+    return samples, stage_ns
+
+
+def merge_cpu_stats(stats_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum the CPU and throttle times of several worker statistics records."""
+    cpu_time = throttled = 0.0
+    priority = None
+    for stats in stats_list:
+        if not stats:
+            continue
+        cpu_time += stats.get('cpu_time', 0.0)
+        throttled += stats.get('throttled', 0.0)
+        priority = priority or stats.get('priority')
+    return {'cpu_time': cpu_time, 'throttled': throttled, 'priority': priority}
+
+
+def format_stage_breakdown(samples: int, stage_ns: Dict[str, int]) -> str:
+    """Format sampled stage timings as mean microseconds per key and share of total."""
+    total_ns = sum(stage_ns.values())
+    if samples == 0 or total_ns == 0:
+        return "no samples"
+    parts = []
+    for stage in KEYGEN_STAGES:
+        ns = stage_ns.get(stage, 0)
+        parts.append(f"{stage} {ns / samples / 1000:.2f}µs ({ns / total_ns:.0%})")
+    return " | ".join(parts)
+
+
+def record_batch_stats(stats: Dict[str, Any], batch_attempts: int, batch_time: float):
+    """Account a completed batch in a per-worker statistics record."""
+    stats['attempts'] += batch_attempts
+    stats['batches'] += 1
+    stats['batch_time_total'] += batch_time
+    stats['last_rate'] = batch_attempts / batch_time if batch_time > 0 else 0.0
+    for i, bound in enumerate(BATCH_LATENCY_BUCKETS):
+        if batch_time <= bound:
+            stats['latency_buckets'][i] += 1
+            break
+    stats['updated'] = time.time()
 
 
 def load_watchlist_patterns(file_path: str) -> List[WatchlistPattern]:
@@ -229,7 +388,16 @@ def load_watchlist_patterns(file_path: str) -> List[WatchlistPattern]:
         return []
 
 
-def save_watchlist_key(key_info: KeyInfo, pattern: WatchlistPattern) -> Tuple[str, str]:
+def write_file_atomic(path: str, content: str):
+    """Write a small text file so readers never see it half-written (temporary file + rename)."""
+    directory = os.path.dirname(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f".{os.path.basename(path)}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def save_watchlist_key(key_info: KeyInfo, pattern: WatchlistPattern, announce: bool = True) -> Tuple[str, str]:
     """Save a watchlist key to files and return filenames."""
     # Create a safe filename from the pattern
     safe_pattern = pattern.pattern.replace('...', '_').replace('|', '_')
@@ -238,19 +406,329 @@ def save_watchlist_key(key_info: KeyInfo, pattern: WatchlistPattern) -> Tuple[st
     pub_filename = f"watchlist_{safe_pattern}_{key_id}_public.txt"
     priv_filename = f"watchlist_{safe_pattern}_{key_id}_private.txt"
     
-    with open(pub_filename, 'w') as f:
-        f.write(key_info.public_hex)
+    # Keys of one pattern often share their first 8 hex chars; never overwrite a different key
+    if os.path.exists(pub_filename):
+        with open(pub_filename, 'r') as f:
+            existing = f.read().strip()
+        if existing != key_info.public_hex:
+            key_id = f"{key_id}_{key_info.public_hex[-8:].upper()}"
+            pub_filename = f"watchlist_{safe_pattern}_{key_id}_public.txt"
+            priv_filename = f"watchlist_{safe_pattern}_{key_id}_private.txt"
     
-    with open(priv_filename, 'w') as f:
-        f.write(key_info.private_hex)
+    # Private key first, so a public key file always has its private key next to it
+    write_file_atomic(priv_filename, key_info.private_hex)
+    write_file_atomic(pub_filename, key_info.public_hex)
     
-    print(f"  Saved watchlist key to:")
-    print(f"    Public:  {pub_filename}")
-    print(f"    Private: {priv_filename}")
+    if announce:
+        print("  Saved watchlist key to:")
+        print(f"    Public:  {pub_filename}")
+        print(f"    Private: {priv_filename}")
     
     return pub_filename, priv_filename
 
 
+def announce_watchlist_hit(worker_id: Optional[int], pattern: str, description: str = ""):
+    """Print the console line for a watchlist hit."""
+    prefix = f"Worker {worker_id}: " if worker_id is not None else ""
+    print(f"{prefix}Found WATCHLIST match! Pattern: {pattern}")
+    if description:
+        print(f"  Description: {description}")
+
+
+class WatchlistHitBuffer:
+    """Worker side of the HitWriter: collects the watchlist hits of one batch.
+    
+    Hits are kept as (pattern, description, public_hex, private_hex, worker_id,
+    found_at) records and sent with a single put on shared_state['hit_sink']
+    when the worker flushes at the end of a batch, so a hit costs the key loop
+    a list append. The HitWriter prints and stores them. A run without a
+    writer saves the keys here instead.
+    """
+    
+    def __init__(self, hit_sink, worker_id: Optional[int]):
+        self.hit_sink = hit_sink
+        self.worker_id = worker_id
+        self.pending = []
+    
+    def add(self, pattern: WatchlistPattern, public_hex: str, private_bytes: bytes):
+        self.pending.append((pattern.pattern, pattern.description, public_hex, private_bytes.hex(),
+                             self.worker_id, time.time()))
+    
+    def flush(self):
+        """Send the pending hits to the writer (or save them directly)."""
+        if not self.pending:
+            return
+        records, self.pending = self.pending, []
+        if self.hit_sink is not None:
+            try:
+                self.hit_sink.put(records)
+            except Exception:
+                pass  # Main process has gone away
+            return
+        for pattern, description, public_hex, private_hex, worker_id, _ in records:
+            announce_watchlist_hit(worker_id, pattern, description)
+            save_watchlist_key(KeyInfo(
+                public_hex=public_hex,
+                private_hex=private_hex,
+                public_bytes=bytes.fromhex(public_hex),
+                private_bytes=bytes.fromhex(private_hex),
+                matching_pattern=pattern,
+                first_8_hex=public_hex[:8],
+                last_8_hex=public_hex[-8:]
+            ), WatchlistPattern.from_string(pattern, description or ""))
+
+
+@dataclass
+class VanityOrder:
+    """A single order in a multi-order search."""
+    order_id: int
+    name: str
+    config: VanityConfig
+    json_output: bool = False
+    watchlist_file: Optional[str] = None
+    probability: float = 0.0
+    key_info: Optional[KeyInfo] = None
+    files: List[str] = None
+    fulfilled_attempts: int = 0
+    fulfilled_time: float = 0.0
+
+
+class _OrderArgumentParser(argparse.ArgumentParser):
+    """Argument parser for order file lines that raises instead of exiting."""
+    
+    def error(self, message):
+        raise ValueError(message)
+
+
+def create_order_parser() -> argparse.ArgumentParser:
+    """Create the parser for the pattern options of an order line."""
+    parser = _OrderArgumentParser(prog='order', add_help=False)
+    parser.add_argument('--first-two', type=str)
+    parser.add_argument('--prefix', type=str)
+    parser.add_argument('--simple', action='store_true')
+    parser.add_argument('--four-char', action='store_true')
+    parser.add_argument('--pattern-2', action='store_true')
+    parser.add_argument('--pattern-4', action='store_true')
+    parser.add_argument('--pattern-6', action='store_true')
+    parser.add_argument('--pattern-8', action='store_true')
+    parser.add_argument('--watchlist', type=str)
+    parser.add_argument('--json', action='store_true')
+    return parser
+
+
+def parse_pattern_options(options: str, parser: Optional[argparse.ArgumentParser] = None
+                          ) -> Tuple[VanityConfig, argparse.Namespace]:
+    """Parse a string of pattern options into a VanityConfig.
+    
+    Raises ValueError if the options cannot be parsed or are invalid.
+    """
+    parser = parser or create_order_parser()
+    args = parser.parse_args(shlex.split(options, comments=True))
+    error = validate_pattern_args(args)
+    if error:
+        raise ValueError(error)
+    
+    mode, vanity_length = pattern_mode_from_args(args)
+    config = VanityConfig(
+        mode=mode,
+        target_first_two=args.first_two.upper() if args.first_two else None,
+        target_prefix=args.prefix.upper() if args.prefix else None,
+        vanity_length=vanity_length
+    )
+    return config, args
+
+
+def load_orders(file_path: str) -> List[VanityOrder]:
+    """Load vanity orders from a file.
+    
+    Each line is 'name | options' where options are the usual pattern
+    options (--first-two, --prefix, --simple, --four-char, --pattern-N) plus
+    an optional per-order --watchlist FILE and --json output.
+    """
+    parser = create_order_parser()
+    orders = []
+    names = set()
+    
+    try:
+        with open(file_path, 'r') as f:
+            for line_num, line in enumerate(f, 1):
+                line = line.strip()
+                
+                # Skip empty lines and comments
+                if not line or line.startswith('#'):
+                    continue
+                
+                if '|' in line:
+                    name, options = line.split('|', 1)
+                    name = name.strip()
+                else:
+                    name, options = f"order{len(orders) + 1}", line
+                
+                try:
+                    if not name or not all(c.isalnum() or c in '-_.' for c in name):
+                        raise ValueError(f"order name '{name}' may only contain letters, digits, '-', '_' and '.'")
+                    if name in names:
+                        raise ValueError(f"duplicate order name '{name}'")
+                    config, args = parse_pattern_options(options, parser)
+                except ValueError as e:
+                    print(f"Warning: Invalid order on line {line_num}: {e}")
+                    continue
+                
+                names.add(name)
+                orders.append(VanityOrder(
+                    order_id=len(orders),
+                    name=name,
+                    config=config,
+                    json_output=args.json,
+                    watchlist_file=args.watchlist,
+                    probability=calculate_pattern_probability(config),
+                    files=[]
+                ))
+        
+        print(f"Loaded {len(orders)} orders from {file_path}")
+        return orders
+        
+    except FileNotFoundError:
+        print(f"Error: Order file not found: {file_path}")
+        return []
+
+
+@dataclass
+class InventoryQuota:
+    """A key category the inventory keeps stocked."""
+    category_id: int
+    config: VanityConfig
+    quota: int
+    stock: int = 0
+
+
+# Quotas used by --mine when no --inventory-quotas file is given
+DEFAULT_INVENTORY_QUOTAS = """
+4 | --first-two * --simple
+50 | --pattern-2
+10 | --pattern-4
+"""
+
+
+def parse_inventory_quotas(lines: List[str], source: str) -> List[InventoryQuota]:
+    """Parse 'quota | pattern options' lines into inventory categories.
+    
+    '--first-two *' expands the line into one category per node ID (00-FF).
+    """
+    parser = create_order_parser()
+    quotas = []
+    for line_num, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            quota, options = line.split('|', 1) if '|' in line else ('', line)
+            quota = int(quota)
+            if quota < 1:
+                raise ValueError("quota must be at least 1")
+            tokens = shlex.split(options, comments=True)
+            if '--first-two' in tokens and tokens[tokens.index('--first-two') + 1:][:1] == ['*']:
+                position = tokens.index('--first-two') + 1
+                variants = [tokens[:position] + [f"{slot:02X}"] + tokens[position + 1:] for slot in range(256)]
+            else:
+                variants = [tokens]
+            configs = [parse_pattern_options(' '.join(shlex.quote(token) for token in variant), parser)[0]
+                       for variant in variants]
+        except (ValueError, IndexError) as e:
+            print(f"Warning: Invalid quota on line {line_num} of {source}: {e or 'expected quota | options'}")
+            continue
+        for config in configs:
+            quotas.append(InventoryQuota(category_id=len(quotas), config=config, quota=quota))
+    return quotas
+
+
+def load_inventory_quotas(file_path: Optional[str]) -> List[InventoryQuota]:
+    """Load inventory quotas from a file, or the built-in defaults if no file is given."""
+    if not file_path:
+        return parse_inventory_quotas(DEFAULT_INVENTORY_QUOTAS.splitlines(), 'default quotas')
+    try:
+        with open(file_path, 'r') as f:
+            quotas = parse_inventory_quotas(f.readlines(), file_path)
+    except FileNotFoundError:
+        print(f"Error: Quota file not found: {file_path}")
+        return []
+    print(f"Loaded {len(quotas)} inventory categories from {file_path}")
+    return quotas
+
+
+def describe_pattern(config: VanityConfig) -> str:
+    """Return a short human-readable description of a configuration's pattern."""
+    first_two = f" + first-two {config.target_first_two.upper()}" if config.target_first_two else ""
+    if config.mode == VanityMode.SIMPLE:
+        return f"first-two {config.target_first_two.upper()}"
+    elif config.mode == VanityMode.PREFIX:
+        return f"prefix {config.target_prefix.upper()}"
+    elif config.mode == VanityMode.PREFIX_VANITY:
+        return f"prefix {config.target_prefix.upper()} + pattern-{config.vanity_length}"
+    elif config.mode == VanityMode.FOUR_CHAR:
+        return f"four-char{first_two}"
+    elif config.mode == VanityMode.DEFAULT:
+        return f"pattern-8{first_two}"
+    else:
+        return config.mode.value.replace('_', '-')
+
+
+@dataclass
+class KeygenJob:
+    """A job submitted to the keygen daemon."""
+    job_id: str
+    name: str
+    options: str
+    config: VanityConfig
+    priority: int = 1
+    max_keys: Optional[int] = None
+    max_time: Optional[float] = None
+    probability: float = 0.0
+    status: str = 'queued'  # queued, running, done, cancelled, exhausted, failed
+    reason: Optional[str] = None
+    attempts: int = 0
+    running_slices: int = 0
+    submitted: float = 0.0
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    key_info: Optional[KeyInfo] = None
+    
+    @property
+    def active(self) -> bool:
+        return self.status in ('queued', 'running')
+    
+    def to_dict(self, include_key: bool = False) -> Dict[str, Any]:
+        """Return a JSON-serializable view of the job (the private key only if include_key)."""
+        now = self.finished or time.time()
+        elapsed = now - self.started if self.started else 0.0
+        data = {
+            'id': self.job_id,
+            'name': self.name,
+            'options': self.options,
+            'pattern': describe_pattern(self.config),
+            'priority': self.priority,
+            'status': self.status,
+            'reason': self.reason,
+            'attempts': self.attempts,
+            'workers': self.running_slices,
+            'keys_per_second': round(self.attempts / elapsed, 1) if elapsed > 0 else 0.0,
+            'probability': self.probability,
+            'expected_attempts': int(0.693 / self.probability) if self.probability > 0 else None,
+            'max_keys': self.max_keys,
+            'max_time': self.max_time,
+            'submitted': self.submitted,
+            'started': self.started,
+            'finished': self.finished,
+            'elapsed': round(elapsed, 3),
+        }
+        if self.key_info:
+            data['public_key'] = self.key_info.public_hex
+            data['node_id'] = self.key_info.public_hex[:2].upper()
+            if include_key:
+                data['private_key'] = self.key_info.private_hex
+        return data
+
+
 class KeyValidator:
     """Validates generated keys against patterns."""
     
@@ -338,6 +816,253 @@ class KeyValidator:
         return True
 
 
+class PatternDifficulty:
+    """Exact match probabilities from the hex-character constraints of each mode.
+    
+    A public key is treated as 64 independent, uniform hex characters. Each
+    mode is expressed the way KeyValidator checks it: required constraints
+    plus alternatives (pattern-n matches if the first n characters equal the
+    last n, or the last n reversed). A constraint either fixes a position to
+    a value or ties two positions together. The probability of a set of
+    constraints is counted exactly: tied positions form classes, and a class
+    of size s matches with probability 16^-s if one of its positions is
+    fixed and 16^-(s-1) otherwise (0 if it is fixed to two values).
+    Alternatives are combined by inclusion-exclusion, so keys that satisfy
+    several of them (e.g. mirrored and palindromic at once) are counted once.
+    """
+    
+    HEX_CHARS = 64
+    
+    @staticmethod
+    def fixed(text: str, start: int = 0) -> List[Tuple[str, int, int]]:
+        """Constraints fixing the characters of text, starting at position start."""
+        return [('fix', start + i, int(char, 16)) for i, char in enumerate(text)]
+    
+    @staticmethod
+    def mirrored(n: int) -> List[Tuple[str, int, int]]:
+        """Constraints for first n hex characters == last n hex characters."""
+        return [('tie', i, PatternDifficulty.HEX_CHARS - n + i) for i in range(n)]
+    
+    @staticmethod
+    def palindromic(n: int) -> List[Tuple[str, int, int]]:
+        """Constraints for first n hex characters == last n hex characters reversed."""
+        return [('tie', i, PatternDifficulty.HEX_CHARS - 1 - i) for i in range(n)]
+    
+    @staticmethod
+    def constraints(config: VanityConfig) -> Tuple[List[Tuple[str, int, int]], List[List[Tuple[str, int, int]]]]:
+        """(required constraints, alternatives) for the mode, mirroring KeyValidator.check_vanity_pattern."""
+        first_two = PatternDifficulty.fixed(config.target_first_two) if config.target_first_two else []
+        prefix = PatternDifficulty.fixed(config.target_prefix or '')
+        
+        def pattern(n):
+            return [PatternDifficulty.mirrored(n), PatternDifficulty.palindromic(n)]
+        
+        if config.mode == VanityMode.SIMPLE:
+            return first_two, []
+        elif config.mode == VanityMode.PREFIX:
+            return prefix, []
+        elif config.mode == VanityMode.VANITY_2:
+            return [], pattern(2)
+        elif config.mode == VanityMode.VANITY_4:
+            return [], pattern(4)
+        elif config.mode == VanityMode.VANITY_6:
+            return [], pattern(6)
+        elif config.mode == VanityMode.VANITY_8:
+            return [], pattern(8)
+        elif config.mode == VanityMode.FOUR_CHAR:
+            return first_two, pattern(4)
+        elif config.mode == VanityMode.PREFIX_VANITY:
+            return prefix, pattern(config.vanity_length)
+        else:  # DEFAULT
+            return first_two, pattern(8)
+    
+    @staticmethod
+    def conjunction_probability(constraints: List[Tuple[str, int, int]]) -> Fraction:
+        """Exact probability that a uniform random key satisfies every constraint."""
+        parent = list(range(PatternDifficulty.HEX_CHARS))
+        
+        def find(position):
+            while parent[position] != position:
+                parent[position] = parent[parent[position]]
+                position = parent[position]
+            return position
+        
+        for kind, position, other in constraints:
+            if kind == 'tie':
+                parent[find(position)] = find(other)
+        
+        values = {}
+        for kind, position, value in constraints:
+            if kind == 'fix':
+                root = find(position)
+                if values.setdefault(root, value) != value:
+                    return Fraction(0)
+        
+        constrained = {position for _, position, _ in constraints}
+        constrained |= {other for kind, _, other in constraints if kind == 'tie'}
+        classes = {find(position) for position in constrained}
+        # Each free class leaves one character to choose; fixed classes leave none
+        free = len(classes) - len(values)
+        return Fraction(16 ** free, 16 ** len(constrained))
+    
+    @staticmethod
+    def exact_probability(config: VanityConfig) -> Fraction:
+        """Exact probability that one key matches the configured pattern."""
+        required, alternatives = PatternDifficulty.constraints(config)
+        if not alternatives:
+            return PatternDifficulty.conjunction_probability(required)
+        total = Fraction(0)
+        for count in range(1, len(alternatives) + 1):
+            sign = 1 if count % 2 else -1
+            for combination in itertools.combinations(alternatives, count):
+                combined = list(required)
+                for alternative in combination:
+                    combined.extend(alternative)
+                total += sign * PatternDifficulty.conjunction_probability(combined)
+        return total
+    
+    @staticmethod
+    def probability(config: VanityConfig) -> float:
+        """Exact match probability as a float."""
+        return float(PatternDifficulty.exact_probability(config))
+
+
+class KeyScorer:
+    """Scores near misses for best-so-far searches (higher is better)."""
+    
+    METRICS = ('prefix', 'mirror', 'palindrome', 'mix')
+    
+    @staticmethod
+    def score(public_hex: str, metric: str, target_prefix: Optional[str] = None) -> int:
+        """Score an uppercase public key hex string with the given metric."""
+        if metric == 'prefix':
+            return KeyScorer.prefix_length(public_hex, target_prefix)
+        elif metric == 'mirror':
+            return KeyScorer.mirror_length(public_hex)
+        elif metric == 'palindrome':
+            return KeyScorer.palindrome_length(public_hex)
+        else:  # mix
+            return (KeyScorer.prefix_length(public_hex, target_prefix) +
+                    max(KeyScorer.mirror_length(public_hex), KeyScorer.palindrome_length(public_hex)))
+    
+    @staticmethod
+    def prefix_length(public_hex: str, target_prefix: Optional[str]) -> int:
+        """Number of leading hex chars matching the target prefix."""
+        if not target_prefix:
+            return 0
+        n = 0
+        for a, b in zip(public_hex, target_prefix):
+            if a != b:
+                break
+            n += 1
+        return n
+    
+    @staticmethod
+    def mirror_length(public_hex: str) -> int:
+        """Largest n (up to 32) for which the first n hex chars equal the last n."""
+        # The first n chars can only equal the last n if char n-1 equals the final char
+        last = public_hex[-1]
+        best = 0
+        i = public_hex.find(last, 0, 32)
+        while i != -1:
+            n = i + 1
+            if public_hex[:n] == public_hex[-n:]:
+                best = n
+            i = public_hex.find(last, n, 32)
+        return best
+    
+    @staticmethod
+    def palindrome_length(public_hex: str) -> int:
+        """Largest n (up to 32) for which the first n hex chars are the last n reversed."""
+        n = 0
+        while n < 32 and public_hex[n] == public_hex[-1 - n]:
+            n += 1
+        return n
+
+
+class OrderMatcher:
+    """Checks a public key against many pattern configurations in one pass.
+    
+    Every configuration is reduced to a fixed hex prefix plus an optional
+    n-char cosmetic pattern. Prefixed orders are indexed by prefix length and
+    prefix, so a key costs one dict lookup per distinct prefix length, and
+    each cosmetic pattern length is evaluated at most once per key.
+    """
+    
+    def __init__(self, configs: Dict[int, VanityConfig]):
+        self.prefix_tables = {}  # prefix length -> {prefix: [(order_id, vanity_n)]}
+        self.unprefixed = []     # [(order_id, vanity_n)]
+        for order_id, config in configs.items():
+            self.add(order_id, config)
+    
+    @staticmethod
+    def constraints(config: VanityConfig) -> Tuple[str, int]:
+        """Reduce a configuration to (uppercase hex prefix, cosmetic pattern length)."""
+        first_two = (config.target_first_two or '').upper()
+        if config.mode == VanityMode.SIMPLE:
+            return first_two, 0
+        elif config.mode == VanityMode.PREFIX:
+            return (config.target_prefix or '').upper(), 0
+        elif config.mode == VanityMode.PREFIX_VANITY:
+            return (config.target_prefix or '').upper(), config.vanity_length
+        elif config.mode == VanityMode.FOUR_CHAR:
+            return first_two, 4
+        elif config.mode == VanityMode.DEFAULT:
+            return first_two, 8
+        else:
+            return '', {VanityMode.VANITY_2: 2, VanityMode.VANITY_4: 4,
+                        VanityMode.VANITY_6: 6, VanityMode.VANITY_8: 8}[config.mode]
+    
+    def add(self, order_id: int, config: VanityConfig):
+        """Add a configuration under the given id."""
+        prefix, vanity_n = OrderMatcher.constraints(config)
+        if prefix:
+            table = self.prefix_tables.setdefault(len(prefix), {})
+            table.setdefault(prefix, []).append((order_id, vanity_n))
+        else:
+            self.unprefixed.append((order_id, vanity_n))
+    
+    def remove(self, order_id: int):
+        """Stop matching the given id."""
+        self.unprefixed = [entry for entry in self.unprefixed if entry[0] != order_id]
+        for length in list(self.prefix_tables):
+            table = self.prefix_tables[length]
+            for prefix in list(table):
+                table[prefix] = [entry for entry in table[prefix] if entry[0] != order_id]
+                if not table[prefix]:
+                    del table[prefix]
+            if not table:
+                del self.prefix_tables[length]
+    
+    def empty(self) -> bool:
+        return not self.unprefixed and not self.prefix_tables
+    
+    def match(self, public_hex_upper: str) -> List[int]:
+        """Return the ids of all configurations matched by an uppercase public key."""
+        hits = []
+        vanity_cache = {}
+        for length, table in self.prefix_tables.items():
+            bucket = table.get(public_hex_upper[:length])
+            if bucket:
+                for order_id, vanity_n in bucket:
+                    if self._vanity(public_hex_upper, vanity_n, vanity_cache):
+                        hits.append(order_id)
+        for order_id, vanity_n in self.unprefixed:
+            if self._vanity(public_hex_upper, vanity_n, vanity_cache):
+                hits.append(order_id)
+        return hits
+    
+    @staticmethod
+    def _vanity(public_hex: str, n: int, cache: Dict[int, bool]) -> bool:
+        if n == 0:
+            return True
+        result = cache.get(n)
+        if result is None:
+            result = KeyValidator._check_vanity_n_pattern(public_hex, n)
+            cache[n] = result
+        return result
+
+
 class Ed25519KeyGenerator:
     """Generates Ed25519 keys in MeshCore format using the CORRECT algorithm."""
     
@@ -373,6 +1098,30 @@ class Ed25519KeyGenerator:
         
         return public_key, private_key
     
+    @staticmethod
+    def generate_meshcore_keypair_timed(stage_ns: Dict[str, int]):
+        """
+        Same as generate_meshcore_keypair, but adds the time spent in each
+        stage (entropy, hashing, clamping + scalar multiplication) to stage_ns.
+        """
+        t0 = time.perf_counter_ns()
+        seed = random_bytes(32)
+        t1 = time.perf_counter_ns()
+        digest = hashlib.sha512(seed).digest()
+        t2 = time.perf_counter_ns()
+        clamped = bytearray(digest[:32])
+        clamped[0] &= 248
+        clamped[31] &= 63
+        clamped[31] |= 64
+        public_key = crypto_scalarmult_ed25519_base_noclamp(bytes(clamped))
+        t3 = time.perf_counter_ns()
+        private_key = bytes(clamped) + digest[32:64]
+        
+        stage_ns['entropy'] += t1 - t0
+        stage_ns['hashing'] += t2 - t1
+        stage_ns['scalarmult'] += t3 - t2
+        return public_key, private_key
+    
     @staticmethod
     def generate_single_key(config: VanityConfig) -> Optional[KeyInfo]:
         """Generate a single Ed25519 key in MeshCore format."""
@@ -579,7 +1328,14 @@ class HealthMonitor:
             return process.cpu_percent(interval=None)
         except Exception:
             return 0.0
-    
+
+    def resource_usage(self) -> Dict[str, Any]:
+        """Return the current memory (bytes) and CPU (percent) usage of this process."""
+        return {
+            'memory_usage': self._get_memory_usage(),
+            'cpu_usage': self._get_cpu_usage()
+        }
+
     def check_health(self, current_rate: float, batch_attempts: int, batch_time: float) -> Dict[str, Any]:
         """Check system health and return health status."""
         current_time = time.time()
@@ -639,10 +1395,123 @@ class HealthMonitor:
         return health_status
 
 
+class HostContention:
+    """Detects CPU contention from outside the search on Linux hosts.
+    
+    Two signals are read from proc_root (normally /proc):
+    - hypervisor steal time: the share of CPU time over the last interval
+      that the aggregate 'cpu' line of stat reports as stolen by other
+      guests of the VM host (a noisy neighbour)
+    - PSI CPU pressure: 'some avg10' of pressure/cpu, the share of the last
+      10 seconds in which runnable tasks waited for a CPU (Linux 4.20+)
+    
+    The main process samples it and publishes the result as
+    shared_state['host_contention']. A worker whose rate drops while the
+    host is contended reports the drop as host contention instead of
+    counting it toward a restart, and advise() turns sustained contention
+    into a one-worker back-off and, once it clears, a step back up.
+    Pressure is only trusted while the workers fit on the cores, since more
+    workers than cores create pressure of their own.
+    """
+    
+    INTERVAL = 10.0  # Seconds between samples
+    STEAL_THRESHOLD = 0.10  # Steal time share that counts as contention
+    PRESSURE_THRESHOLD = 20.0  # PSI 'some avg10' percent that counts as contention
+    BACKOFF_SAMPLES = 3  # Consecutive contended samples before dropping a worker
+    RECOVER_SAMPLES = 6  # Consecutive clear samples before adding one back
+    
+    def __init__(self, proc_root: str = '/proc'):
+        self.proc_root = proc_root
+        self.last_stat = self._read_stat()
+        self.contended_samples = 0
+        self.clear_samples = 0
+        self.backed_off = 0
+    
+    @staticmethod
+    def available(proc_root: str = '/proc') -> bool:
+        """Return True if proc_root provides the CPU statistics the detector reads."""
+        return os.path.isfile(os.path.join(proc_root, 'stat'))
+    
+    def _read_stat(self) -> Optional[Tuple[int, int]]:
+        """Return (total, steal) jiffies of the aggregate cpu line, or None."""
+        try:
+            with open(os.path.join(self.proc_root, 'stat'), 'r') as f:
+                for line in f:
+                    fields = line.split()
+                    if fields and fields[0] == 'cpu':
+                        values = [int(value) for value in fields[1:]]
+                        # Guest time (fields 9-10) is already included in user and nice
+                        return sum(values[:8]), values[7] if len(values) > 7 else 0
+        except (OSError, ValueError):
+            pass
+        return None
+    
+    def _read_pressure(self) -> Optional[float]:
+        """Return the 'some avg10' CPU pressure in percent, or None without PSI."""
+        try:
+            with open(os.path.join(self.proc_root, 'pressure', 'cpu'), 'r') as f:
+                for line in f:
+                    if line.startswith('some'):
+                        for field in line.split()[1:]:
+                            name, _, value = field.partition('=')
+                            if name == 'avg10':
+                                return float(value)
+        except (OSError, ValueError):
+            pass
+        return None
+    
+    def sample(self, busy_workers: int) -> Dict[str, Any]:
+        """Measure steal time since the last sample and the current CPU pressure."""
+        stat = self._read_stat()
+        steal = None
+        if stat and self.last_stat and stat[0] > self.last_stat[0]:
+            steal = (stat[1] - self.last_stat[1]) / (stat[0] - self.last_stat[0])
+        self.last_stat = stat
+        pressure = self._read_pressure()
+        
+        reasons = []
+        if steal is not None and steal >= self.STEAL_THRESHOLD:
+            reasons.append(f"steal time {steal:.0%}")
+        if pressure is not None and pressure >= self.PRESSURE_THRESHOLD and busy_workers <= (os.cpu_count() or 1):
+            reasons.append(f"CPU pressure {pressure:.0f}%")
+        return {
+            'contended': bool(reasons),
+            'reason': ', '.join(reasons),
+            'steal': round(steal, 4) if steal is not None else None,
+            'pressure': pressure,
+            'ts': time.time()
+        }
+    
+    def advise(self, contended: bool) -> int:
+        """Return -1 to drop a worker, +1 to restore one, or 0, from the run of recent samples."""
+        if contended:
+            self.contended_samples += 1
+            self.clear_samples = 0
+            if self.contended_samples >= self.BACKOFF_SAMPLES:
+                self.contended_samples = 0
+                return -1
+        else:
+            self.clear_samples += 1
+            self.contended_samples = 0
+            if self.backed_off and self.clear_samples >= self.RECOVER_SAMPLES:
+                self.clear_samples = 0
+                return 1
+        return 0
+    
+    @staticmethod
+    def current(shared_state: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return the published sample if it is recent and reports contention."""
+        state = shared_state.get('host_contention')
+        if state and state['contended'] and time.time() - state['ts'] <= 3 * HostContention.INTERVAL:
+            return state
+        return None
+
+
 class ProgressBar:
     """Progress bar using tqdm for non-verbose mode."""
     
-    def __init__(self, total_attempts: int = None, probability: float = None, time_limit: int = None, verbose: bool = False):
+    def __init__(self, total_attempts: int = None, probability: float = None, time_limit: int = None, verbose: bool = False,
+                 initial: int = 0):
         self.start_time = time.time()
         self.verbose = verbose
         self.probability = probability
@@ -669,6 +1538,7 @@ class ProgressBar:
             elif self.expected_attempts and self.expected_attempts > 1e9:  # > 1 billion
                 # Use indeterminate progress bar for very long searches
                 self.tqdm_bar = tqdm(
+                    initial=initial,  # Keys of resumed sessions do not count toward the rate
                     unit='keys',
                     unit_scale=True,
                     desc='Generating keys',
@@ -678,6 +1548,7 @@ class ProgressBar:
                 # Use determinate progress bar for reasonable searches
                 self.tqdm_bar = tqdm(
                     total=self.expected_attempts,
+                    initial=initial,
                     unit='keys',
                     unit_scale=True,
                     desc='Generating keys',
@@ -686,6 +1557,7 @@ class ProgressBar:
             else:
                 # No expected attempts, use indeterminate progress
                 self.tqdm_bar = tqdm(
+                    initial=initial,  # Keys of resumed sessions do not count toward the rate
                     unit='keys',
                     unit_scale=True,
                     desc='Generating keys',
@@ -733,6 +1605,12 @@ class ProgressBar:
                     self.tqdm_bar.set_postfix({'rate': f'{rate:,.0f}/s'})
             self.tqdm_bar.refresh()
     
+    def set_total(self, total: Optional[int]):
+        """Change the bar's total after a runtime budget or pattern change (None for no total)."""
+        if self.tqdm_bar is not None:
+            self.tqdm_bar.total = total
+            self.tqdm_bar.refresh()
+    
     def close(self):
         """Close the progress bar."""
         if self.tqdm_bar is not None:
@@ -752,11 +1630,12 @@ class ProgressBar:
 class PerformanceTracker:
     """Tracks and analyzes performance metrics over time."""
     
-    def __init__(self, probability: float = None, verbose: bool = False):
+    def __init__(self, probability: float = None, verbose: bool = False, output=None):
         self.start_time = time.time()
         self.last_update = time.time()
         self.probability = probability
         self.verbose = verbose
+        self.output = output or print
         self.performance_samples = []
         self.max_samples = 20
         self.degradation_threshold = 0.6  # 60% performance drop triggers restart
@@ -799,8 +1678,8 @@ class PerformanceTracker:
         
         # Only print if verbose mode is enabled
         if self.verbose:
-            print(f"Worker {worker_id}: {attempts:,} attempts | "
-                  f"{rate:,.0f} keys/sec | {elapsed:.1f}s | ETA: {eta}")
+            self.output(f"Worker {worker_id}: {attempts:,} attempts | "
+                        f"{rate:,.0f} keys/sec | {elapsed:.1f}s | ETA: {eta}")
         
         self.last_update = time.time()
     
@@ -852,784 +1731,6492 @@ class PerformanceTracker:
             return f"{remaining_seconds/3600:.1f}h"
 
 
-def worker_process_batch(worker_id: int, config: VanityConfig, shared_state: Dict[str, Any]) -> BatchResult:
-    """Worker process that generates keys in batches and checks in with main process.
-    
-    Performance optimizations:
-    - Single key generation per iteration (eliminates double generation)
-    - Reduced shared state checking frequency (every 50K attempts)
-    - Reduced time limit checking frequency (every 50K attempts)
-    - Progress tracking only in verbose mode (every 100K attempts)
-    - Reduced health monitoring frequency (every 10 batches)
-    - Single uppercase conversion per key
-    - Eliminated redundant key verification
-    - Optimized CPU usage checking (non-blocking)
-    - Conditional tracker updates (only when verbose)
-    - Reduced default batch size (100K vs 1M) for better responsiveness
-    - Fast byte comparison for simple patterns
+class MetricsExporter:
+    """Serves live generation metrics in the Prometheus text exposition format.
+
+    The exporter runs an HTTP server on a daemon thread in the main process.
+    Workers never talk to it directly: they publish a statistics record into
+    the shared state once per batch and the progress monitor thread calls
+    refresh() to fold those records into a snapshot that /metrics renders.
     """
-    batch_size = config.batch_size
-    max_time = config.max_time
-    start_time = time.time()
-    
-    # Calculate probability for accurate ETA
-    probability = calculate_pattern_probability(config)
-    tracker = PerformanceTracker(probability, config.verbose)
-    
-    # Initialize health monitor if enabled
-    health_monitor = None
-    if config.health_check:
-        try:
+
+    CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+    def __init__(self, config: VanityConfig, num_workers: int, probability: float):
+        self.config = config
+        self.num_workers = num_workers
+        self.probability = probability
+        self.expected_attempts = int(0.693 / probability) if probability and probability > 0 else 0
+        self.start_time = time.time()
+        self.lock = threading.Lock()
+        self.server = None
+        self.thread = None
+        self.shared_state = None
+        self.health_monitor = None
+        self.watchdog = None
+        self.worker_restarts = {}
+        # Counters of worker incarnations that have been restarted, keyed by worker id
+        self.retired_stats = {}
+        self.worker_stats = {}
+        self.total_attempts = 0
+
+    def start(self):
+        """Start serving /metrics on the configured address and port."""
+        exporter = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', MetricsExporter.CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the console output
+
+        self.server = ThreadingHTTPServer((self.config.metrics_bind, self.config.metrics_port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        print(f"Metrics endpoint: http://{self.config.metrics_bind}:{self.config.metrics_port}/metrics")
+
+    def stop(self):
+        """Stop the HTTP server."""
+        if self.server is not None:
+            try:
+                self.server.shutdown()
+                self.server.server_close()
+            except Exception:
+                pass
+            self.server = None
+
+    def attach(self, shared_state: Dict[str, Any], health_monitor: Optional['HealthMonitor'] = None):
+        """Attach the shared state (and optional parent health monitor) of a run."""
+        self.shared_state = shared_state
+        self.health_monitor = health_monitor
+
+    def worker_restarted(self, worker_id: int):
+        """Record a worker restart, keeping the counters of the retired incarnation."""
+        self.worker_restarts[worker_id] = self.worker_restarts.get(worker_id, 0) + 1
+        if self.shared_state is None:
+            return
+        stats = self.shared_state.get(worker_stats_key(worker_id))
+        if not stats:
+            return
+        with self.lock:
+            retired = self.retired_stats.setdefault(worker_id, {
+                'attempts': 0, 'batches': 0, 'batch_time_total': 0.0,
+                'latency_buckets': [0] * len(BATCH_LATENCY_BUCKETS), 'watchlist_hits': {}
+            })
+            retired['attempts'] += stats['attempts']
+            retired['batches'] += stats['batches']
+            retired['batch_time_total'] += stats['batch_time_total']
+            for i, count in enumerate(stats['latency_buckets']):
+                retired['latency_buckets'][i] += count
+            for pattern, count in stats['watchlist_hits'].items():
+                retired['watchlist_hits'][pattern] = retired['watchlist_hits'].get(pattern, 0) + count
+
+    def refresh(self):
+        """Read the latest worker statistics from the shared state."""
+        if self.shared_state is None:
+            return
+        try:
+            worker_stats = {}
+            for worker_id in range(self.num_workers):
+                stats = self.shared_state.get(worker_stats_key(worker_id))
+                if stats:
+                    worker_stats[worker_id] = stats
+            total_attempts = self.shared_state.get('total_attempts', 0)
+        except Exception:
+            return  # Shared state is gone (run finished)
+        with self.lock:
+            self.worker_stats = worker_stats
+            self.total_attempts = total_attempts
+
+    def render(self) -> str:
+        """Render the current snapshot in the Prometheus text format."""
+        with self.lock:
+            worker_stats = dict(self.worker_stats)
+            retired_stats = dict(self.retired_stats)
+            total_attempts = self.total_attempts
+
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples: List[Tuple[str, Any]]):
+            lines.append(f"# HELP meshcore_keygen_{name} {help_text}")
+            lines.append(f"# TYPE meshcore_keygen_{name} {kind}")
+            for labels, value in samples:
+                lines.append(f"meshcore_keygen_{name}{labels} {value}")
+
+        def cumulative(worker_id: int, field: str):
+            current = worker_stats.get(worker_id, {}).get(field, 0)
+            return current + retired_stats.get(worker_id, {}).get(field, 0)
+
+        worker_ids = sorted(set(worker_stats) | set(retired_stats))
+        mode_label = f'{{mode="{self.config.mode.value}"}}'
+
+        metric('attempts_total', 'counter', 'Total keys generated across all workers.',
+               [('', total_attempts)])
+        metric('uptime_seconds', 'gauge', 'Seconds since generation started.',
+               [('', f'{time.time() - self.start_time:.3f}')])
+        metric('workers', 'gauge', 'Configured number of worker processes.',
+               [('', self.num_workers)])
+        metric('pattern_probability', 'gauge', 'Probability that a single key matches the configured pattern.',
+               [(mode_label, repr(self.probability))])
+        metric('expected_attempts', 'gauge', 'Attempts needed for a 50% chance of finding a match.',
+               [('', self.expected_attempts)])
+        progress = total_attempts / self.expected_attempts if self.expected_attempts else 0.0
+        metric('progress_ratio', 'gauge', 'Actual attempts divided by the expected attempts.',
+               [('', f'{progress:.6f}')])
+
+        metric('worker_attempts_total', 'counter', 'Keys generated per worker in completed batches.',
+               [(f'{{worker="{w}"}}', cumulative(w, 'attempts')) for w in worker_ids])
+        metric('worker_keys_per_second', 'gauge', 'Rate of the most recent batch per worker.',
+               [(f'{{worker="{w}"}}', f"{worker_stats[w]['last_rate']:.1f}") for w in sorted(worker_stats)])
+        metric('worker_restarts_total', 'counter', 'Worker restarts triggered by health monitoring.',
+               [(f'{{worker="{w}"}}', self.worker_restarts.get(w, 0)) for w in range(self.num_workers)])
+        metric('worker_memory_bytes', 'gauge', 'Resident memory per worker from the health monitor.',
+               [(f'{{worker="{w}"}}', worker_stats[w]['memory_usage']) for w in sorted(worker_stats)])
+        metric('worker_cpu_percent', 'gauge', 'CPU usage per worker from the health monitor.',
+               [(f'{{worker="{w}"}}', f"{worker_stats[w]['cpu_usage']:.1f}") for w in sorted(worker_stats)])
+
+        # Live worker health from the heartbeat watchdog
+        if self.watchdog is not None:
+            health = self.watchdog.snapshot()
+            metric('worker_heartbeat_age_seconds', 'gauge', 'Seconds since each worker last published a heartbeat.',
+                   [(f'{{worker="{w}"}}', f"{health[w]['heartbeat_age']:.1f}") for w in health])
+            metric('worker_heartbeat_keys_per_second', 'gauge', 'Rate per worker over its recent heartbeats.',
+                   [(f'{{worker="{w}"}}', f"{health[w]['rate']:.1f}") for w in health
+                    if health[w]['rate'] is not None])
+            metric('worker_status', 'gauge', 'Worker health from heartbeats (1 for the current status).',
+                   [(f'{{worker="{w}",status="{status}"}}', int(health[w]['status'] == status))
+                    for w in health for status in ('ok', 'straggler', 'hung', 'dead', 'done')])
+        
+        # Batch latency histogram aggregated across workers
+        buckets = [0] * len(BATCH_LATENCY_BUCKETS)
+        latency_sum = 0.0
+        for w in worker_ids:
+            for source in (worker_stats.get(w), retired_stats.get(w)):
+                if source:
+                    for i, count in enumerate(source['latency_buckets']):
+                        buckets[i] += count
+                    latency_sum += source['batch_time_total']
+        histogram = []
+        running = 0
+        for bound, count in zip(BATCH_LATENCY_BUCKETS, buckets):
+            running += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            histogram.append((f'_bucket{{le="{le}"}}', running))
+        histogram.append(('_sum', f'{latency_sum:.3f}'))
+        histogram.append(('_count', running))
+        lines.append("# HELP meshcore_keygen_batch_duration_seconds Wall time per completed worker batch.")
+        lines.append("# TYPE meshcore_keygen_batch_duration_seconds histogram")
+        for suffix, value in histogram:
+            lines.append(f"meshcore_keygen_batch_duration_seconds{suffix} {value}")
+
+        # Sampled pipeline stage timings (current worker incarnations)
+        samples, stage_ns = merge_stage_stats(list(worker_stats.values()))
+        metric('stage_samples_total', 'counter', 'Keys timed by the sampled per-stage instrumentation.',
+               [('', samples)])
+        metric('stage_seconds_total', 'counter', 'Time spent per pipeline stage in sampled keys.',
+               [(f'{{stage="{stage}"}}', f'{stage_ns[stage] / 1e9:.6f}') for stage in KEYGEN_STAGES])
+
+        # Watchlist hits per pattern
+        hits = {}
+        for w in worker_ids:
+            for source in (worker_stats.get(w), retired_stats.get(w)):
+                if source:
+                    for pattern, count in source['watchlist_hits'].items():
+                        hits[pattern] = hits.get(pattern, 0) + count
+        for pattern in (self.config.watchlist_patterns or []):
+            hits.setdefault(pattern.pattern, 0)
+        metric('watchlist_hits_total', 'counter', 'Watchlist matches per pattern.',
+               [(f'{{pattern="{p}"}}', hits[p]) for p in sorted(hits)])
+
+        if self.health_monitor is not None:
+            usage = self.health_monitor.resource_usage()
+            metric('main_memory_bytes', 'gauge', 'Resident memory of the main process.',
+                   [('', usage['memory_usage'])])
+            metric('main_cpu_percent', 'gauge', 'CPU usage of the main process.',
+                   [('', f"{usage['cpu_usage']:.1f}")])
+
+        return '\n'.join(lines) + '\n'
+
+
+class EventLog:
+    """Buffered JSONL writer for structured run telemetry.
+
+    Each event is one JSON object per line with at least an 'event' type and a
+    'ts' Unix timestamp. Writes go through a large file buffer and are only
+    flushed periodically by the progress monitor, so emitting is cheap.
+    """
+
+    stdout = None  # The real stdout while console_to_stderr() is active
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.count = 0
+        if path == '-':
+            self.stream = EventLog.stdout or sys.stdout
+            self.owns_stream = False
+        else:
+            self.stream = open(path, 'a', buffering=1024 * 1024, encoding='utf-8')
+            self.owns_stream = True
+
+    def emit(self, event: str, **fields):
+        """Write a single event."""
+        record = {'event': event, 'ts': round(time.time(), 6)}
+        record.update(fields)
+        self.write(record)
+
+    def write(self, record: Dict[str, Any]):
+        """Write an already-built event record."""
+        line = json.dumps(record, default=str, separators=(',', ':'))
+        with self.lock:
+            self.stream.write(line + '\n')
+            self.count += 1
+
+    def flush(self):
+        """Flush buffered events to the sink."""
+        with self.lock:
+            try:
+                self.stream.flush()
+            except Exception:
+                pass
+
+    def close(self):
+        """Flush and close the sink."""
+        self.flush()
+        if self.owns_stream:
+            with self.lock:
+                self.stream.close()
+
+
+@contextlib.contextmanager
+def console_to_stderr():
+    """Send console output to stderr so that stdout carries only a JSONL stream.
+
+    Every EventLog('-') opened while this is active writes to the real stdout.
+    """
+    previous = EventLog.stdout
+    EventLog.stdout = previous or sys.stdout
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            yield
+    finally:
+        EventLog.stdout = previous
+
+
+class WorkerReporter:
+    """Routes worker output to the console or, with an event stream, to the main process.
+
+    When the run has an event queue, events and log lines are collected
+    locally and shipped to the main process in a single queue put per batch
+    instead of being printed from inside the worker.
+    """
+
+    def __init__(self, worker_id: int, shared_state: Dict[str, Any]):
+        self.worker_id = worker_id
+        self.queue = shared_state.get('event_queue')
+        self.pending = []
+
+    @property
+    def active(self) -> bool:
+        return self.queue is not None
+
+    def event(self, event: str, message: Optional[str] = None, **fields):
+        """Record an event; message is what would otherwise have been printed."""
+        if self.queue is None:
+            if message:
+                print(message)
+            return
+        record = {'event': event, 'ts': round(time.time(), 6), 'worker': self.worker_id}
+        record.update(fields)
+        if message:
+            record['message'] = message
+        self.pending.append(record)
+
+    def log(self, message: str):
+        """Print a plain message, or send it as a 'log' event."""
+        self.event('log', message)
+
+    def flush(self):
+        """Send pending events to the main process."""
+        if self.queue is not None and self.pending:
+            try:
+                self.queue.put(self.pending)
+            except Exception:
+                pass  # Main process has gone away
+            self.pending = []
+
+
+class WorkerControl:
+    """Worker side of the runtime control channel (see RunControl).
+    
+    The main process publishes the run settings as shared_state['control']
+    and bumps shared_state['control_version']; workers compare the version at
+    their regular shared-state checks, so a run without a control socket pays
+    one proxy read per check.
+    """
+    
+    PATTERN_FIELDS = ('mode', 'target_first_two', 'target_prefix', 'vanity_length')
+    
+    def __init__(self, shared_state: Dict[str, Any]):
+        self.shared_state = shared_state
+        self.version = 0
+        self.settings = None
+    
+    def changed(self) -> bool:
+        """Return True if the main process published new settings since the last sync."""
+        return self.shared_state.get('control_version', 0) != self.version
+    
+    def sync(self) -> Optional[Dict[str, Any]]:
+        """Return the latest settings, waiting while the run is paused (None without a control channel)."""
+        while True:
+            version = self.shared_state.get('control_version', 0)
+            if version == 0:
+                return None
+            if version != self.version:
+                self.settings = self.shared_state['control']
+                self.version = version
+            if not self.settings['paused'] or self.shared_state.get('key_found', False):
+                return self.settings
+            time.sleep(0.2)
+    
+    @staticmethod
+    def apply_pattern(config: VanityConfig, pattern: Dict[str, Any]) -> bool:
+        """Copy published pattern fields into config; return True if the pattern changed."""
+        changed = False
+        for name in WorkerControl.PATTERN_FIELDS:
+            if getattr(config, name) != pattern[name]:
+                setattr(config, name, pattern[name])
+                changed = True
+        return changed
+
+
+class CpuGovernor:
+    """Duty-cycles a worker between batches to hold its share of the CPU budget (--cpu-budget).
+    
+    The share (a fraction of one core) is published by the main process as
+    shared_state['cpu_share'] and follows the worker count. After each batch
+    the worker compares the CPU time it actually used (time.process_time)
+    with the wall time since it started and sleeps until the ratio is back
+    at its share, so time the scheduler already gave to other processes is
+    not paid for twice. Credit from idle periods is capped at CREDIT_WINDOW
+    seconds so a worker never bursts to catch up after a pause.
+    """
+    
+    CREDIT_WINDOW = 10.0  # Seconds of unused budget a worker may carry forward
+    SLEEP_STEP = 0.5  # Seconds between stop checks while throttled
+    
+    def __init__(self):
+        self.start_wall = time.time()
+        self.start_cpu = time.process_time()
+        self.throttled = 0.0
+    
+    def cpu_time(self) -> float:
+        """CPU seconds used by this worker since the governor started."""
+        return time.process_time() - self.start_cpu
+    
+    def pace(self, shared_state: Dict[str, Any]) -> float:
+        """Sleep until the worker is back within its share; return the seconds slept."""
+        share = shared_state.get('cpu_share')
+        if not share or share >= 1.0:
+            return 0.0
+        delay = self.cpu_time() / share - (time.time() - self.start_wall)
+        if delay < -self.CREDIT_WINDOW:
+            self.start_wall -= delay + self.CREDIT_WINDOW  # Forget budget left unused long ago
+        slept = 0.0
+        while slept < delay and not shared_state.get('key_found', False):
+            step = min(self.SLEEP_STEP, delay - slept)
+            time.sleep(step)
+            slept += step
+        self.throttled += slept
+        return slept
+
+
+def set_idle_priority() -> str:
+    """Move this process to the lowest CPU scheduling priority available; return what was applied."""
+    if hasattr(os, 'sched_setscheduler') and hasattr(os, 'SCHED_IDLE'):
+        try:
+            os.sched_setscheduler(0, os.SCHED_IDLE, os.sched_param(0))
+            return 'SCHED_IDLE'
+        except OSError:
+            pass
+    if hasattr(os, 'nice'):
+        try:
+            os.nice(19 - os.nice(0))
+            return 'nice 19'
+        except OSError:
+            pass
+    if PSUTIL_AVAILABLE and hasattr(psutil, 'IDLE_PRIORITY_CLASS'):
+        try:
+            psutil.Process().nice(psutil.IDLE_PRIORITY_CLASS)  # Windows
+            return 'idle priority class'
+        except Exception:
+            pass
+    return 'unchanged'
+
+
+def cpu_share_per_worker(cpu_budget: Optional[float], num_workers: int) -> Optional[float]:
+    """Return each worker's share of one core under a --cpu-budget percent of all cores."""
+    if not cpu_budget:
+        return None
+    return cpu_budget / 100 * mp.cpu_count() / num_workers
+
+
+class HeartbeatBoard:
+    """Per-worker heartbeat slots in shared memory.
+    
+    Every worker owns one fixed-size slot holding its attempt count, the time
+    of its last beat, its pid and its state, and rewrites it every BEAT_KEYS
+    keys (see WorkerHeartbeat). The main process reads the slots directly,
+    without a Manager round trip, and judges them with WorkerWatchdog. The
+    board also owns a directory where workers write faulthandler stack dumps.
+    """
+    
+    SLOT = struct.Struct('<qdqq')  # attempts, beat time, pid, state
+    BEAT_KEYS = 10000
+    STARTING, SEARCHING, THROTTLED, DONE = range(4)
+    STATES = ('starting', 'searching', 'throttled', 'done')
+    
+    def __init__(self, memory, slots: int, directory: str, owner: bool = False):
+        self.memory = memory
+        self.slots = slots
+        self.directory = directory
+        self.owner = owner
+    
+    @classmethod
+    def create(cls, slots: int) -> Optional['HeartbeatBoard']:
+        """Create a zeroed board in the main process (None without shared memory support)."""
+        if not SHARED_MEMORY_AVAILABLE:
+            return None
+        size = cls.SLOT.size * slots
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        memory.buf[:size] = bytes(size)
+        return cls(memory, slots, tempfile.mkdtemp(prefix='meshcore-keygen-'), owner=True)
+    
+    def share(self) -> Tuple[str, int, str]:
+        """Return what a worker needs to attach: (name, slots, directory)."""
+        return self.memory.name, self.slots, self.directory
+    
+    def read(self, worker_id: int) -> Tuple[int, float, int, int]:
+        """Return (attempts, beat time, pid, state) of a worker's slot."""
+        return self.SLOT.unpack_from(self.memory.buf, worker_id * self.SLOT.size)
+    
+    def traceback_path(self, worker_id: int, pid: int) -> str:
+        return os.path.join(self.directory, f'worker_{worker_id}_{pid}.traceback')
+    
+    def close(self):
+        """Detach; the owner also frees the memory and the traceback directory."""
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class WorkerHeartbeat:
+    """A worker's handle on its HeartbeatBoard slot.
+    
+    On POSIX it also registers a faulthandler dump of all threads on SIGUSR1,
+    so the main process can capture the stack of a worker that stopped
+    beating.
+    """
+    
+    def __init__(self, worker_id: int, shared_state: Dict[str, Any]):
+        name, slots, directory = shared_state['heartbeat']
+        self.board = HeartbeatBoard(shared_memory.SharedMemory(name=name), slots, directory)
+        self.offset = worker_id * HeartbeatBoard.SLOT.size
+        self.pid = os.getpid()
+        self.attempts = 0
+        self.dump_file = None
+        if hasattr(signal, 'SIGUSR1'):
+            self.dump_file = open(self.board.traceback_path(worker_id, self.pid), 'a')
+            faulthandler.register(signal.SIGUSR1, file=self.dump_file, all_threads=True)
+        self.beat(0, HeartbeatBoard.STARTING)
+    
+    @classmethod
+    def attach(cls, worker_id: int, shared_state: Dict[str, Any]) -> Optional['WorkerHeartbeat']:
+        """Attach to the run's board, or return None if the run has none."""
+        if not shared_state.get('heartbeat'):
+            return None
+        try:
+            return cls(worker_id, shared_state)
+        except (OSError, ValueError):
+            return None
+    
+    def beat(self, attempts: Optional[int] = None, state: int = HeartbeatBoard.SEARCHING):
+        """Publish the worker's attempt count (or the last one) and state."""
+        if attempts is not None:
+            self.attempts = attempts
+        HeartbeatBoard.SLOT.pack_into(self.board.memory.buf, self.offset, self.attempts, time.time(),
+                                      self.pid, state)
+    
+    def close(self):
+        """Mark the slot done and detach; the process may run another worker next."""
+        self.beat(state=HeartbeatBoard.DONE)
+        if self.dump_file:
+            faulthandler.unregister(signal.SIGUSR1)
+            self.dump_file.close()
+        self.board.close()
+
+
+class WorkerWatchdog:
+    """Judges per-worker health in real time from the heartbeat board.
+    
+    The main process calls check() about once a second. A worker's rate is
+    measured over its beats of the last RATE_WINDOW seconds. A worker is a
+    straggler once its rate has stayed below STRAGGLER_RATIO of the median of
+    its peers for a whole RATE_WINDOW (so start-up skew is not reported),
+    hung when it is searching but has not beaten for HANG_TIMEOUT seconds,
+    and dead when its process is gone before its task finished.
+    When a worker hangs, its stack is dumped with faulthandler (SIGUSR1) and
+    attached to the report.
+    """
+    
+    RATE_WINDOW = 10.0
+    STRAGGLER_RATIO = 0.5
+    HANG_TIMEOUT = 30.0
+    WARMUP = 10.0  # Seconds of beats before a worker's rate is judged
+    EVENTS = {'straggler': 'worker_straggler', 'hung': 'worker_hung', 'dead': 'worker_dead'}
+    
+    def __init__(self, board: HeartbeatBoard):
+        self.board = board
+        self.workers = {}
+        self.resumed_at = 0.0
+        self.lock = threading.Lock()
+    
+    def check(self, worker_ids: List[int], paused: bool = False) -> List[Tuple[str, str, Dict[str, Any]]]:
+        """Update the status of the given workers; return (event, message, fields) for each change."""
+        now = time.time()
+        with self.lock:
+            if self.board is None:
+                return []
+            if paused:
+                self.resumed_at = now  # Paused workers do not beat
+                return []
+            for worker_id in worker_ids:
+                self._update(worker_id, now)
+            return self._judge(worker_ids, now)
+    
+    def _update(self, worker_id: int, now: float):
+        attempts, beat, pid, state = self.board.read(worker_id)
+        if not pid:
+            return  # Not started yet
+        record = self.workers.get(worker_id)
+        if record is None or record['pid'] != pid or attempts < record['attempts']:
+            record = {'pid': pid, 'since': beat, 'beats': [], 'status': 'ok', 'rate': None, 'attempts': attempts,
+                      'slow_since': None}
+            self.workers[worker_id] = record  # New worker, or a restart of this one
+        record.update(attempts=attempts, beat=beat, state=state)
+        beats = record['beats']
+        if not beats or beats[-1][0] != beat:
+            beats.append((beat, attempts))
+        while len(beats) > 2 and beats[1][0] < now - self.RATE_WINDOW:
+            beats.pop(0)  # Keep the last beat before the window, so slow workers still get a rate
+        record['rate'] = None
+        if len(beats) >= 2 and now - record['since'] >= self.WARMUP:
+            record['rate'] = (beats[-1][1] - beats[0][1]) / (now - beats[0][0])
+    
+    def _judge(self, worker_ids: List[int], now: float) -> List[Tuple[str, str, Dict[str, Any]]]:
+        statuses = {}
+        for worker_id in worker_ids:
+            record = self.workers.get(worker_id)
+            if record is None:
+                continue
+            if record['state'] == HeartbeatBoard.DONE:
+                statuses[worker_id] = 'done'
+            elif not self._alive(record['pid']):
+                statuses[worker_id] = 'dead'
+            elif record['state'] == HeartbeatBoard.SEARCHING and \
+                    now - max(record['beat'], self.resumed_at) > self.HANG_TIMEOUT:
+                statuses[worker_id] = 'hung'
+            else:
+                statuses[worker_id] = 'ok'
+        
+        rates = {w: self.workers[w]['rate'] for w, status in statuses.items()
+                 if status == 'ok' and self.workers[w]['rate'] is not None}
+        medians = {}
+        for worker_id, rate in rates.items():
+            peers = sorted(r for w, r in rates.items() if w != worker_id)
+            record = self.workers[worker_id]
+            if not peers or rate >= self.STRAGGLER_RATIO * peers[len(peers) // 2]:
+                record['slow_since'] = None
+                continue
+            medians[worker_id] = peers[len(peers) // 2]
+            if record['slow_since'] is None:
+                record['slow_since'] = now
+            if now - record['slow_since'] >= self.RATE_WINDOW or record['status'] == 'straggler':
+                statuses[worker_id] = 'straggler'
+        
+        changes = []
+        for worker_id, status in statuses.items():
+            record = self.workers[worker_id]
+            previous, record['status'] = record['status'], status
+            if status == previous or status == 'done' or (status == 'ok' and previous == 'done'):
+                continue
+            fields = {'worker': worker_id, 'pid': record['pid'], 'attempts': record['attempts']}
+            if status == 'straggler':
+                fields.update(rate=round(record['rate'], 1), peer_rate=round(medians[worker_id], 1))
+                message = (f"Worker {worker_id}: Straggling at {record['rate']:,.0f} keys/sec "
+                           f"vs {medians[worker_id]:,.0f} for its peers")
+            elif status == 'hung':
+                fields['heartbeat_age'] = round(now - record['beat'], 1)
+                fields['traceback'] = self._dump_stack(worker_id, record['pid'])
+                message = f"Worker {worker_id}: No heartbeat for {fields['heartbeat_age']:.0f}s (pid {record['pid']})"
+                if fields['traceback']:
+                    message += "\n" + fields['traceback'].rstrip()
+            elif status == 'dead':
+                message = f"Worker {worker_id}: Process {record['pid']} exited before its task finished"
+            else:
+                message = f"Worker {worker_id}: Healthy again"
+            changes.append((self.EVENTS.get(status, 'worker_recovered'), message, fields))
+        return changes
+    
+    def dead(self, worker_ids) -> List[int]:
+        """Return the given workers whose process the last check found dead."""
+        with self.lock:
+            return [w for w in worker_ids if w in self.workers and self.workers[w]['status'] == 'dead']
+    
+    def stop_processes(self, worker_ids: List[int], timeout: float = 5.0):
+        """Make sure the processes last seen for the given workers have exited (SIGTERM, then SIGKILL).
+        
+        Only child processes of this process are signalled, so a recycled
+        pid is never touched.
+        """
+        with self.lock:
+            pids = [self.workers[w]['pid'] for w in worker_ids if w in self.workers]
+        pids = [pid for pid in pids if self._alive(pid) and self._is_child(pid)]
+        for signum in (signal.SIGTERM, getattr(signal, 'SIGKILL', signal.SIGTERM)):
+            for pid in pids:
+                try:
+                    os.kill(pid, signum)
+                except OSError:
+                    pass
+            deadline = time.time() + timeout
+            while pids and time.time() < deadline:
+                pids = [pid for pid in pids if self._alive(pid)]
+                if pids:
+                    time.sleep(0.05)
+            if not pids:
+                return
+    
+    @staticmethod
+    def _is_child(pid: int) -> bool:
+        if PSUTIL_AVAILABLE:
+            try:
+                return psutil.Process(pid).ppid() == os.getpid()
+            except psutil.Error:
+                return False
+        try:
+            with open(f'/proc/{pid}/stat', 'r') as f:
+                return int(f.read().rpartition(')')[2].split()[1]) == os.getpid()
+        except (OSError, IndexError, ValueError):
+            return False
+    
+    @staticmethod
+    def _alive(pid: int) -> bool:
+        """True while the process runs; an exited child that was not reaped yet (a zombie) is dead."""
+        if PSUTIL_AVAILABLE:
+            try:
+                return psutil.Process(pid).status() != psutil.STATUS_ZOMBIE
+            except psutil.NoSuchProcess:
+                return False
+            except psutil.Error:
+                return True
+        if os.name != 'posix':
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except OSError:
+            pass
+        try:
+            with open(f'/proc/{pid}/stat', 'r') as f:
+                return f.read().rpartition(')')[2].split()[0] not in ('Z', 'X')
+        except (OSError, IndexError):
+            return True
+    
+    def _dump_stack(self, worker_id: int, pid: int) -> Optional[str]:
+        """Ask a worker for a faulthandler stack dump and return it (POSIX only)."""
+        if not hasattr(signal, 'SIGUSR1'):
+            return None
+        path = self.board.traceback_path(worker_id, pid)
+        try:
+            offset = os.path.getsize(path)
+            os.kill(pid, signal.SIGUSR1)
+            time.sleep(0.2)
+            with open(path, 'r') as f:
+                f.seek(offset)
+                return f.read() or None
+        except OSError:
+            return None
+    
+    def snapshot(self) -> Dict[int, Dict[str, Any]]:
+        """Return the latest health of every worker seen so far."""
+        now = time.time()
+        with self.lock:
+            return {worker_id: {
+                'pid': record['pid'],
+                'status': record['status'],
+                'state': HeartbeatBoard.STATES[record['state']],
+                'attempts': record['attempts'],
+                'rate': round(record['rate'], 1) if record['rate'] is not None else None,
+                'heartbeat_age': round(now - record['beat'], 1),
+            } for worker_id, record in sorted(self.workers.items())}
+    
+    def forget(self, worker_ids: List[int]):
+        """Clear the records and slots of workers about to be started in a new pool."""
+        with self.lock:
+            for worker_id in worker_ids:
+                self.workers.pop(worker_id, None)
+                if self.board is not None:
+                    HeartbeatBoard.SLOT.pack_into(self.board.memory.buf, worker_id * HeartbeatBoard.SLOT.size,
+                                                  0, 0.0, 0, HeartbeatBoard.STARTING)
+    
+    def close(self):
+        """Stop checking and free the board."""
+        with self.lock:
+            if self.board is not None:
+                self.board.close()
+                self.board = None
+
+
+class HitWriter:
+    """Asynchronous, batched sink for keys found by worker processes.
+    
+    Workers put a list of (pattern, description, public_hex, private_hex,
+    worker_id, found_at) records per batch on a queue (see WatchlistHitBuffer)
+    instead of printing and writing files from the key loop. A thread in the
+    main process drains the queue in batches, prints each new hit, and writes
+    each key pair atomically, or inserts the whole batch into an SQLite file in
+    one transaction, where the primary key drops duplicates. File output only
+    remembers the last SEEN_LIMIT keys to skip repeats. Queue depth and the
+    latency from discovery to durable write are tracked for the run summary.
+    """
+    
+    BATCH_SIZE = 256
+    SEEN_LIMIT = 4096
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS hits (
+            pattern TEXT NOT NULL,
+            description TEXT,
+            public_key TEXT NOT NULL,
+            private_key TEXT NOT NULL,
+            worker INTEGER,
+            found_at REAL NOT NULL,
+            written_at REAL NOT NULL,
+            PRIMARY KEY (pattern, public_key)
+        );
+    """
+    MAIN_PATTERN = '(main)'  # Pattern recorded for the key that matched the search itself
+    
+    def __init__(self, db_path: Optional[str] = None, announce: bool = True):
+        self.db_path = db_path
+        self.announce = announce
+        self.manager = None
+        self.queue = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.seen = OrderedDict()  # Recently written (pattern, public_hex), file output only
+        self.written = 0
+        self.duplicates = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+    
+    @classmethod
+    def for_config(cls, config: VanityConfig) -> Optional['HitWriter']:
+        """Start a writer if the run can produce hits to store; None otherwise."""
+        if not config.watchlist_patterns and not config.hits_db:
+            return None
+        writer = cls(config.hits_db)
+        writer.start()
+        return writer
+    
+    def start(self):
+        # A manager of its own keeps the queue alive until every late hit is written
+        self.manager = Manager()
+        self.queue = self.manager.Queue()
+        if self.db_path:
+            db = sqlite3.connect(self.db_path)
+            db.executescript(self.SCHEMA)
+            db.close()
+        self.thread = threading.Thread(target=self._run, name='hit-writer', daemon=True)
+        self.thread.start()
+    
+    def submit(self, pattern: str, public_hex: str, private_hex: str, description: str = ""):
+        """Queue a hit from the main process."""
+        self.queue.put([(pattern, description, public_hex, private_hex, None, time.time())])
+    
+    def stop(self):
+        """Write everything still queued, then shut the queue down."""
+        if self.thread:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+        if self.manager:
+            self.manager.shutdown()
+            self.manager = None
+    
+    def _run(self):
+        db = sqlite3.connect(self.db_path) if self.db_path else None
+        try:
+            while True:
+                try:
+                    batch = list(self.queue.get(timeout=0.2))
+                except queue.Empty:
+                    if self.stop_event.is_set():
+                        break
+                    continue
+                except (EOFError, OSError):
+                    break  # Manager went away
+                while len(batch) < self.BATCH_SIZE:
+                    try:
+                        batch.extend(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    self.max_depth = max(self.max_depth, len(batch) + self.queue.qsize())
+                except (NotImplementedError, OSError):
+                    self.max_depth = max(self.max_depth, len(batch))
+                self._write(batch, db)
+        finally:
+            if db:
+                db.close()
+    
+    def _write(self, batch: List[Tuple], db: Optional[sqlite3.Connection]):
+        try:
+            if db:
+                fresh = self._insert(batch, db)
+            else:
+                fresh = self._save(batch)
+        except (OSError, sqlite3.Error) as e:
+            self.errors += len(batch)
+            print(f"⚠️  Could not store {len(batch)} hit(s): {e}")
+            return
+        
+        now = time.time()
+        for record in fresh:
+            latency = now - record[5]
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+        self.written += len(fresh)
+        self.duplicates += len(batch) - len(fresh)
+    
+    def _insert(self, batch: List[Tuple], db: sqlite3.Connection) -> List[Tuple]:
+        """Insert a batch in one transaction; return the records that were new."""
+        fresh = []
+        written_at = time.time()
+        with db:
+            for record in batch:
+                cursor = db.execute('INSERT OR IGNORE INTO hits VALUES (?, ?, ?, ?, ?, ?, ?)', record + (written_at,))
+                if cursor.rowcount:
+                    fresh.append(record)
+        for pattern, description, _, _, worker_id, _ in fresh:
+            if self.announce and pattern != self.MAIN_PATTERN:
+                announce_watchlist_hit(worker_id, pattern, description)
+        return fresh
+    
+    def _save(self, batch: List[Tuple]) -> List[Tuple]:
+        """Write each new key pair to its files; return the records that were new."""
+        fresh = []
+        for record in batch:
+            pattern, description, public_hex, private_hex, worker_id, _ = record
+            key = (pattern, public_hex)
+            if key in self.seen:
+                continue
+            self.seen[key] = None
+            if len(self.seen) > self.SEEN_LIMIT:
+                self.seen.popitem(last=False)
+            if self.announce:
+                announce_watchlist_hit(worker_id, pattern, description)
+            save_watchlist_key(KeyInfo(
+                public_hex=public_hex,
+                private_hex=private_hex,
+                public_bytes=bytes.fromhex(public_hex),
+                private_bytes=bytes.fromhex(private_hex),
+                matching_pattern=pattern,
+                first_8_hex=public_hex[:8],
+                last_8_hex=public_hex[-8:]
+            ), WatchlistPattern.from_string(pattern, description or ""), announce=self.announce)
+            fresh.append(record)
+        return fresh
+    
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'written': self.written,
+            'duplicates': self.duplicates,
+            'errors': self.errors,
+            'max_queue_depth': self.max_depth,
+            'latency_avg_ms': round(self.latency_total / self.written * 1000, 1) if self.written else 0.0,
+            'latency_max_ms': round(self.latency_max * 1000, 1),
+        }
+    
+    def summary(self) -> str:
+        stats = self.stats()
+        target = f"to {self.db_path}" if self.db_path else "to files"
+        return (f"Hit writer: {stats['written']} key(s) written {target}, {stats['duplicates']} duplicate(s) dropped, "
+                f"max queue depth {stats['max_queue_depth']}, latency avg {stats['latency_avg_ms']:.0f} ms / "
+                f"max {stats['latency_max_ms']:.0f} ms")
+
+
+class WorkerProfiler:
+    """Runs a worker under cProfile for a limited window and dumps its stats.
+
+    Dumps are written as DIR/worker_<id>_<pid>_<timestamp>.prof so restarted
+    workers never overwrite each other, and are merged by ProfileReport.
+    """
+
+    def __init__(self, worker_id: int, profile_dir: str, window: float):
+        self.worker_id = worker_id
+        self.profile_dir = profile_dir
+        self.window = window
+        self.profiler = cProfile.Profile()
+        self.start_time = None
+        self.active = False
+
+    def start(self):
+        """Enable profiling."""
+        self.start_time = time.time()
+        self.active = True
+        self.profiler.enable()
+
+    def maybe_stop(self):
+        """Stop and dump once the profiling window has elapsed (called between batches)."""
+        if self.active and time.time() - self.start_time >= self.window:
+            self.stop()
+
+    def stop(self) -> Optional[str]:
+        """Disable profiling and write the stats file; returns its path."""
+        if not self.active:
+            return None
+        self.profiler.disable()
+        self.active = False
+        path = os.path.join(self.profile_dir,
+                            f"worker_{self.worker_id}_{os.getpid()}_{int(self.start_time * 1000)}.prof")
+        try:
+            self.profiler.dump_stats(path)
+        except OSError:
+            return None
+        return path
+
+
+class ProfileReport:
+    """Merges worker cProfile dumps and reports the main process separately."""
+
+    WORKER_PREFIX = 'worker_'
+    MAIN_FILE = 'main.prof'
+    REPORT_FILE = 'profile_report.txt'
+
+    def __init__(self, profile_dir: str, top: int = 25):
+        self.profile_dir = profile_dir
+        self.top = top
+
+    def worker_files(self) -> List[str]:
+        """Return the worker stats files found in the profile directory."""
+        try:
+            names = sorted(os.listdir(self.profile_dir))
+        except OSError:
+            return []
+        return [os.path.join(self.profile_dir, name) for name in names
+                if name.startswith(self.WORKER_PREFIX) and name.endswith('.prof')]
+
+    def clear(self) -> int:
+        """Remove the profiles and report of an earlier run; returns the number of files removed."""
+        paths = self.worker_files() + [os.path.join(self.profile_dir, name)
+                                       for name in (self.MAIN_FILE, self.REPORT_FILE)]
+        removed = 0
+        for path in paths:
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+    def _format(self, title: str, files: List[str]) -> str:
+        stream = io.StringIO()
+        stats = pstats.Stats(files[0], stream=stream)
+        for path in files[1:]:
+            stats.add(path)
+        stream.write("=" * 60 + "\n")
+        stream.write(f"{title}\n")
+        stream.write(f"Profiles merged: {len(files)} | Total profiled time: {stats.total_tt:.2f}s\n")
+        stream.write("=" * 60 + "\n")
+        stats.strip_dirs().sort_stats('cumulative').print_stats(self.top)
+        return stream.getvalue()
+
+    def build(self) -> str:
+        """Build the combined text report."""
+        sections = []
+        worker_files = self.worker_files()
+        if worker_files:
+            sections.append(self._format("WORKER PROFILE (all workers, by cumulative time)", worker_files))
+        else:
+            sections.append("No worker profiles were written (workers finished before dumping).\n")
+        main_file = os.path.join(self.profile_dir, self.MAIN_FILE)
+        if os.path.exists(main_file):
+            sections.append(self._format("MAIN PROCESS COORDINATION PROFILE", [main_file]))
+        return "\n".join(sections)
+
+    def write(self, report: str) -> str:
+        """Write a built report next to the profiles and return its path."""
+        path = os.path.join(self.profile_dir, self.REPORT_FILE)
+        with open(path, 'w') as f:
+            f.write(report)
+        return path
+
+
+class RunCheckpoint:
+    """Run accounting saved periodically so a search can be resumed with --resume.
+    
+    The checkpoint records the pattern and tuning of the run, the cumulative
+    attempts and elapsed time over all sessions, the total key/time budget
+    and the watchlist hit counts. Saves are atomic (write to a temporary file,
+    fsync, rename), so a crash never leaves a truncated checkpoint.
+    """
+
+    VERSION = 1
+    # Settings restored on resume; everything else comes from the command line
+    RESUMED_FIELDS = ('mode', 'target_first_two', 'target_prefix', 'vanity_length',
+                      'num_workers', 'batch_size', 'watchlist_file', 'stage_sample')
+
+    def __init__(self, path: str, config: VanityConfig, total_keys: Optional[int] = None,
+                 time_budget: Optional[float] = None, interval: float = 60.0):
+        self.path = path
+        self.config = config
+        self.total_keys = total_keys
+        self.time_budget = time_budget
+        self.interval = interval
+        self.created = time.time()
+        self.sessions = 1
+        self.status = 'running'
+        self.exit_reason = None
+        self.public_key = None
+        # Totals of previous sessions
+        self.base_attempts = 0
+        self.base_elapsed = 0.0
+        self.base_watchlist_hits = {}
+        # Progress of the current session
+        self.session_attempts = 0
+        self.session_elapsed = 0.0
+        self.session_watchlist_hits = {}
+        self.worker_hits = {}
+        self.worker_attempts = {}
+        self.last_save = 0.0
+        self.lock = threading.Lock()
+
+    @property
+    def attempts(self) -> int:
+        return self.base_attempts + self.session_attempts
+
+    @property
+    def elapsed(self) -> float:
+        return self.base_elapsed + self.session_elapsed
+
+    @property
+    def watchlist_hits(self) -> Dict[str, int]:
+        hits = dict(self.base_watchlist_hits)
+        for source in [self.session_watchlist_hits] + list(self.worker_hits.values()):
+            for pattern, count in source.items():
+                hits[pattern] = hits.get(pattern, 0) + count
+        return hits
+
+    def budget_exhausted(self) -> bool:
+        return bool((self.total_keys and self.attempts >= self.total_keys) or
+                    (self.time_budget and self.elapsed >= self.time_budget))
+
+    def remaining_time(self) -> Optional[int]:
+        """Seconds of the time budget left, or None if there is no time budget."""
+        if not self.time_budget:
+            return None
+        return max(0, int(math.ceil(self.time_budget - self.elapsed)))
+
+    def record(self, shared_state: Dict[str, Any], num_workers: int, session_elapsed: float):
+        """Fold the current progress of a run into the checkpoint."""
+        attempts = shared_state.get('total_attempts', 0) - self.base_attempts
+        stats_list = [shared_state.get(worker_stats_key(w)) for w in range(num_workers)]
+        with self.lock:
+            self.session_attempts = max(self.session_attempts, attempts)
+            self.session_elapsed = session_elapsed
+            for stats in stats_list:
+                if not stats:
+                    continue
+                worker_id = stats['worker_id']
+                if stats['attempts'] < self.worker_attempts.get(worker_id, 0):
+                    # A restarted worker starts a new statistics record; keep the old hits
+                    for pattern, count in self.worker_hits.pop(worker_id, {}).items():
+                        self.session_watchlist_hits[pattern] = self.session_watchlist_hits.get(pattern, 0) + count
+                self.worker_attempts[worker_id] = stats['attempts']
+                self.worker_hits[worker_id] = dict(stats.get('watchlist_hits', {}))
+
+    def maybe_save(self) -> bool:
+        """Save if the checkpoint interval has passed; returns True if saved."""
+        if time.time() - self.last_save < self.interval:
+            return False
+        self.save()
+        return True
+
+    def finish(self, status: str, reason: Optional[str] = None, public_key: Optional[str] = None):
+        """Record how the session ended and save."""
+        self.status = status
+        self.exit_reason = reason
+        self.public_key = public_key
+        self.save()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self.lock:
+            hits = self.watchlist_hits
+            config = config_to_dict(self.config)
+            config.pop('watchlist_patterns', None)  # Reloaded from watchlist_file
+            return {
+                'version': self.VERSION,
+                'status': self.status,
+                'exit_reason': self.exit_reason,
+                'public_key': self.public_key,
+                'created': self.created,
+                'updated': time.time(),
+                'sessions': self.sessions,
+                'attempts': self.attempts,
+                'elapsed': round(self.elapsed, 3),
+                'total_keys': self.total_keys,
+                'time_budget': self.time_budget,
+                'probability': calculate_pattern_probability(self.config),
+                'watchlist_hits': hits,
+                'config': config,
+            }
+
+    def save(self):
+        """Atomically write the checkpoint file."""
+        data = self.to_dict()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = os.path.join(directory, f".{os.path.basename(self.path)}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.last_save = time.time()
+
+    @classmethod
+    def load(cls, path: str, config: VanityConfig, interval: float = 60.0) -> 'RunCheckpoint':
+        """Load a checkpoint to resume; the pattern and tuning overwrite fields of config.
+        
+        Raises ValueError if the file cannot be read or is not a checkpoint.
+        """
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            raise ValueError(f"cannot read checkpoint {path}: {e}")
+        if data.get('version') != cls.VERSION or 'config' not in data:
+            raise ValueError(f"{path} is not a version {cls.VERSION} checkpoint")
+
+        saved = data['config']
+        for name in cls.RESUMED_FIELDS:
+            if name in saved:
+                setattr(config, name, saved[name])
+        config.mode = VanityMode(config.mode)
+
+        checkpoint = cls(path, config, total_keys=data.get('total_keys'), time_budget=data.get('time_budget'),
+                         interval=interval)
+        checkpoint.created = data.get('created', checkpoint.created)
+        checkpoint.sessions = data.get('sessions', 0) + 1
+        checkpoint.status = data.get('status', 'running')
+        checkpoint.exit_reason = data.get('exit_reason')
+        checkpoint.public_key = data.get('public_key')
+        checkpoint.base_attempts = data.get('attempts', 0)
+        checkpoint.base_elapsed = data.get('elapsed', 0.0)
+        checkpoint.base_watchlist_hits = data.get('watchlist_hits', {})
+        return checkpoint
+
+
+class KeyInventory:
+    """On-disk SQLite store of pre-mined keys, each served to a request exactly once.
+    
+    Keys are stored by lowercase public key (the primary key), so any hex
+    prefix is an index range scan. A bitmask of the cosmetic pattern lengths
+    a key satisfies narrows unprefixed lookups through a partial index. A
+    served key is deleted in the same transaction that selects it, so two
+    concurrent requests can never receive the same key.
+    """
+    
+    PATTERN_LENGTHS = (2, 4, 6, 8)
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS keys (
+            public_key TEXT PRIMARY KEY,
+            private_key TEXT NOT NULL,
+            patterns INTEGER NOT NULL,
+            mined_at REAL NOT NULL
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS keys_by_pattern ON keys (patterns) WHERE patterns != 0;
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.executescript(self.SCHEMA)
+    
+    @staticmethod
+    def pattern_bit(n: int) -> int:
+        return 1 << KeyInventory.PATTERN_LENGTHS.index(n)
+    
+    @staticmethod
+    def pattern_bits(public_hex: str) -> int:
+        """Bitmask of the n-char cosmetic patterns a public key satisfies."""
+        bits = 0
+        for n in KeyInventory.PATTERN_LENGTHS:
+            if KeyValidator._check_vanity_n_pattern(public_hex, n):
+                bits |= KeyInventory.pattern_bit(n)
+        return bits
+    
+    def add(self, keys: List[Tuple[str, str]]) -> List[str]:
+        """Store (public_hex, private_hex) pairs in one transaction; returns the public keys that were new."""
+        added = []
+        now = time.time()
+        self.db.execute('BEGIN')
+        try:
+            for public_hex, private_hex in keys:
+                cursor = self.db.execute('INSERT OR IGNORE INTO keys VALUES (?, ?, ?, ?)',
+                                         (public_hex.lower(), private_hex, self.pattern_bits(public_hex), now))
+                if cursor.rowcount:
+                    added.append(public_hex)
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        return added
+    
+    def _matches(self, config: VanityConfig):
+        """Yield the stored (public_hex, private_hex) pairs matching a configuration."""
+        prefix, vanity_n = OrderMatcher.constraints(config)
+        query = 'SELECT public_key, private_key FROM keys'
+        conditions, params = [], []
+        if prefix:
+            # Hex digits sort below 'g', so this is exactly the keys starting with the prefix
+            conditions.append('public_key >= ? AND public_key < ?')
+            params += [prefix.lower(), prefix.lower() + 'g']
+        if vanity_n:
+            conditions.append('patterns != 0 AND patterns & ? != 0')
+            params.append(self.pattern_bit(vanity_n))
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        for public_hex, private_hex in self.db.execute(query, params):
+            if KeyValidator.check_vanity_pattern(public_hex, config):
+                yield public_hex, private_hex
+    
+    def count(self, config: VanityConfig, limit: Optional[int] = None) -> int:
+        """Number of stored keys matching a configuration (counting stops at limit)."""
+        count = 0
+        for _ in self._matches(config):
+            count += 1
+            if limit and count >= limit:
+                break
+        return count
+    
+    def size(self) -> int:
+        return self.db.execute('SELECT COUNT(*) FROM keys').fetchone()[0]
+    
+    def take(self, config: VanityConfig) -> Optional[KeyInfo]:
+        """Remove and return one stored key matching a configuration, or None on a miss."""
+        self.db.execute('BEGIN IMMEDIATE')  # Take the write lock before choosing a key
+        try:
+            for public_hex, private_hex in self._matches(config):
+                if not Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex):
+                    continue
+                self.db.execute('DELETE FROM keys WHERE public_key = ?', (public_hex,))
+                self.db.execute('COMMIT')
+                return KeyInfo(
+                    public_hex=public_hex,
+                    private_hex=private_hex,
+                    public_bytes=bytes.fromhex(public_hex),
+                    private_bytes=bytes.fromhex(private_hex),
+                    matching_pattern=public_hex[:8],
+                    first_8_hex=public_hex[:8],
+                    last_8_hex=public_hex[-8:]
+                )
+            self.db.execute('COMMIT')
+        except BaseException:
+            self.db.execute('ROLLBACK')
+            raise
+        return None
+    
+    def close(self):
+        self.db.close()
+
+
+def worker_process_batch(worker_id: int, config: VanityConfig, shared_state: Dict[str, Any]) -> BatchResult:
+    """Worker process that generates keys in batches and checks in with main process."""
+    reporter = WorkerReporter(worker_id, shared_state)
+    heartbeat = WorkerHeartbeat.attach(worker_id, shared_state)
+    profiler = None
+    if config.profile_dir:
+        profiler = WorkerProfiler(worker_id, config.profile_dir, config.profile_window)
+        profiler.start()
+    try:
+        return _worker_search(worker_id, config, shared_state, reporter, profiler, heartbeat)
+    finally:
+        if profiler:
+            profiler.stop()
+        if heartbeat:
+            heartbeat.close()
+        reporter.flush()
+
+
+def _worker_search(worker_id: int, config: VanityConfig, shared_state: Dict[str, Any],
+                   reporter: WorkerReporter, profiler: Optional[WorkerProfiler] = None,
+                   heartbeat: Optional[WorkerHeartbeat] = None) -> BatchResult:
+    """Batch search loop run by worker_process_batch.
+    
+    Performance optimizations:
+    - Single key generation per iteration (eliminates double generation)
+    - Reduced shared state checking frequency (every 50K attempts)
+    - Reduced time limit checking frequency (every 50K attempts)
+    - Progress tracking only in verbose mode (every 100K attempts)
+    - Reduced health monitoring frequency (every 10 batches)
+    - Single uppercase conversion per key
+    - Eliminated redundant key verification
+    - Optimized CPU usage checking (non-blocking)
+    - Conditional tracker updates (only when verbose)
+    - Reduced default batch size (100K vs 1M) for better responsiveness
+    - Fast byte comparison for simple patterns
+    - Sampled per-stage timing (every config.stage_sample keys) with perf_counter_ns
+    - Heartbeats into shared memory (every HeartbeatBoard.BEAT_KEYS keys) without IPC
+    """
+    batch_size = config.batch_size
+    beat_keys = HeartbeatBoard.BEAT_KEYS
+    deadline = time.time() + config.max_time if config.max_time else None
+    control = WorkerControl(shared_state)
+    
+    # Calculate probability for accurate ETA
+    probability = calculate_pattern_probability(config)
+    tracker = PerformanceTracker(probability, config.verbose, output=reporter.log)
+    
+    # Initialize health monitor if enabled
+    health_monitor = None
+    if config.health_check:
+        try:
             health_monitor = HealthMonitor(worker_id, config)
             if config.verbose:
-                print(f"Worker {worker_id}: Health monitoring enabled")
+                reporter.log(f"Worker {worker_id}: Health monitoring enabled")
+        except Exception as e:
+            if config.verbose:
+                reporter.log(f"Worker {worker_id}: Failed to initialize health monitor: {e}")
+    
+    total_attempts = 0
+    consecutive_slow_batches = 0
+    max_slow_batches = 3  # Restart after 3 consecutive slow batches
+    
+    # Per-worker statistics, published to the main process once per batch
+    stats = new_worker_stats(worker_id)
+    stage_ns = stats['stage_ns']
+    watchlist_hits = WatchlistHitBuffer(shared_state.get('hit_sink'), worker_id)
+    stage_sample = config.stage_sample
+    
+    # Background mode: lowest scheduling priority and/or a duty-cycled CPU budget
+    if config.idle_priority:
+        stats['priority'] = set_idle_priority()
+    governor = CpuGovernor()
+    
+    # Simple mode compares the first public key byte directly
+    simple_target = None
+    if config.mode == VanityMode.SIMPLE and config.target_first_two:
+        simple_target = bytes.fromhex(config.target_first_two)[0]
+    
+    while True:
+        batch_start_time = time.time()
+        batch_attempts = 0
+        
+        # Check if another worker found a key
+        if shared_state.get('key_found', False):
+            return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+        
+        # Apply runtime control settings (waits here while the run is paused)
+        if control.changed():
+            settings = control.sync()
+            if worker_id >= settings['workers']:
+                reporter.event('worker_retired', f"Worker {worker_id}: Retired by control command"
+                               if config.verbose else None)
+                reporter.flush()
+                return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False,
+                                   retired=True)
+            deadline = settings['deadline']
+            if WorkerControl.apply_pattern(config, settings['pattern']):
+                simple_target = None
+                if config.mode == VanityMode.SIMPLE and config.target_first_two:
+                    simple_target = bytes.fromhex(config.target_first_two)[0]
+                probability = calculate_pattern_probability(config)
+                tracker = PerformanceTracker(probability, config.verbose, output=reporter.log)
+            continue  # Re-check for a found key after a pause
+        
+        # Check time limit
+        if deadline and time.time() > deadline:
+            shared_state['key_found'] = True  # Signal other workers to stop
+            return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+        
+        # Process this batch
+        for attempt in range(batch_size):
+            # Check if another worker found a key (check every 50K attempts to reduce overhead)
+            if attempt % 50000 == 0 and attempt > 0 and shared_state.get('key_found', False):
+                watchlist_hits.flush()
+                return BatchResult(worker_id=worker_id, attempts=total_attempts + attempt, batch_completed=False)
+            
+            # Check time limit (check every 50K attempts to reduce overhead)
+            if attempt % 50000 == 0 and deadline and time.time() > deadline:
+                shared_state['key_found'] = True  # Signal other workers to stop
+                watchlist_hits.flush()
+                return BatchResult(worker_id=worker_id, attempts=total_attempts + attempt, batch_completed=False)
+            
+            # End the batch early to apply new control settings
+            if attempt % 50000 == 0 and attempt > 0 and control.changed():
+                break
+            
+            # Tell the main process this worker is alive and how far it got
+            if heartbeat and attempt % beat_keys == 0:
+                heartbeat.beat(total_attempts + attempt)
+            
+            # Update progress (only in verbose mode, every 100K attempts)
+            if config.verbose and attempt % 100000 == 0 and tracker.should_update(total_attempts + attempt):
+                tracker.update(worker_id, total_attempts + attempt)
+            
+            # Time the pipeline stages of every Nth key
+            sampled = stage_sample and attempt % stage_sample == 0
+            
+            # Generate a single key and check both main pattern and watchlist
+            if sampled:
+                public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair_timed(stage_ns)
+                t_match = time.perf_counter_ns()
+            else:
+                public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+            
+            # Fast pattern checking using direct byte comparisons where possible
+            watchlist_matches = []
+            
+            # Check for main pattern match (optimized)
+            if simple_target is not None:
+                # Fast 2-char prefix check: the first two hex chars are the first byte
+                main_pattern_match = public_bytes[0] == simple_target
+                public_hex = None
+            else:
+                # Fall back to hex conversion for complex patterns
+                public_hex = public_bytes.hex()
+                main_pattern_match = KeyValidator.check_vanity_pattern(public_hex, config)
+            
+            if sampled:
+                t_watchlist = time.perf_counter_ns()
+                stage_ns['matching'] += t_watchlist - t_match
+            
+            # Check for watchlist patterns (only if we have watchlist patterns)
+            if config.watchlist_patterns:
+                if public_hex is None:
+                    public_hex = public_bytes.hex()
+                watchlist_matches = KeyValidator.check_watchlist_patterns(public_hex, config)
+            
+            if sampled:
+                stage_ns['watchlist'] += time.perf_counter_ns() - t_watchlist
+                stats['stage_samples'] += 1
+            
+            # Handle watchlist matches
+            if watchlist_matches:
+                public_hex = public_bytes.hex()  # Convert to hex only when needed
+                for pattern in watchlist_matches:
+                    stats['watchlist_hits'][pattern.pattern] = stats['watchlist_hits'].get(pattern.pattern, 0) + 1
+                    # The console line is printed by the HitWriter when it stores the key
+                    reporter.event('watchlist_hit', None, pattern=pattern.pattern,
+                                   description=pattern.description, public_key=public_hex)
+                    watchlist_hits.add(pattern, public_hex, private_bytes)
+            
+            # Handle main pattern match (unless the pattern was just changed by a control command)
+            if main_pattern_match and not control.changed():
+                # Convert to hex only when we have a match
+                public_hex = public_bytes.hex()
+                
+                # Create KeyInfo for main pattern match
+                result = KeyInfo(
+                    public_hex=public_hex,
+                    private_hex=private_bytes.hex(),
+                    public_bytes=public_bytes,
+                    private_bytes=private_bytes,
+                    matching_pattern=public_hex[:8],
+                    first_8_hex=public_hex[:8],
+                    last_8_hex=public_hex[-8:]
+                )
+                
+                reporter.event('key_found', f"Worker {worker_id}: Found valid MeshCore Ed25519 key!",
+                               public_key=public_hex, attempts=total_attempts + attempt + 1)
+                # Set the shared state to indicate a key was found
+                shared_state['total_attempts'] = shared_state.get('total_attempts', 0) + batch_attempts + 1
+                shared_state[worker_stats_key(worker_id)] = stats
+                shared_state['key_found'] = True
+                shared_state['found_key'] = result
+                watchlist_hits.flush()
+                return BatchResult(worker_id=worker_id, attempts=total_attempts + attempt + 1, found_key=result)
+            
+            batch_attempts += 1
+        
+        total_attempts += batch_attempts
+        batch_time = time.time() - batch_start_time
+        current_rate = batch_attempts / batch_time if batch_time > 0 else 0
+        record_batch_stats(stats, batch_attempts, batch_time)
+        stats['cpu_time'] = governor.cpu_time()
+        
+        # Update shared state with progress and statistics (every batch)
+        shared_state['total_attempts'] = shared_state.get('total_attempts', 0) + batch_attempts
+        shared_state[worker_stats_key(worker_id)] = stats
+        watchlist_hits.flush()
+        
+        # Report batch completion (printed only in verbose mode)
+        message = None
+        if config.verbose and total_attempts % 500000 == 0:
+            message = (f"Worker {worker_id}: Completed batch of {batch_attempts:,} keys in {batch_time:.1f}s "
+                       f"({current_rate:,.0f} keys/sec) | Total: {total_attempts:,}")
+        reporter.event('batch', message, attempts=batch_attempts, duration=round(batch_time, 6),
+                       rate=round(current_rate, 1), total_attempts=total_attempts)
+        
+        # Check if we've reached the target number of keys
+        target_keys = shared_state.get('target_keys')
+        if target_keys and shared_state['total_attempts'] >= target_keys:
+            shared_state['key_found'] = True  # Signal other workers to stop
+            return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+        
+        # Health monitoring and performance checks (only every 10 batches to reduce overhead)
+        if health_monitor and (total_attempts // batch_size) % 10 == 0:
+            health_status = health_monitor.check_health(current_rate, batch_attempts, batch_time)
+            if health_status['memory_usage'] > 0:
+                stats['memory_usage'] = health_status['memory_usage']
+                stats['cpu_usage'] = health_status['cpu_usage']
+            
+            # Report health status if there are warnings or actions (only in verbose mode)
+            message = None
+            if config.verbose and (health_status['warnings'] or health_status['actions_taken']):
+                lines = [f"Worker {worker_id} Health Check:"]
+                for warning in health_status['warnings']:
+                    lines.append(f"  ⚠️  {warning}")
+                for action in health_status['actions_taken']:
+                    lines.append(f"  🔧 {action}")
+                
+                if health_status['memory_usage'] > 0:
+                    lines.append(f"  📊 Memory: {health_status['memory_usage'] / 1024 / 1024:.1f}MB")
+                if health_status['cpu_usage'] > 0:
+                    lines.append(f"  📊 CPU: {health_status['cpu_usage']:.1f}%")
+                if health_status['performance_ratio'] < 1.0:
+                    lines.append(f"  📊 Performance: {health_status['performance_ratio']:.1%} of baseline")
+                if stats['stage_samples']:
+                    lines.append(f"  ⏱️  Stages: {format_stage_breakdown(stats['stage_samples'], stage_ns)}")
+                message = "\n".join(lines)
+            reporter.event('health_check', message, healthy=health_status['healthy'],
+                           memory_usage=health_status['memory_usage'], cpu_usage=health_status['cpu_usage'],
+                           performance_ratio=round(health_status['performance_ratio'], 4),
+                           warnings=health_status['warnings'], actions=health_status['actions_taken'],
+                           stage_samples=stats['stage_samples'], stage_ns=dict(stage_ns))
+            
+            # Check for severe performance degradation (a rate drop while the host is
+            # contended is not the worker's fault and does not count toward a restart)
+            contention = None if health_status['healthy'] else HostContention.current(shared_state)
+            if contention:
+                consecutive_slow_batches = 0
+                reporter.event('host_contention',
+                               f"Worker {worker_id}: Rate drop attributed to host contention ({contention['reason']})"
+                               if config.verbose else None,
+                               performance_ratio=round(health_status['performance_ratio'], 4),
+                               steal=contention['steal'], pressure=contention['pressure'])
+            elif not health_status['healthy']:
+                consecutive_slow_batches += 1
+                if config.verbose:
+                    reporter.log(f"Worker {worker_id}: Performance degradation detected ({consecutive_slow_batches}/{max_slow_batches})")
+                
+                if consecutive_slow_batches >= max_slow_batches:
+                    reporter.event('worker_degraded',
+                                   f"Worker {worker_id}: Restarting due to performance degradation" if config.verbose else None,
+                                   slow_batches=consecutive_slow_batches)
+                    # Force garbage collection before restart
+                    gc.collect()
+                    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+            else:
+                consecutive_slow_batches = 0
+        
+        # Update tracker with current rate for performance analysis (only when verbose)
+        if config.verbose:
+            tracker.update(worker_id, total_attempts, current_rate)
+        
+        reporter.flush()
+        if profiler:
+            profiler.maybe_stop()
+        
+        # Sleep off any use above the CPU budget
+        if heartbeat and config.cpu_budget:
+            heartbeat.beat(total_attempts, HeartbeatBoard.THROTTLED)
+        if config.cpu_budget and governor.pace(shared_state):
+            stats['throttled'] = governor.throttled
+            shared_state[worker_stats_key(worker_id)] = stats
+        
+        # Check if we should continue (another worker might have found a key)
+        if shared_state.get('key_found', False):
+            return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+    
+    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+
+
+def worker_process(worker_id: int, config: VanityConfig) -> Tuple[Optional[KeyInfo], int]:
+    """Legacy worker process that generates keys until finding a match or hitting limits."""
+    max_iterations = config.max_iterations or 100000000
+    max_time = config.max_time
+    start_time = time.time()
+    
+    # Calculate probability for accurate ETA
+    probability = calculate_pattern_probability(config)
+    tracker = PerformanceTracker(probability)
+    
+    for attempt in range(max_iterations):
+        # Check time limit
+        if max_time and (time.time() - start_time) > max_time:
+            return None, attempt
+        
+        # Update progress
+        if tracker.should_update(attempt):
+            tracker.update(worker_id, attempt)
+        
+        # Generate and check key
+        result = Ed25519KeyGenerator.generate_single_key(config)
+        if result:
+            # Verify the generated key works correctly
+            if Ed25519KeyGenerator.verify_key_compatibility(result.private_hex, result.public_hex):
+                print(f"Worker {worker_id}: Found valid MeshCore Ed25519 key!")
+                return result, attempt + 1
+            else:
+                print(f"Worker {worker_id}: Generated key failed compatibility check!")
+                continue
+    
+    return None, max_iterations
+
+
+def worker_process_orders(worker_id: int, orders: Dict[int, VanityConfig], config: VanityConfig,
+                          shared_state: Dict[str, Any]) -> BatchResult:
+    """Worker process for multi-order search: checks every key against all open orders.
+    
+    Hits are sent to the main process through shared_state['hit_queue'] as
+    (worker_id, order_ids, public_hex, private_hex). The set of open orders is
+    re-read between batches whenever shared_state['open_orders_version'] changes.
+    """
+    batch_size = config.batch_size
+    hit_queue = shared_state['hit_queue']
+    watchlist_hits = WatchlistHitBuffer(shared_state.get('hit_sink'), worker_id)
+    stats = new_worker_stats(worker_id)
+    total_attempts = 0
+    matcher = None
+    open_version = None
+    
+    while not shared_state.get('stop', False):
+        version = shared_state.get('open_orders_version')
+        if version != open_version:
+            open_ids = shared_state.get('open_orders', [])
+            matcher = OrderMatcher({order_id: orders[order_id] for order_id in open_ids})
+            open_version = version
+        if matcher.empty():
+            break
+        
+        batch_start_time = time.time()
+        batch_attempts = 0
+        for attempt in range(batch_size):
+            # Check if the main process asked us to stop (every 50K attempts)
+            if attempt % 50000 == 0 and attempt > 0 and shared_state.get('stop', False):
+                break
+            
+            public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+            public_hex = public_bytes.hex()
+            
+            hits = matcher.match(public_hex.upper())
+            if hits:
+                # Each worker fills an order at most once; the main process closes it for everyone
+                for order_id in hits:
+                    matcher.remove(order_id)
+                hit_queue.put((worker_id, hits, public_hex, private_bytes.hex()))
+            
+            if config.watchlist_patterns:
+                for pattern in KeyValidator.check_watchlist_patterns(public_hex, config):
+                    stats['watchlist_hits'][pattern.pattern] = stats['watchlist_hits'].get(pattern.pattern, 0) + 1
+                    watchlist_hits.add(pattern, public_hex, private_bytes)
+            
+            batch_attempts += 1
+        
+        total_attempts += batch_attempts
+        record_batch_stats(stats, batch_attempts, time.time() - batch_start_time)
+        shared_state['total_attempts'] = shared_state.get('total_attempts', 0) + batch_attempts
+        shared_state[worker_stats_key(worker_id)] = stats
+        watchlist_hits.flush()
+    
+    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+
+
+def worker_process_collect(worker_id: int, config: VanityConfig, shared_state: Dict[str, Any]) -> BatchResult:
+    """Worker process for collect mode: keeps searching after a match.
+    
+    Matches are buffered for the whole batch and sent to the main process
+    with a single put on shared_state['hit_queue'] as (worker_id, [(public_hex,
+    private_hex), ...]), so a hit never stalls the key loop.
+    """
+    batch_size = config.batch_size
+    hit_queue = shared_state['hit_queue']
+    watchlist_hits = WatchlistHitBuffer(shared_state.get('hit_sink'), worker_id)
+    stats = new_worker_stats(worker_id)
+    total_attempts = 0
+    
+    while not shared_state.get('stop', False):
+        batch_start_time = time.time()
+        batch_attempts = 0
+        hits = []
+        for attempt in range(batch_size):
+            # Check if the main process asked us to stop (every 50K attempts)
+            if attempt % 50000 == 0 and attempt > 0 and shared_state.get('stop', False):
+                break
+            
+            public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+            public_hex = public_bytes.hex()
+            
+            if KeyValidator.check_vanity_pattern(public_hex, config):
+                hits.append((public_hex, private_bytes.hex()))
+            
+            if config.watchlist_patterns:
+                for pattern in KeyValidator.check_watchlist_patterns(public_hex, config):
+                    stats['watchlist_hits'][pattern.pattern] = stats['watchlist_hits'].get(pattern.pattern, 0) + 1
+                    watchlist_hits.add(pattern, public_hex, private_bytes)
+            
+            batch_attempts += 1
+        
+        if hits:
+            hit_queue.put((worker_id, hits))
+        total_attempts += batch_attempts
+        record_batch_stats(stats, batch_attempts, time.time() - batch_start_time)
+        shared_state['total_attempts'] = shared_state.get('total_attempts', 0) + batch_attempts
+        shared_state[worker_stats_key(worker_id)] = stats
+        watchlist_hits.flush()
+    
+    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+
+
+def worker_process_fleet(worker_id: int, vanity_n: int, config: VanityConfig,
+                         shared_state: Dict[str, Any]) -> BatchResult:
+    """Worker process for fleet mode: fills open first-byte slots from one key stream.
+    
+    The open slots are a 256-byte flag table in shared_state['open_slots'],
+    re-read between batches whenever shared_state['open_slots_version']
+    changes. A worker fills each slot at most once and sends its hits once per
+    batch as (worker_id, [(public_hex, private_hex), ...]).
+    """
+    batch_size = config.batch_size
+    hit_queue = shared_state['hit_queue']
+    watchlist_hits = WatchlistHitBuffer(shared_state.get('hit_sink'), worker_id)
+    stats = new_worker_stats(worker_id)
+    total_attempts = 0
+    open_slots = None
+    open_version = None
+    
+    while not shared_state.get('stop', False):
+        version = shared_state.get('open_slots_version')
+        if version != open_version:
+            open_slots = bytearray(shared_state.get('open_slots', bytes(256)))
+            open_version = version
+        open_count = sum(open_slots)
+        if not open_count:
+            break
+        
+        batch_start_time = time.time()
+        batch_attempts = 0
+        hits = []
+        for attempt in range(batch_size):
+            # Check if the main process asked us to stop (every 50K attempts)
+            if attempt % 50000 == 0 and attempt > 0 and shared_state.get('stop', False):
+                break
+            
+            public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+            batch_attempts += 1
+            node_id = public_bytes[0]
+            if open_slots[node_id]:
+                public_hex = public_bytes.hex()
+                if not vanity_n or KeyValidator._check_vanity_n_pattern(public_hex, vanity_n):
+                    hits.append((public_hex, private_bytes.hex()))
+                    open_slots[node_id] = 0
+                    open_count -= 1
+                    if not open_count:
+                        break
+            
+            if config.watchlist_patterns:
+                public_hex = public_bytes.hex()
+                for pattern in KeyValidator.check_watchlist_patterns(public_hex, config):
+                    stats['watchlist_hits'][pattern.pattern] = stats['watchlist_hits'].get(pattern.pattern, 0) + 1
+                    watchlist_hits.add(pattern, public_hex, private_bytes)
+        
+        if hits:
+            hit_queue.put((worker_id, hits))
+        total_attempts += batch_attempts
+        record_batch_stats(stats, batch_attempts, time.time() - batch_start_time)
+        shared_state['total_attempts'] = shared_state.get('total_attempts', 0) + batch_attempts
+        shared_state[worker_stats_key(worker_id)] = stats
+        watchlist_hits.flush()
+    
+    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+
+
+def worker_process_mine(worker_id: int, categories: Dict[int, VanityConfig], config: VanityConfig,
+                        shared_state: Dict[str, Any]) -> BatchResult:
+    """Worker process for inventory mining: keeps every key that fits an open category.
+    
+    The open categories and the keys each still needs are re-read between
+    batches whenever shared_state['open_categories_version'] changes; a worker
+    never sends more keys for a category than it still needs. Matching keys
+    are sent once per batch as (worker_id, [(public_hex, private_hex), ...]).
+    """
+    batch_size = config.batch_size
+    hit_queue = shared_state['hit_queue']
+    watchlist_hits = WatchlistHitBuffer(shared_state.get('hit_sink'), worker_id)
+    stats = new_worker_stats(worker_id)
+    total_attempts = 0
+    matcher = None
+    needed = {}
+    open_version = None
+    
+    while not shared_state.get('stop', False):
+        version = shared_state.get('open_categories_version')
+        if version != open_version:
+            needed = dict(shared_state.get('open_categories', {}))
+            matcher = OrderMatcher({category_id: categories[category_id] for category_id in needed})
+            open_version = version
+        if matcher.empty():
+            break
+        
+        batch_start_time = time.time()
+        batch_attempts = 0
+        hits = []
+        for attempt in range(batch_size):
+            # Check if the main process asked us to stop (every 50K attempts)
+            if attempt % 50000 == 0 and attempt > 0 and shared_state.get('stop', False):
+                break
+            
+            public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+            public_hex = public_bytes.hex()
+            
+            category_ids = matcher.match(public_hex.upper())
+            if category_ids:
+                hits.append((public_hex, private_bytes.hex()))
+                for category_id in category_ids:
+                    needed[category_id] -= 1
+                    if not needed[category_id]:
+                        matcher.remove(category_id)
+            
+            if config.watchlist_patterns:
+                for pattern in KeyValidator.check_watchlist_patterns(public_hex, config):
+                    stats['watchlist_hits'][pattern.pattern] = stats['watchlist_hits'].get(pattern.pattern, 0) + 1
+                    watchlist_hits.add(pattern, public_hex, private_bytes)
+            
+            batch_attempts += 1
+        
+        if hits:
+            hit_queue.put((worker_id, hits))
+        total_attempts += batch_attempts
+        record_batch_stats(stats, batch_attempts, time.time() - batch_start_time)
+        shared_state['total_attempts'] = shared_state.get('total_attempts', 0) + batch_attempts
+        shared_state[worker_stats_key(worker_id)] = stats
+        watchlist_hits.flush()
+    
+    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+
+
+def worker_best_key(worker_id: int) -> str:
+    """Return the shared state key a worker publishes its best keys under."""
+    return f'worker_{worker_id}_best'
+
+
+def worker_process_best(worker_id: int, config: VanityConfig, shared_state: Dict[str, Any],
+                        metric: str, top_k: int) -> BatchResult:
+    """Worker process for best-so-far mode: keeps the top K keys by score.
+    
+    The worker holds a local min-heap of (score, public_hex, private_hex) and
+    publishes it to shared_state[worker_best_key(worker_id)] only at the end
+    of a batch in which it improved. A key matching the full pattern is
+    published straight away and stops the search.
+    """
+    batch_size = config.batch_size
+    target_prefix = (config.target_prefix or config.target_first_two or '').upper() or None
+    watchlist_hits = WatchlistHitBuffer(shared_state.get('hit_sink'), worker_id)
+    stats = new_worker_stats(worker_id)
+    heap = []
+    threshold = -1  # Score a key must beat to enter a full heap
+    total_attempts = 0
+    
+    while not shared_state.get('stop', False):
+        batch_start_time = time.time()
+        batch_attempts = 0
+        improved = False
+        for attempt in range(batch_size):
+            # Check if the main process asked us to stop (every 50K attempts)
+            if attempt % 50000 == 0 and attempt > 0 and shared_state.get('stop', False):
+                break
+            
+            public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+            public_hex = public_bytes.hex()
+            public_hex_upper = public_hex.upper()
+            
+            score = KeyScorer.score(public_hex_upper, metric, target_prefix)
+            if score > threshold:
+                entry = (score, public_hex, private_bytes.hex())
+                if len(heap) < top_k:
+                    heapq.heappush(heap, entry)
+                else:
+                    heapq.heapreplace(heap, entry)
+                if len(heap) == top_k:
+                    threshold = heap[0][0]
+                improved = True
+            
+            if config.watchlist_patterns:
+                for pattern in KeyValidator.check_watchlist_patterns(public_hex, config):
+                    stats['watchlist_hits'][pattern.pattern] = stats['watchlist_hits'].get(pattern.pattern, 0) + 1
+                    watchlist_hits.add(pattern, public_hex, private_bytes)
+            
+            if KeyValidator.check_vanity_pattern(public_hex, config):
+                shared_state['full_match'] = (worker_id, public_hex, private_bytes.hex())
+                shared_state['stop'] = True
+                batch_attempts += 1
+                improved = True
+                break
+            
+            batch_attempts += 1
+        
+        total_attempts += batch_attempts
+        record_batch_stats(stats, batch_attempts, time.time() - batch_start_time)
+        shared_state['total_attempts'] = shared_state.get('total_attempts', 0) + batch_attempts
+        shared_state[worker_stats_key(worker_id)] = stats
+        watchlist_hits.flush()
+        if improved:
+            shared_state[worker_best_key(worker_id)] = sorted(heap, reverse=True)
+    
+    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+
+
+def worker_search_slice(job_id: str, config: VanityConfig, slice_size: int
+                        ) -> Tuple[str, int, Optional[Tuple[str, str]]]:
+    """Search one slice of keys for a daemon job.
+    
+    Returns (job_id, attempts, (public_hex, private_hex)) with the key set to
+    None if no match was found in the slice.
+    """
+    for attempt in range(slice_size):
+        public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+        public_hex = public_bytes.hex()
+        if KeyValidator.check_vanity_pattern(public_hex, config):
+            return job_id, attempt + 1, (public_hex, private_bytes.hex())
+    return job_id, slice_size, None
+
+
+def worker_warm_up() -> int:
+    """Touch the key generation path once so a new pool worker is ready for jobs."""
+    Ed25519KeyGenerator.generate_meshcore_keypair()
+    return os.getpid()
+
+
+def worker_generate_bulk(count: int) -> bytes:
+    """Generate count keys for bulk output as packed records.
+    
+    Each record is BulkKeyWriter.RECORD_SIZE bytes: the 32-byte public key
+    followed by the 64-byte private key.
+    """
+    parts = []
+    for _ in range(count):
+        public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+        parts.append(public_bytes)
+        parts.append(private_bytes)
+    return b''.join(parts)
+
+
+def worker_verify_keys(records: List[Tuple[str, str, str]]) -> Tuple[int, List[Tuple[str, str, str, str]]]:
+    """Re-derive the public key of every (source, public_hex, private_hex) record.
+    
+    Returns (records checked, problems) where each problem is
+    (source, 'mismatch' or 'malformed', public_hex, detail).
+    """
+    problems = []
+    for source, public_hex, private_hex in records:
+        try:
+            public_bytes = bytes.fromhex(public_hex)
+            private_bytes = bytes.fromhex(private_hex)
+        except ValueError:
+            problems.append((source, 'malformed', public_hex, 'key is not valid hex'))
+            continue
+        if len(public_bytes) != 32 or len(private_bytes) != 64:
+            problems.append((source, 'malformed', public_hex,
+                             f'expected 32-byte public and 64-byte private key, got {len(public_bytes)} and '
+                             f'{len(private_bytes)}'))
+            continue
+        derived = crypto_scalarmult_ed25519_base_noclamp(private_bytes[:32])
+        if derived != public_bytes:
+            problems.append((source, 'mismatch', public_hex, f'private key derives {derived.hex()}'))
+    return len(records), problems
+
+
+def worker_write_corpus(path: str, start: int, count: int) -> int:
+    """Generate count public keys and write them at record index start of a corpus file."""
+    with open(path, 'r+b') as f:
+        f.seek(start * KeyCorpus.RECORD_SIZE)
+        remaining = count
+        while remaining > 0:
+            n = min(KeyCorpus.WRITE_CHUNK, remaining)
+            f.write(b''.join(Ed25519KeyGenerator.generate_meshcore_keypair()[0] for _ in range(n)))
+            remaining -= n
+    return count
+
+
+def worker_count_key_bytes(count: int, keep_keys: bool = False) -> Tuple[List[int], bytes]:
+    """Generate count public keys and count their first bytes (node IDs) for the --test-* diagnostics.
+    
+    Returns (first byte counts, packed public keys); the packed keys are only
+    returned when keep_keys is set.
+    """
+    packed = b''.join(Ed25519KeyGenerator.generate_meshcore_keypair()[0] for _ in range(count))
+    if NUMPY_AVAILABLE:
+        first_counts = np.bincount(np.frombuffer(packed, dtype=np.uint8)[0::32], minlength=256).tolist()
+    else:
+        first_counts = [0] * 256
+        for value in packed[0::32]:
+            first_counts[value] += 1
+    return first_counts, packed if keep_keys else b''
+
+
+class ArgumentParser:
+    """Handles command line argument parsing and validation."""
+    
+    @staticmethod
+    def create_parser() -> argparse.ArgumentParser:
+        parser = argparse.ArgumentParser(
+            description="MeshCore Ed25519 Vanity Key Generator (Fixed)",
+            formatter_class=argparse.RawDescriptionHelpFormatter,
+            epilog=ArgumentParser._get_examples()
+        )
+        
+        ArgumentParser._add_arguments(parser)
+        return parser
+    
+    @staticmethod
+    def _add_arguments(parser: argparse.ArgumentParser):
+        """Add command line arguments."""
+        parser.add_argument('--keys', type=ArgumentParser._parse_keys,
+                          help='Number of keys to check (e.g., 100 for 100M, 1b for 1B)')
+        parser.add_argument('--time', type=ArgumentParser._parse_time,
+                          help='Max runtime (e.g., 2 or 2:30)')
+        parser.add_argument('--batch-size', type=ArgumentParser._parse_batch_size,
+                          help='Batch size for worker processes (e.g., 500K, 1M, 2M)')
+        parser.add_argument('--workers', type=int,
+                          help='Number of worker processes to use (default: auto-detect optimal count)')
+        parser.add_argument('--watchlist', type=str,
+                          help='Path to watchlist file with patterns to monitor (auto-loads watchlist.txt if not specified)')
+        parser.add_argument('--first-two', type=str,
+                          help='First two hex chars to search for (e.g., F8)')
+        parser.add_argument('--prefix', type=str,
+                          help='Hex prefix to search for (e.g., F8A1)')
+        parser.add_argument('--simple', action='store_true',
+                          help='Simple mode: only check first two hex chars (requires --first-two)')
+        parser.add_argument('--four-char', action='store_true',
+                          help='Legacy 4-char vanity mode with optional --first-two constraint')
+
+        parser.add_argument('--pattern-2', action='store_true',
+                          help='2-char cosmetic pattern (first 2 hex == last 2 hex OR palindromic)')
+        parser.add_argument('--pattern-4', action='store_true',
+                          help='4-char cosmetic pattern (first 4 hex == last 4 hex OR palindromic)')
+        parser.add_argument('--pattern-6', action='store_true',
+                          help='6-char cosmetic pattern (first 6 hex == last 6 hex OR palindromic)')
+        parser.add_argument('--pattern-8', action='store_true',
+                          help='8-char cosmetic pattern (first 8 hex == last 8 hex OR palindromic)')
+        parser.add_argument('--health-check', action='store_true', default=True,
+                          help='Enable health monitoring (default) to restart workers if performance degrades.')
+        parser.add_argument('--no-health-check', action='store_false', dest='health_check',
+                          help='Disable health monitoring and do not restart workers on performance degradation.')
+        parser.add_argument('--verbose', '-v', action='store_true',
+                          help='Enable verbose output including per-worker progress and health monitoring details.')
+        parser.add_argument('--metrics-port', type=int, metavar='PORT',
+                          help='Serve live Prometheus metrics on http://127.0.0.1:PORT/metrics')
+        parser.add_argument('--metrics-bind', type=str, default='127.0.0.1', metavar='ADDRESS',
+                          help='Address for the metrics endpoint (default: 127.0.0.1, use 0.0.0.0 for remote scraping)')
+        parser.add_argument('--events', type=str, metavar='FILE',
+                          help="Write structured JSONL telemetry events to FILE ('-' for stdout)")
+        parser.add_argument('--profile', type=str, metavar='DIR', dest='profile_dir',
+                          help='Profile every worker with cProfile and write merged report to DIR')
+        parser.add_argument('--profile-window', type=int, default=30, metavar='SECONDS',
+                          help='Seconds each worker runs under the profiler (default: 30)')
+        parser.add_argument('--stage-sample', type=int, default=1000, metavar='N',
+                          help='Time entropy/hashing/scalarmult/matching/watchlist stages for every Nth key (default: 1000, 0 disables)')
+        parser.add_argument('--hits-db', type=str, metavar='FILE',
+                          help='Store watchlist hits (and the found key) in SQLite FILE instead of separate key files')
+        parser.add_argument('--checkpoint', type=str, metavar='FILE',
+                          help='Periodically save run progress to FILE so the search can be resumed')
+        parser.add_argument('--checkpoint-interval', type=int, default=60, metavar='SECONDS',
+                          help='Seconds between checkpoint saves (default: 60)')
+        parser.add_argument('--resume', type=str, metavar='FILE',
+                          help='Resume the search saved in checkpoint FILE (--keys/--time extend its budget)')
+        parser.add_argument('--control-socket', type=str, metavar='PATH',
+                          help='Accept runtime control commands (workers, pause, resume, time, keys, pattern, '
+                               'status) on the Unix socket PATH')
+        parser.add_argument('--cpu-budget', type=float, metavar='PERCENT',
+                          help='Hold the workers together to PERCENT of all CPU cores by pausing them between '
+                               'batches, based on their measured CPU time')
+        parser.add_argument('--idle-priority', action='store_true',
+                          help='Run workers at idle scheduling priority (SCHED_IDLE, else nice 19) so other '
+                               'services always come first')
+        parser.add_argument('--control-send', type=str, metavar='COMMAND',
+                          help="Send COMMAND (e.g. 'workers +1' or 'time +0:30') to the search listening on "
+                               "--control-socket and print the reply")
+        
+        # Test functions
+        parser.add_argument('--test-compatibility', action='store_true',
+                          help='Test compatibility with known MeshCore keys')
+        parser.add_argument('--test-distribution', nargs='?', const=1, type=float,
+                          metavar='MILLIONS',
+                          help='Test distribution of first two hex chars (default: 1M keys)')
+        parser.add_argument('--test-entropy', nargs='?', const=1, type=float,
+                          metavar='THOUSANDS',
+                          help='Test entropy and randomness (default: 10K keys)')
+        parser.add_argument('--test-meshcore-id', nargs='?', const=1, type=float,
+                          metavar='THOUSANDS',
+                          help='Test MeshCore node ID format (default: 1K keys)')
+        parser.add_argument('--test-difficulty', nargs='?', const=1000, type=float,
+                          metavar='THOUSANDS',
+                          help='Compare predicted and observed hit rates of easy patterns (default: 1M keys)')
+        parser.add_argument('--dedup-memory', type=int, default=DuplicateDetector.DEFAULT_MEMORY_MB, metavar='MB',
+                          help='Memory ceiling for the duplicate check of --test-entropy and --corpus-analyze '
+                               f'(default: {DuplicateDetector.DEFAULT_MEMORY_MB} MB); larger runs spill to disk')
+        parser.add_argument('--dedup-bloom', action='store_true',
+                          help='Front the --test-entropy duplicate check with a Bloom filter (skips the sort '
+                               'when no key can be a repeat)')
+        parser.add_argument('--dedup-dir', type=str, metavar='DIR',
+                          help='Directory for duplicate-check spill files (default: system temp directory)')
+        parser.add_argument('--corpus', type=str, metavar='FILE',
+                          help='Public-key corpus file (flat 32-byte records) for --corpus-write/--corpus-analyze')
+        parser.add_argument('--corpus-write', type=ArgumentParser._parse_bulk, metavar='N',
+                          help='Write N new public keys to --corpus in parallel (e.g., 500K, 100M)')
+        parser.add_argument('--corpus-analyze', action='store_true',
+                          help='Analyze --corpus: byte/nibble histograms, chi-square, node ID coverage, duplicates '
+                               '(requires numpy)')
+        
+        # Output options
+        parser.add_argument('--json', action='store_true',
+                          help='Output keys in JSON format for MeshCore app import')
+        
+        # Multi-order search
+        parser.add_argument('--orders', type=str, metavar='FILE',
+                          help='Fill every order in FILE from one key stream (see orders.example.txt)')
+        
+        # Collect mode
+        parser.add_argument('--collect', type=ArgumentParser._parse_collect, metavar='N|all',
+                          help='Keep searching after a match and collect N matching keys (or all within --keys/--time)')
+        parser.add_argument('--collect-output', type=str, metavar='FILE',
+                          help="JSONL file for collected keys ('-' for stdout, default: meshcore_collect_<time>.jsonl)")
+        
+        # Fleet provisioning
+        parser.add_argument('--fleet', type=ArgumentParser._parse_fleet, metavar='all|N|IDS',
+                          help='Fill one key per node ID in a single pass: all 256 IDs, any N IDs, '
+                               'or a list such as 00,3A,F0-FF')
+        parser.add_argument('--fleet-output', type=str, metavar='FILE',
+                          help='JSON batch import file for the fleet keys (default: meshcore_fleet_<time>.json)')
+        
+        # Bulk generation
+        parser.add_argument('--bulk', type=ArgumentParser._parse_bulk, metavar='N',
+                          help='Generate N plain keys as fast as possible (e.g., 50000, 500K, 10M)')
+        parser.add_argument('--bulk-format', type=str, choices=BulkKeyWriter.FORMATS, default='bin',
+                          help='Bulk output: length-framed binary (default), jsonl, or a tree of jsonl shards by node ID')
+        parser.add_argument('--bulk-output', type=str, metavar='PATH',
+                          help='Bulk output file or directory (default: meshcore_bulk_<time>.<format>)')
+        parser.add_argument('--compress', type=str, choices=sorted(BulkKeyWriter.COMPRESSORS),
+                          help='Compress bulk output')
+        parser.add_argument('--stdout-raw', action='store_true',
+                          help='Write bulk keys to stdout as bare 96-byte records (public + private); messages go to stderr')
+        
+        # Key inventory
+        parser.add_argument('--inventory', type=str, metavar='DB',
+                          help='SQLite key inventory: serve the pattern from stock first (each key is handed out once) '
+                               'and search live only on a miss')
+        parser.add_argument('--mine', action='store_true',
+                          help='Mine keys into --inventory until every category reaches its quota (or --keys/--time)')
+        parser.add_argument('--inventory-quotas', type=str, metavar='FILE',
+                          help='Categories and quotas for --mine (see inventory.example.txt; default: 4 per node ID, '
+                               '50 pattern-2, 10 pattern-4)')
+        
+        # Key file verification
+        parser.add_argument('--verify-dir', type=str, metavar='PATH',
+                          help='Re-derive and check every saved key under PATH (txt pairs, JSON, JSONL, bulk bin) '
+                               'in parallel, reporting mismatches, malformed files and duplicates')
+        parser.add_argument('--verify-report', type=str, metavar='FILE',
+                          help='JSON report for --verify-dir (default: meshcore_verify_<time>.json)')
+        
+        # Capacity planning
+        parser.add_argument('--plan', action='store_true',
+                          help='Print time-to-find quantiles (P50/P90/P99) and required cores for the pattern '
+                               'without starting a search')
+        parser.add_argument('--plan-rate', type=float, metavar='KEYS_PER_SEC',
+                          help='Keys/sec per core for --plan (default: measured on this machine for a few seconds)')
+        parser.add_argument('--plan-hosts', type=int, default=1, metavar='N',
+                          help='Hosts for --plan, each running --workers workers (default: 1)')
+        parser.add_argument('--plan-deadline', type=ArgumentParser._parse_time, metavar='TIME',
+                          help='Deadline for --plan (e.g., 8 or 2:30): reports the chance of making it and the '
+                               'cores needed')
+        parser.add_argument('--plan-confidence', type=float, default=90, metavar='PERCENT',
+                          help='Confidence for the --plan-deadline core count (default: 90)')
+        
+        # Best-so-far mode
+        parser.add_argument('--best', type=int, metavar='K',
+                          help='Keep the best K near misses by --score and return them when the budget runs out')
+        parser.add_argument('--score', type=str, choices=KeyScorer.METRICS, default='mix',
+                          help='Near-miss metric for --best: prefix, mirror (first n == last n), palindrome, '
+                               'or mix (prefix + longer of mirror/palindrome, default)')
+        parser.add_argument('--best-output', type=str, metavar='FILE',
+                          help='JSON file for the best keys (default: meshcore_best_<time>.json)')
+        
+        # Daemon mode
+        parser.add_argument('--serve', action='store_true',
+                          help=f'Run as a daemon with a warm worker pool and a local job API '
+                               f'(default: http://127.0.0.1:{KeygenDaemon.DEFAULT_PORT})')
+        parser.add_argument('--serve-port', type=int, metavar='PORT',
+                          help='Serve the job API on http://127.0.0.1:PORT')
+        parser.add_argument('--serve-socket', type=str, metavar='PATH',
+                          help='Serve the job API on the Unix socket PATH')
+        parser.add_argument('--serve-token-file', type=str, metavar='FILE',
+                          help=f'Where the daemon writes the bearer token required on its HTTP port '
+                               f'(default: {KeygenDaemon.DEFAULT_TOKEN_FILE})')
+        
+        # Distributed search
+        parser.add_argument('--coordinator', type=str, metavar='[HOST:]PORT',
+                          help='Coordinate a distributed search for the given pattern (default host: 127.0.0.1, use 0.0.0.0 '
+                               'with --cluster-token for remote nodes)')
+        parser.add_argument('--join', type=str, metavar='HOST:PORT',
+                          help='Join a distributed search as a worker node')
+        parser.add_argument('--cluster-token', type=str, metavar='TOKEN',
+                          help='Shared secret that nodes must present to the coordinator '
+                               '(required unless the coordinator binds to a loopback address)')
+        parser.add_argument('--node-name', type=str, metavar='NAME',
+                          help='Name this node reports to the coordinator (default: hostname)')
+    
+    @staticmethod
+    def _parse_keys(keys_str: str) -> int:
+        """Parse keys argument.
+        
+        Examples:
+            --keys 1     -> 1,000,000 keys (1 million)
+            --keys 100   -> 100,000,000 keys (100 million)
+            --keys 1500  -> 1,500,000,000 keys (1.5 billion)
+            --keys 1b    -> 1,000,000,000 keys (1 billion)
+            --keys 0.5b  -> 500,000,000 keys (500 million)
+        """
+        try:
+            if keys_str.lower().endswith('b'):
+                return int(float(keys_str[:-1]) * 1000000000)
+            
+            keys = float(keys_str)
+            # Always multiply by 1 million unless it ends with 'b'
+            keys *= 1000000
+            return int(keys)
+        except ValueError:
+            raise argparse.ArgumentTypeError("Invalid number format")
+    
+    @staticmethod
+    def _parse_collect(collect_str: str) -> int:
+        """Parse collect argument ('all' -> 0, meaning no limit)."""
+        if collect_str.lower() == 'all':
+            return 0
+        try:
+            count = int(collect_str)
+        except ValueError:
+            raise argparse.ArgumentTypeError("must be a number of keys or 'all'")
+        if count < 1:
+            raise argparse.ArgumentTypeError("must be at least 1")
+        return count
+    
+    @staticmethod
+    def _parse_bulk(bulk_str: str) -> int:
+        """Parse a key count for --bulk or --corpus-write (plain count, or K/M/B suffix)."""
+        multipliers = {'k': 1000, 'm': 1000000, 'b': 1000000000}
+        try:
+            multiplier = multipliers.get(bulk_str[-1:].lower())
+            count = int(float(bulk_str[:-1]) * multiplier) if multiplier else int(bulk_str)
+        except ValueError:
+            raise argparse.ArgumentTypeError("Invalid number format")
+        if count < 1:
+            raise argparse.ArgumentTypeError("must be at least 1")
+        return count
+    
+    @staticmethod
+    def _parse_fleet(fleet_str: str) -> Tuple[List[int], int]:
+        """Parse fleet argument into (wanted node IDs, number of slots to fill).
+        
+        Examples:
+            --fleet all          -> all 256 node IDs
+            --fleet 40           -> any 40 distinct node IDs
+            --fleet 00,3A,F0-FF  -> node IDs 00, 3A and F0 through FF
+        """
+        if fleet_str.lower() == 'all':
+            return list(range(256)), 256
+        if fleet_str.isdigit():
+            count = int(fleet_str)
+            if not 1 <= count <= 256:
+                raise argparse.ArgumentTypeError("count must be between 1 and 256")
+            return list(range(256)), count
+        slots = set()
+        for part in fleet_str.split(','):
+            first, _, last = part.strip().partition('-')
+            try:
+                if len(first) != 2 or (last and len(last) != 2):
+                    raise ValueError
+                start = int(first, 16)
+                end = int(last, 16) if last else start
+            except ValueError:
+                raise argparse.ArgumentTypeError(f"invalid node ID or range '{part.strip()}' (use e.g. 3A or F0-FF)")
+            if end < start:
+                raise argparse.ArgumentTypeError(f"empty range '{part.strip()}'")
+            slots.update(range(start, end + 1))
+        return sorted(slots), len(slots)
+    
+    @staticmethod
+    def _parse_time(time_str: str) -> int:
+        """Parse time argument."""
+        try:
+            if ':' in time_str:
+                hours, minutes = time_str.split(':')
+                return int(hours) * 3600 + int(minutes) * 60
+            else:
+                return int(time_str) * 3600
+        except ValueError:
+            raise argparse.ArgumentTypeError("Invalid time format")
+    
+    @staticmethod
+    def _parse_batch_size(size_str: str) -> int:
+        """Parse batch size argument."""
+        try:
+            if size_str.lower().endswith('k'):
+                return int(float(size_str[:-1]) * 1000)
+            elif size_str.lower().endswith('m'):
+                return int(float(size_str[:-1]) * 1000000)
+            else:
+                return int(size_str)
+        except ValueError:
+            raise argparse.ArgumentTypeError("Invalid batch size format")
+    
+    @staticmethod
+    def _get_examples() -> str:
+        return """
+Examples:
+  python meshcore_keygen.py --keys 100         # 100 million keys
+  python meshcore_keygen.py --keys 1b          # 1 billion keys
+  python meshcore_keygen.py --time 2           # 2 hours
+  python meshcore_keygen.py --time 2:30        # 2 hours 30 minutes
+  python meshcore_keygen.py --batch-size 500K  # 500K keys per batch
+  python meshcore_keygen.py --batch-size 2M    # 2M keys per batch
+  python meshcore_keygen.py --workers 4        # Use 4 worker processes
+  python meshcore_keygen.py --workers 8        # Use 8 worker processes
+  python meshcore_keygen.py --watchlist patterns.txt  # Monitor specific patterns file
+  python meshcore_keygen.py --first-two F8     # Keys starting with F8 (auto-loads watchlist.txt)
+  python meshcore_keygen.py --first-two F8 --simple  # Simple mode
+  python meshcore_keygen.py --prefix F8A1      # Keys starting with F8A1
+  python meshcore_keygen.py --four-char        # 4-char vanity (legacy mode)
+  python meshcore_keygen.py --four-char --first-two F8  # 4-char + F8 start
+  python meshcore_keygen.py --pattern-2         # 2-char cosmetic pattern
+  python meshcore_keygen.py --pattern-4         # 4-char cosmetic pattern
+  python meshcore_keygen.py --pattern-6         # 6-char cosmetic pattern
+  python meshcore_keygen.py --pattern-8         # 8-char cosmetic pattern
+  python meshcore_keygen.py --prefix F8 --pattern-8 # Prefix + cosmetic pattern
+  python meshcore_keygen.py --test-compatibility  # Test known MeshCore keys
+  python meshcore_keygen.py --test-distribution 0.1  # Test with 100K keys
+  python meshcore_keygen.py --test-entropy 10  # Test with 10K keys
+  python meshcore_keygen.py --test-difficulty  # Check predicted pattern probabilities (1M keys)
+  python meshcore_keygen.py --test-entropy 100000 --dedup-memory 512 --dedup-bloom  # 100M keys, 512 MB cap
+  python meshcore_keygen.py --corpus keys.corpus --corpus-write 100M --corpus-analyze  # Large-scale key statistics
+  python meshcore_keygen.py --pattern-4 --json  # Generate cosmetic pattern key in JSON format
+  python meshcore_keygen.py --first-two F8 --verbose  # Enable verbose output
+  python meshcore_keygen.py --pattern-6 -v  # Short form for verbose mode
+  python meshcore_keygen.py --pattern-8 --metrics-port 9101  # Export Prometheus metrics
+  python meshcore_keygen.py --pattern-8 --events run.jsonl   # Write JSONL telemetry events
+  python meshcore_keygen.py --pattern-8 --profile prof --time 0:05  # Profile workers
+  python meshcore_keygen.py --orders orders.txt --time 8      # Fill many orders in one run
+  python meshcore_keygen.py --pattern-4 --collect 20          # Collect 20 candidate keys
+  python meshcore_keygen.py --prefix F8 --collect all --keys 10  # Every F8 key in 10M keys
+  python meshcore_keygen.py --fleet all                       # One key for every node ID
+  python meshcore_keygen.py --fleet 00,3A,F0-FF --pattern-2   # Selected node IDs with a pattern
+  python meshcore_keygen.py --bulk 10M --bulk-format jsonl --compress gzip  # 10M plain keys
+  python meshcore_keygen.py --bulk 1M --stdout-raw | ./provision-tool  # Pipe raw key records
+  python meshcore_keygen.py --inventory keys.db --mine --time 1  # Stock the key inventory
+  python meshcore_keygen.py --inventory keys.db --pattern-4    # Serve from stock, live search on a miss
+  python meshcore_keygen.py --verify-dir ./keys              # Audit every saved key under ./keys
+  python meshcore_keygen.py --pattern-8 --plan --plan-deadline 8  # Cost of a pattern-8 order
+  python meshcore_keygen.py --pattern-8 --best 10 --time 1    # Best 10 near misses in an hour
+  python meshcore_keygen.py --prefix F8 --pattern-8 --checkpoint run.ckpt  # Save progress every minute
+  python meshcore_keygen.py --resume run.ckpt                # Continue a checkpointed search
+  python meshcore_keygen.py --pattern-8 --control-socket /tmp/kg.ctl  # Accept live control commands
+  python meshcore_keygen.py --control-socket /tmp/kg.ctl --control-send 'workers +2'  # Grow the pool
+  python meshcore_keygen.py --pattern-8 --cpu-budget 25 --idle-priority  # Background search next to services
+  python meshcore_keygen.py --serve --serve-socket /tmp/keygen.sock  # Keygen daemon
+  python meshcore_keygen.py --prefix F8 --pattern-8 --coordinator 0.0.0.0:7700  # Distributed search
+  python meshcore_keygen.py --join coordinator-host:7700  # Add this machine to a distributed search
+
+Cosmetic Pattern Modes:
+  --pattern-2: First 2 hex chars == last 2 hex chars OR palindromic
+  --pattern-4: First 4 hex chars == last 4 hex chars OR palindromic  
+  --pattern-6: First 6 hex chars == last 6 hex chars OR palindromic
+  --pattern-8: First 8 hex chars == last 8 hex chars OR palindromic (default)
+  --four-char: Legacy mode with 4-char vanity + optional --first-two constraint
+  --prefix: Keys starting with specific hex prefix (combine with --pattern-*)
+  --simple: Only check first two hex chars (requires --first-two)
+
+Batch Processing:
+  Workers now process keys in configurable batches and check in with the main process.
+  This allows for faster termination when a key is found and better resource utilization.
+  Default batch size is 100K keys. Use --batch-size to adjust (e.g., 50K, 500K, 2M).
+
+Watchlist Feature:
+  Use --watchlist to monitor for additional patterns while searching for your primary target.
+  If no --watchlist is specified, the script automatically loads watchlist.txt if it exists.
+  Watchlist keys are automatically saved when found, and the search continues.
+  
+  Watchlist file format (one pattern per line):
+    ABCD...EFGH                    # First 4 chars and last 4 chars
+    ABCD...ABCDEFGH               # First 4 chars and last 8 chars  
+    ABCDEFGH...ABCD               # First 8 chars and last 4 chars
+    ABCD...EFGH|My cool pattern   # With optional description
+    # This is a comment line
+        """
+
+
+class _ControlSocketServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Line-protocol server for RunControl on a Unix domain socket."""
+    daemon_threads = True
+
+
+class _ControlRequestHandler(socketserver.StreamRequestHandler):
+    """Answer each command line with one JSON line."""
+    
+    def handle(self):
+        for line in self.rfile:
+            line = line.decode('utf-8', 'replace').strip()
+            if line:
+                reply = self.server.control.handle(line)
+                self.wfile.write((json.dumps(reply) + '\n').encode('utf-8'))
+
+
+class RunControl:
+    """Runtime control channel of a pool search (--control-socket).
+    
+    A thread serves one command per line on a Unix socket and applies it to
+    the running search. The main process keeps the settings and publishes
+    them to the workers (see WorkerControl), which pick them up within 50K
+    keys: between batches they retire when the pool shrinks, wait while the
+    run is paused and switch to a new pattern. Key counts and elapsed time
+    run on across every change; each pattern gets its own accounting segment.
+    Without a socket it still carries the host contention back-off.
+    
+    Commands:
+        status                       run, budget, worker and pattern summary
+        pause / resume               hold all workers (paused time does not count toward --time)
+        workers N|+N|-N              resize the pool
+        time H|H:MM|+H:MM|-H:MM|off  set, extend or shorten the time limit (--time format)
+        keys N|+N|-N|off             set, extend or shorten the key budget (--keys format)
+        pattern OPTIONS              switch the pattern (--prefix, --first-two, --pattern-N, ...)
+    """
+    
+    COMMANDS = ('status', 'pause', 'resume', 'workers', 'time', 'keys', 'pattern')
+    
+    def __init__(self, generator: 'MeshCoreKeyGenerator', config: VanityConfig, shared_state: Dict[str, Any],
+                 num_workers: int, max_workers: int):
+        self.generator = generator
+        self.config = config
+        self.shared_state = shared_state
+        self.workers = num_workers
+        self.max_workers = max_workers
+        self.running = set()  # Worker ids with a live future, kept by the main loop
+        self.progress_bar = None
+        self.watchdog = None
+        self.paused_at = None
+        self.paused_total = 0.0
+        self.version = 0
+        self.lock = threading.Lock()
+        self.server = None
+        self.segments = [{'pattern': describe_pattern(config), 'start_attempts': shared_state['total_attempts'],
+                          'attempts': 0}]
+        self.publish()
+    
+    @property
+    def paused(self) -> bool:
+        return self.paused_at is not None
+    
+    def start(self, path: str):
+        """Listen for commands on the Unix socket path."""
+        if os.path.exists(path):
+            os.unlink(path)  # Stale socket from a previous run
+        self.server = _ControlSocketServer(path, _ControlRequestHandler)
+        self.server.control = self
+        os.chmod(path, 0o600)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"Control socket: {path}")
+    
+    def stop(self):
+        """Stop serving commands and remove the socket."""
+        if self.server is None:
+            return
+        path = self.server.server_address
+        try:
+            self.server.shutdown()
+            self.server.server_close()
+        except Exception:
+            pass
+        self.server = None
+        if path and os.path.exists(path):
+            os.unlink(path)
+    
+    def publish(self):
+        """Send the current settings to the workers."""
+        config = self.config
+        self.version += 1
+        self.shared_state['control'] = {
+            'paused': self.paused,
+            'workers': self.workers,
+            'deadline': self.generator.start_time + config.max_time if config.max_time else None,
+            'pattern': {name: getattr(config, name) for name in WorkerControl.PATTERN_FIELDS},
+        }
+        self.shared_state['control_version'] = self.version
+    
+    def handle(self, line: str) -> Dict[str, Any]:
+        """Apply one command line and return the JSON reply."""
+        command, _, argument = line.partition(' ')
+        command, argument = command.lower(), argument.strip()
+        if command not in self.COMMANDS:
+            return {'ok': False, 'error': f"Unknown command '{command}' (commands: {', '.join(self.COMMANDS)})"}
+        try:
+            with self.lock:
+                if command == 'status':
+                    return {'ok': True, 'status': self.status()}
+                message = getattr(self, f'_do_{command}')(argument)
+                self.publish()
+                status = self.status()
+        except (ValueError, argparse.ArgumentTypeError) as e:
+            return {'ok': False, 'error': f"{command}: {e}"}
+        
+        self._refresh_progress_bar()
+        if self.progress_bar:
+            self.progress_bar.write(f"Control: {message}")
+        else:
+            print(f"Control: {message}")
+        if self.generator.event_log:
+            self.generator.event_log.emit('control', command=line, message=message)
+        return {'ok': True, 'message': message, 'status': status}
+    
+    def status(self) -> Dict[str, Any]:
+        """Return a summary of the run and its current settings."""
+        now = time.time()
+        config = self.config
+        attempts = self.shared_state.get('total_attempts', 0)
+        elapsed = now - self.generator.start_time
+        paused = self.paused_total + (now - self.paused_at if self.paused else 0)
+        searching = elapsed - paused
+        session_attempts = attempts - self.generator.resume_attempts
+        segments = [dict(segment) for segment in self.segments]
+        segments[-1]['attempts'] = attempts - segments[-1]['start_attempts']
+        return {
+            'pattern': describe_pattern(config),
+            'expected_keys': round(1 / calculate_pattern_probability(config)),
+            'paused': self.paused,
+            'workers': self.workers,
+            'running_workers': len(self.running),
+            'attempts': attempts,
+            'elapsed': round(elapsed, 1),
+            'paused_time': round(paused, 1),
+            'rate': round(session_attempts / searching, 1) if searching > 0 else 0.0,
+            'time_limit': config.max_time,
+            'time_remaining': round(max(0.0, config.max_time - elapsed), 1) if config.max_time else None,
+            'target_keys': self.shared_state.get('target_keys'),
+            'contention': (HostContention.current(self.shared_state) or {}).get('reason'),
+            'segments': [{'pattern': segment['pattern'], 'attempts': segment['attempts']} for segment in segments],
+            'worker_health': {str(w): health for w, health in self.watchdog.snapshot().items()
+                              if w in self.running} if self.watchdog else {},
+        }
+    
+    @staticmethod
+    def _adjust(current: int, argument: str, parse) -> int:
+        """Parse an absolute value, or +N/-N relative to current."""
+        if not argument:
+            raise ValueError("missing value")
+        if argument[0] in '+-':
+            delta = parse(argument[1:])
+            return current + delta if argument[0] == '+' else current - delta
+        return parse(argument)
+    
+    def resize(self, count: int):
+        """Set the worker count; callers hold the lock and publish."""
+        self.workers = count
+        if self.config.cpu_budget:
+            self.shared_state['cpu_share'] = cpu_share_per_worker(self.config.cpu_budget, count)
+    
+    def _do_pause(self, argument: str) -> str:
+        if self.paused:
+            return "Already paused"
+        self.paused_at = time.time()
+        return "Paused all workers"
+    
+    def _do_resume(self, argument: str) -> str:
+        if not self.paused:
+            return "Not paused"
+        paused = time.time() - self.paused_at
+        self.paused_at = None
+        self.paused_total += paused
+        if self.config.max_time:
+            self.config.max_time += int(round(paused))  # Paused time does not count toward the limit
+        return f"Resumed after {format_duration(paused)}"
+    
+    def _do_workers(self, argument: str) -> str:
+        count = self._adjust(self.workers, argument, int)
+        if not 1 <= count <= self.max_workers:
+            raise ValueError(f"worker count must be between 1 and {self.max_workers}")
+        previous = self.workers
+        self.resize(count)
+        return f"Workers {previous} -> {count}"
+    
+    def _do_time(self, argument: str) -> str:
+        config = self.config
+        elapsed = int(time.time() - self.generator.start_time)
+        if argument.lower() == 'off':
+            config.max_time = None
+            return "Time limit removed"
+        limit = self._adjust(config.max_time or elapsed, argument, ArgumentParser._parse_time)
+        if limit <= 0:
+            raise ValueError("time limit must be positive")
+        config.max_time = limit
+        return f"Time limit {format_duration(limit)} ({format_duration(max(0, limit - elapsed))} left)"
+    
+    def _do_keys(self, argument: str) -> str:
+        attempts = self.shared_state.get('total_attempts', 0)
+        if argument.lower() == 'off':
+            self.shared_state['target_keys'] = None
+            return "Key budget removed"
+        target = self._adjust(self.shared_state.get('target_keys') or attempts, argument, ArgumentParser._parse_keys)
+        if target <= 0:
+            raise ValueError("key budget must be positive")
+        self.shared_state['target_keys'] = target
+        return f"Key budget {target:,} ({max(0, target - attempts):,} left)"
+    
+    def _do_pattern(self, argument: str) -> str:
+        if not argument:
+            raise ValueError("missing pattern options")
+        if self.generator.checkpoint:
+            raise ValueError("cannot change the pattern of a checkpointed search")
+        new_config, args = parse_pattern_options(argument)
+        if args.watchlist or args.json:
+            raise ValueError("only pattern options can be changed")
+        previous = describe_pattern(self.config)
+        attempts = self.shared_state.get('total_attempts', 0)
+        self.segments[-1]['attempts'] = attempts - self.segments[-1]['start_attempts']
+        WorkerControl.apply_pattern(self.config, {name: getattr(new_config, name)
+                                                  for name in WorkerControl.PATTERN_FIELDS})
+        self.segments.append({'pattern': describe_pattern(self.config), 'start_attempts': attempts, 'attempts': 0})
+        return f"Pattern {previous} -> {describe_pattern(self.config)} after {attempts:,} keys"
+    
+    def _refresh_progress_bar(self):
+        """Match the progress bar's total to the current budget or pattern."""
+        bar = self.progress_bar
+        if bar is None:
+            return
+        if bar.time_limit:
+            bar.set_total(self.config.max_time)
+        elif bar.probability:
+            bar.probability = calculate_pattern_probability(self.config)
+            expected = int(0.693 / bar.probability)
+            bar.set_total(expected if expected <= 1e9 else None)
+        elif self.shared_state.get('target_keys'):
+            bar.set_total(self.shared_state['target_keys'])
+
+
+def send_control_command(path: str, command: str, timeout: float = 10.0) -> Dict[str, Any]:
+    """Send one command to a RunControl socket and return its reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(path)
+        sock.sendall((command.strip() + '\n').encode('utf-8'))
+        reply = b''
+        while not reply.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    return json.loads(reply.decode('utf-8'))
+
+
+class MeshCoreKeyGenerator:
+    """Main key generator class."""
+    
+    # Cost model for choosing between an in-process search and the worker pool
+    POOL_STARTUP = 1.5  # Seconds to start the Manager, the spawn pool and the progress thread
+    INLINE_CORE_RATE = 20000  # Conservative keys/sec of one core generating and checking keys
+    
+    def __init__(self):
+        self.start_time = None
+        self.metrics_exporter = None
+        self.event_log = None
+        self.total_attempts = 0
+        self.stage_summary = (0, {})
+        self.cpu_summary = None
+        self.shared_state = None
+        self.stop_reason = None
+        self.checkpoint = None
+        self.resume_attempts = 0
+        self.terminate_requested = threading.Event()
+        self.hit_writer = None
+        self.inline_allowed = True  # False when the caller relies on the pool's shared state
+    
+    def request_stop(self, reason: str):
+        """Ask a running generation to stop (e.g. from another thread)."""
+        self.stop_reason = reason
+        if self.shared_state is not None:
+            try:
+                self.shared_state['key_found'] = True  # Signal workers to stop
+            except Exception:
+                pass
+    
+    def generate_vanity_key(self, config: VanityConfig) -> Optional[KeyInfo]:
+        """Generate a vanity key using the specified configuration."""
+        # Load watchlist patterns if specified
+        if config.watchlist_file:
+            config.watchlist_patterns = load_watchlist_patterns(config.watchlist_file)
+        
+        num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+        strategy, strategy_reason = self.choose_strategy(config, num_workers)
+        
+        self._print_generation_info(config, num_workers, strategy, strategy_reason)
+        
+        if config.metrics_port:
+            self.metrics_exporter = MetricsExporter(config, num_workers, calculate_pattern_probability(config))
+            try:
+                self.metrics_exporter.start()
+            except OSError as e:
+                print(f"Warning: Could not start metrics endpoint on port {config.metrics_port}: {e}")
+                self.metrics_exporter = None
+        
+        if config.events_file:
+            self.event_log = EventLog(config.events_file)
+            self.event_log.emit('run_start', config=config_to_dict(config), workers=num_workers,
+                                probability=calculate_pattern_probability(config),
+                                hardware=get_hardware_info())
+            self.event_log.emit('strategy', strategy=strategy, reason=strategy_reason)
+        
+        main_profiler = None
+        if config.profile_dir:
+            os.makedirs(config.profile_dir, exist_ok=True)
+            removed = ProfileReport(config.profile_dir).clear()
+            main_profiler = cProfile.Profile()
+            print(f"Profiling workers for {config.profile_window}s each, writing to {config.profile_dir}")
+            if removed:
+                print(f"Removed {removed} profile file(s) of an earlier run from {config.profile_dir}")
+        
+        if self.checkpoint:
+            print(f"Checkpointing to {self.checkpoint.path} every {format_duration(self.checkpoint.interval)}")
+        
+        # SIGTERM stops the run like a stop request, so the pool, heartbeat board and checkpoint are cleaned up
+        previous_sigterm = None
+        if threading.current_thread() is threading.main_thread():
+            previous_sigterm = signal.signal(signal.SIGTERM, lambda signum, frame: self.terminate_requested.set())
+        
+        self.start_time = time.time()
+        key_info = None
+        interrupted = False
+        self.hit_writer = HitWriter.for_config(config)
+        
+        try:
+            if main_profiler:
+                main_profiler.enable()
+            if strategy == 'inline':
+                key_info = self._run_inline(config, num_workers)
+            else:
+                key_info = self._run_generation(config, num_workers)
+            return key_info
+        except KeyboardInterrupt:
+            interrupted = True
+            print("\n\nKey generation interrupted by user.")
+            self.last_exit_reason = "Key generation was interrupted by user (Ctrl+C)."
+            return None
+        finally:
+            self.shared_state = None  # The manager is gone once _run_generation returns
+            if self.hit_writer:
+                if key_info and self.hit_writer.db_path:
+                    self.hit_writer.submit(HitWriter.MAIN_PATTERN, key_info.public_hex, key_info.private_hex)
+                self.hit_writer.stop()
+                print(self.hit_writer.summary())
+                if self.event_log:
+                    self.event_log.emit('hit_writer', **self.hit_writer.stats())
+                self.hit_writer = None
+            if previous_sigterm is not None:
+                signal.signal(signal.SIGTERM, previous_sigterm)
+            if self.checkpoint:
+                self._finish_checkpoint(key_info, interrupted or self.terminate_requested.is_set())
+            if main_profiler:
+                main_profiler.disable()
+            if self.stage_summary[0]:
+                print(f"\nStage breakdown ({self.stage_summary[0]:,} sampled keys): "
+                      f"{format_stage_breakdown(*self.stage_summary)}")
+            if self.cpu_summary and (config.cpu_budget or config.idle_priority):
+                self._print_cpu_summary(config, num_workers)
+            if main_profiler:
+                self._write_profile_report(config, main_profiler)
+            if self.metrics_exporter:
+                self.metrics_exporter.stop()
+            if self.event_log:
+                elapsed = time.time() - self.start_time
+                self.event_log.emit('result', found=key_info is not None,
+                                    public_key=key_info.public_hex if key_info else None,
+                                    total_attempts=self.total_attempts, elapsed=round(elapsed, 3),
+                                    stage_samples=self.stage_summary[0], stage_ns=self.stage_summary[1])
+                self.event_log.emit('exit', reason=getattr(self, 'last_exit_reason', None))
+                self.event_log.close()
+                self.event_log = None
+    
+    def _check_contention(self, contention: HostContention, control: RunControl, shared_state: Dict[str, Any],
+                          progress_bar: Optional[ProgressBar]):
+        """Publish a host contention sample, and back the pool off or restore it."""
+        try:
+            previous = shared_state.get('host_contention')
+            state = contention.sample(len(control.running))
+            shared_state['host_contention'] = state
+        except Exception:
+            return  # Manager is shutting down
+        output = progress_bar.write if progress_bar else print
+        if state['contended'] != bool(previous and previous['contended']):
+            if state['contended']:
+                output(f"Host contention detected ({state['reason']}); slow workers will not be restarted")
+            else:
+                output("Host contention cleared")
+            if self.event_log:
+                self.event_log.emit('host_contention', contended=state['contended'], reason=state['reason'],
+                                    steal=state['steal'], pressure=state['pressure'])
+        
+        step = contention.advise(state['contended'])
+        with control.lock:
+            count = control.workers + step
+            if not step or not 1 <= count <= control.max_workers:
+                return
+            control.resize(count)
+            control.publish()
+        contention.backed_off -= step
+        if step < 0:
+            output(f"Host contention persists; backing off to {count} worker(s)")
+        else:
+            output(f"Host contention cleared; restoring {count} worker(s)")
+        if self.event_log:
+            self.event_log.emit('contention_backoff', workers=count, backed_off=contention.backed_off)
+    
+    def _check_workers(self, watchdog: WorkerWatchdog, active_workers: set, control: Optional[RunControl],
+                       progress_bar: Optional[ProgressBar]) -> List[int]:
+        """Report worker heartbeat changes; return the running workers whose process died."""
+        try:
+            worker_ids = sorted(active_workers)
+        except RuntimeError:
+            return []  # Pool changed mid-copy; checked again next round
+        output = progress_bar.write if progress_bar else print
+        for event, message, fields in watchdog.check(worker_ids, bool(control and control.paused)):
+            output(message)
+            if self.event_log:
+                self.event_log.emit(event, **fields)
+        return [w for w, health in watchdog.snapshot().items() if w in worker_ids and health['status'] == 'dead']
+    
+    def _print_cpu_summary(self, config: VanityConfig, num_workers: int):
+        """Print the CPU share and throughput achieved under --cpu-budget / --idle-priority."""
+        summary = self.cpu_summary
+        elapsed = time.time() - self.start_time
+        if elapsed <= 0:
+            return
+        cores = mp.cpu_count()
+        cores_used = summary['cpu_time'] / elapsed
+        rate = (self.total_attempts - self.resume_attempts) / elapsed
+        throttled = summary['throttled'] / (elapsed * num_workers)
+        line = f"CPU use: {cores_used:.2f} cores ({cores_used / cores:.0%} of {cores} core(s))"
+        if config.cpu_budget:
+            line += f", budget {config.cpu_budget:g}% | workers throttled {throttled:.0%} of the time"
+        if summary['priority']:
+            line += f" | priority: {summary['priority']}"
+        print(f"{line} | {rate:,.0f} keys/sec")
+        if self.event_log:
+            self.event_log.emit('cpu_usage', cores_used=round(cores_used, 3), cores=cores,
+                                budget_percent=config.cpu_budget, throttled=round(throttled, 4),
+                                priority=summary['priority'], rate=round(rate, 1))
+    
+    def _update_checkpoint(self, shared_state: Dict[str, Any], num_workers: int):
+        """Record run progress in the checkpoint and save it when due or on SIGTERM."""
+        try:
+            self.checkpoint.record(shared_state, num_workers, time.time() - self.start_time)
+            if self.terminate_requested.is_set() and not self.stop_reason:
+                self.checkpoint.save()
+                self.request_stop(f"Terminated by SIGTERM; checkpoint saved to {self.checkpoint.path}.")
+            else:
+                self.checkpoint.maybe_save()
         except Exception as e:
-            if config.verbose:
-                print(f"Worker {worker_id}: Failed to initialize health monitor: {e}")
+            print(f"Warning: Could not update checkpoint: {e}")
+    
+    def _finish_checkpoint(self, key_info: Optional[KeyInfo], interrupted: bool):
+        """Write the final checkpoint of a session."""
+        checkpoint = self.checkpoint
+        checkpoint.session_attempts = max(checkpoint.session_attempts, self.total_attempts - checkpoint.base_attempts)
+        checkpoint.session_elapsed = time.time() - self.start_time
+        if key_info:
+            status = 'found'
+        elif interrupted:
+            status = 'interrupted'
+        elif checkpoint.budget_exhausted():
+            status = 'exhausted'
+        else:
+            status = 'stopped'
+        try:
+            checkpoint.finish(status, getattr(self, 'last_exit_reason', None),
+                              key_info.public_hex if key_info else None)
+            print(f"Checkpoint saved to {checkpoint.path}: {checkpoint.attempts:,} keys in "
+                  f"{format_duration(checkpoint.elapsed)} over {checkpoint.sessions} session(s) ({status})")
+        except OSError as e:
+            print(f"Warning: Could not write checkpoint {checkpoint.path}: {e}")
+    
+    def _write_profile_report(self, config: VanityConfig, main_profiler: cProfile.Profile):
+        """Dump the main process profile and merge all profiles into one report."""
+        try:
+            main_profiler.dump_stats(os.path.join(config.profile_dir, ProfileReport.MAIN_FILE))
+            profile_report = ProfileReport(config.profile_dir)
+            report = profile_report.build()
+            report_path = profile_report.write(report)
+            print("\n" + report)
+            print(f"Profile report saved to: {report_path}")
+        except Exception as e:
+            print(f"Warning: Could not write profile report: {e}")
+    
+    def choose_strategy(self, config: VanityConfig, num_workers: int) -> Tuple[str, str]:
+        """Choose 'inline' (search in this process) or 'pool' from the expected work; returns (strategy, reason).
+        
+        The pool finishes in about POOL_STARTUP + E / (rate * workers) for E
+        expected keys, an in-process search in E / rate. Easy patterns, where
+        the start-up dominates, are searched in-process with no IPC (and no
+        stage sampling). A single worker always uses the pool, which keeps
+        health checks and heartbeats for little start-up cost. Runs that
+        profile, export metrics, checkpoint, take control commands or limit
+        their CPU use also use the pool, since those features live in the
+        workers and the monitor thread, and so do cluster nodes.
+        """
+        expected = 1 / calculate_pattern_probability(config)
+        inline_time = expected / self.INLINE_CORE_RATE
+        pool_time = self.POOL_STARTUP + expected / (self.INLINE_CORE_RATE * num_workers)
+        estimate = (f"~{expected:,.0f} expected keys: ~{CapacityPlanner.format_span(inline_time)} in-process vs "
+                    f"~{CapacityPlanner.format_span(pool_time)} on {num_workers} workers")
+        if not self.inline_allowed:
+            return 'pool', "progress is reported from the worker pool"
+        if num_workers <= 1:
+            return 'pool', "a single worker saves too little start-up to search in-process"
+        if config.profile_dir or config.metrics_port or self.checkpoint or config.control_socket or \
+                config.cpu_budget or config.idle_priority:
+            return 'pool', "profiling, metrics, checkpoints, control and CPU limits run on the worker pool"
+        if inline_time <= pool_time:
+            return 'inline', estimate
+        return 'pool', estimate
+    
+    def _run_inline(self, config: VanityConfig, num_workers: int) -> Optional[KeyInfo]:
+        """Search in this process until a match, the time or key limit, or a stop request.
+        
+        Progress is kept in a plain dict as self.shared_state, so request_stop
+        and callers that read total_attempts work as they do for the pool.
+        """
+        target_keys = config.max_iterations * num_workers if config.max_iterations else None
+        watchlist_hits = WatchlistHitBuffer(self.hit_writer.queue if self.hit_writer else None, None)
+        shared_state = {'key_found': bool(self.stop_reason), 'total_attempts': self.resume_attempts,
+                        'target_keys': target_keys}
+        self.shared_state = shared_state
+        progress_bar = None if config.verbose else self._create_progress_bar(config, num_workers)
+        attempts = self.resume_attempts
+        next_update = 0.0
+        
+        def finish(message: Optional[str], exit_reason: str):
+            watchlist_hits.flush()
+            self.total_attempts = attempts
+            if progress_bar:
+                progress_bar.close()
+            if message:
+                print(message)
+            self.last_exit_reason = exit_reason
+        
+        while True:
+            for _ in range(1000):
+                public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+                public_hex = public_bytes.hex()
+                attempts += 1
+                
+                if config.watchlist_patterns:
+                    for pattern in KeyValidator.check_watchlist_patterns(public_hex, config):
+                        watchlist_hits.add(pattern, public_hex, private_bytes)
+                
+                if KeyValidator.check_vanity_pattern(public_hex, config):
+                    finish(f"Found in-process after {attempts - self.resume_attempts:,} keys", "Found a matching key.")
+                    key_info = KeyInfo(
+                        public_hex=public_hex,
+                        private_hex=private_bytes.hex(),
+                        public_bytes=public_bytes,
+                        private_bytes=private_bytes,
+                        matching_pattern=public_hex[:8],
+                        first_8_hex=public_hex[:8],
+                        last_8_hex=public_hex[-8:]
+                    )
+                    self._print_success(key_info, num_workers)
+                    return key_info
+                
+                if target_keys and attempts >= target_keys:
+                    finish(f"\nReached target of {target_keys:,} keys.",
+                           f"Successfully completed target of {target_keys:,} keys without finding a match.")
+                    return None
+            
+            watchlist_hits.flush()
+            shared_state['total_attempts'] = attempts
+            elapsed = time.time() - self.start_time
+            if self.terminate_requested.is_set() and not self.stop_reason:
+                self.stop_reason = "Terminated by SIGTERM."
+            if shared_state['key_found'] or self.stop_reason:
+                finish(f"\n{self.stop_reason}" if self.stop_reason else None,
+                       self.stop_reason or "Search stopped.")
+                return None
+            if config.max_time and elapsed >= config.max_time:
+                time_str = format_time_limit(config.max_time)
+                finish(f"\nReached time limit of {time_str}.",
+                       f"Successfully completed time limit of {time_str} without finding a match.")
+                return None
+            if progress_bar and elapsed >= next_update:
+                next_update = elapsed + 1.0
+                progress_bar.update(attempts, (attempts - self.resume_attempts) / elapsed if elapsed > 0 else 0)
+    
+    def _create_progress_bar(self, config: VanityConfig, num_workers: int) -> 'ProgressBar':
+        """Progress bar for the run's time limit, key target or pattern probability."""
+        if config.max_time:
+            # Time-based progress bar
+            return ProgressBar(time_limit=config.max_time, verbose=config.verbose)
+        if config.max_iterations:
+            # Key-based progress bar
+            total_target_keys = config.max_iterations * num_workers
+            return ProgressBar(total_attempts=total_target_keys, verbose=config.verbose,
+                               initial=self.resume_attempts)
+        # Probability-based progress bar (no specific target)
+        probability = calculate_pattern_probability(config)
+        return ProgressBar(probability=probability, verbose=config.verbose, initial=self.resume_attempts)
+    
+    def _print_generation_info(self, config: VanityConfig, num_workers: int, strategy: str = 'pool',
+                               strategy_reason: Optional[str] = None):
+        """Print information about the generation process."""
+        print("Starting MeshCore Ed25519 key generation...")
+        print(f"Mode: {config.mode.value}")
+        if strategy == 'inline':
+            print(f"Execution: in-process ({strategy_reason})")
+        else:
+            print(f"Execution: worker pool ({strategy_reason})" if strategy_reason else "Execution: worker pool")
+            print(f"Using {num_workers} worker processes")
+            print(f"Batch size: {config.batch_size:,} keys per batch")
+        if config.cpu_budget:
+            share = cpu_share_per_worker(config.cpu_budget, num_workers)
+            print(f"CPU budget: {config.cpu_budget:g}% of {mp.cpu_count()} core(s) "
+                  f"({min(share, 1.0):.2f} core per worker{', not limiting' if share >= 1.0 else ''})")
+        if config.idle_priority:
+            print("Priority: idle (workers yield to every other process)")
+        
+        if config.max_iterations:
+            print(f"Max iterations per worker: {config.max_iterations:,}")
+        if config.max_time:
+            print(f"Max runtime: {config.max_time/3600:.1f} hours")
+        
+        print("-" * 60)
+    
+    def _run_generation(self, config: VanityConfig, num_workers: int) -> Optional[KeyInfo]:
+        """Run the key generation process."""
+        with Manager() as manager:
+            shared_state = manager.dict()
+            shared_state['key_found'] = False
+            shared_state['found_key'] = None
+            shared_state['total_attempts'] = self.resume_attempts
+            shared_state['target_keys'] = config.max_iterations * num_workers if config.max_iterations else None
+            shared_state['cpu_share'] = cpu_share_per_worker(config.cpu_budget, num_workers)
+            if self.event_log:
+                shared_state['event_queue'] = manager.Queue()
+            if self.hit_writer:
+                shared_state['hit_sink'] = self.hit_writer.queue
+            self.shared_state = shared_state
+            if self.stop_reason:
+                shared_state['key_found'] = True
+            
+            # Global health monitoring
+            global_health_monitor = None
+            if config.health_check:
+                try:
+                    global_health_monitor = HealthMonitor(-1, config)  # -1 indicates global monitor
+                    if config.verbose:
+                        print("Global health monitoring enabled")
+                except Exception as e:
+                    if config.verbose:
+                        print(f"Failed to initialize global health monitor: {e}")
+            
+            if self.metrics_exporter:
+                self.metrics_exporter.attach(shared_state, global_health_monitor)
+            
+            worker_restart_count = 0
+            max_restarts_per_worker = 5
+            worker_restarts = {}
+            
+            # Runtime control channel, also used by the host contention back-off (Linux);
+            # with a control socket the pool may grow up to the core count
+            control = None
+            max_workers = num_workers
+            contention = None
+            if config.health_check and HostContention.available(config.proc_root):
+                contention = HostContention(config.proc_root)
+            if config.control_socket or contention:
+                if config.control_socket:
+                    max_workers = max(num_workers, mp.cpu_count())
+                control = RunControl(self, config, shared_state, num_workers, max_workers)
+            if config.control_socket:
+                try:
+                    control.start(config.control_socket)
+                except OSError as e:
+                    print(f"Warning: Could not open control socket {config.control_socket}: {e}")
+            
+            # Initialize progress bar for non-verbose mode
+            progress_bar = None
+            if not config.verbose:
+                progress_bar = self._create_progress_bar(config, num_workers)
+            
+            if control:
+                control.progress_bar = progress_bar
+            
+            # Worker heartbeats in shared memory, judged by the watchdog in the monitor thread
+            watchdog = None
+            try:
+                heartbeat_board = HeartbeatBoard.create(max_workers)
+            except OSError as e:
+                heartbeat_board = None
+                print(f"Warning: Worker heartbeats disabled: {e}")
+            if heartbeat_board:
+                shared_state['heartbeat'] = heartbeat_board.share()
+                watchdog = WorkerWatchdog(heartbeat_board)
+                if control:
+                    control.watchdog = watchdog
+                if self.metrics_exporter:
+                    self.metrics_exporter.watchdog = watchdog
+            active_workers = set()  # Worker ids with a task in the pool
+            
+            # Progress tracking for non-verbose mode
+            worker_progress = {}
+            last_progress_update = time.time()
+            progress_update_interval = 1  # Update progress every 1 second for more responsive updates
+            
+            # Flag to stop progress monitoring thread
+            stop_progress_monitor = threading.Event()
+            event_queue = shared_state.get('event_queue') if self.event_log else None
+            
+            def drain_events():
+                """Write queued worker events and show their console messages."""
+                if event_queue is None:
+                    return
+                while True:
+                    try:
+                        records = event_queue.get_nowait()
+                    except Exception:
+                        break
+                    for record in records:
+                        self.event_log.write(record)
+                        message = record.get('message')
+                        if message:
+                            if progress_bar:
+                                progress_bar.write(message)
+                            else:
+                                print(message)
+                self.event_log.flush()
+            
+            def finish_monitoring():
+                """Stop the progress monitor, close the progress bar and flush telemetry."""
+                stop_progress_monitor.set()
+                if control:
+                    control.stop()
+                if watchdog:
+                    watchdog.close()
+                if progress_bar:
+                    progress_bar.close()
+                try:
+                    self.total_attempts = shared_state.get('total_attempts', 0)
+                    worker_stats = [shared_state.get(worker_stats_key(w)) for w in range(max_workers)]
+                    self.stage_summary = merge_stage_stats(worker_stats)
+                    self.cpu_summary = merge_cpu_stats(worker_stats)
+                except Exception:
+                    pass
+                drain_events()
+            
+            def progress_monitor():
+                """Monitor shared state and update progress bar."""
+                next_contention_sample = time.time() + HostContention.INTERVAL
+                while not stop_progress_monitor.is_set():
+                    if self.metrics_exporter:
+                        self.metrics_exporter.refresh()
+                    drain_events()
+                    if self.checkpoint:
+                        self._update_checkpoint(shared_state, num_workers)
+                    elif self.terminate_requested.is_set() and not self.stop_reason:
+                        self.request_stop("Terminated by SIGTERM.")
+                    if contention and time.time() >= next_contention_sample:
+                        next_contention_sample = time.time() + HostContention.INTERVAL
+                        self._check_contention(contention, control, shared_state, progress_bar)
+                    if watchdog:
+                        self._check_workers(watchdog, active_workers, control, progress_bar)
+                    
+                    if not config.verbose and progress_bar:
+                        total_attempts = shared_state.get('total_attempts', 0)
+                        elapsed = time.time() - self.start_time
+                        
+                        # Update progress bar (always update for time-based progress)
+                        rate = (total_attempts - self.resume_attempts) / elapsed if elapsed > 0 else 0
+                        progress_bar.update(total_attempts, rate)
+                        
+                        # Check if we've reached the target number of keys
+                        target_keys = shared_state.get('target_keys')
+                        if target_keys and total_attempts >= target_keys:
+                            shared_state['key_found'] = True  # Signal workers to stop
+                            break
+                        
+                        # Check if we've reached the time limit (paused time is added to it on resume)
+                        if config.max_time and elapsed >= config.max_time and not (control and control.paused):
+                            shared_state['key_found'] = True  # Signal workers to stop
+                            break
+                    time.sleep(1.0)  # Check every 1.0 seconds for better performance
+            
+            # Start progress monitoring thread
+            progress_thread = threading.Thread(target=progress_monitor, daemon=True)
+            progress_thread.start()
+            
+            with contextlib.ExitStack() as pools:
+                if watchdog:
+                    pools.callback(watchdog.close)  # Runs last, after the pool has shut down
+                executor = pools.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+                futures = []
+                future_workers = {}
+                pool_rebuilds = 0
+                max_pool_rebuilds = 5
+                if control:
+                    control.running = active_workers
+                
+                def submit(worker_id: int):
+                    future = executor.submit(worker_process_batch, worker_id, config, shared_state)
+                    futures.append(future)
+                    future_workers[future] = worker_id
+                    active_workers.add(worker_id)
+                
+                # Start initial workers
+                for worker_id in range(num_workers):
+                    submit(worker_id)
+                
+                try:
+                    while futures:
+                        # Wait for any future to complete
+                        done_futures, _ = concurrent.futures.wait(
+                            futures, 
+                            # Wake up to start workers added by control and to replace dead workers
+                            timeout=1.0 if control or watchdog else None,
+                            return_when=concurrent.futures.FIRST_COMPLETED
+                        )
+                        
+                        # A worker whose process died without the pool noticing also needs a new pool
+                        pool_broken = bool(watchdog and not done_futures and
+                                           watchdog.dead(w for f, w in future_workers.items() if f in futures))
+                        for future in done_futures:
+                            futures.remove(future)
+                            
+                            try:
+                                result = future.result()
+                                
+                                if result.found_key:
+                                    # Cancel all remaining futures immediately
+                                    for f in futures:
+                                        if not f.done():
+                                            f.cancel()
+                                    
+                                    # Give a small delay for cancellation to take effect
+                                    time.sleep(0.5)
+                                    
+                                    # Stop progress monitoring and close progress bar before printing success
+                                    finish_monitoring()
+                                    
+                                    self.last_exit_reason = "Found a matching key."
+                                    self._print_success(result.found_key, num_workers)
+                                    print("Note: Other workers may continue briefly - this is normal multiprocessing behavior.")
+                                    return result.found_key
+                                
+                                # Check if workers stopped due to reaching target (not finding a key)
+                                if shared_state.get('key_found', False) and not result.found_key:
+                                    # All workers have been signaled to stop due to reaching target
+                                    # Cancel remaining futures
+                                    for f in futures:
+                                        if not f.done():
+                                            f.cancel()
+                                    
+                                    # Stop progress monitoring and close progress bar
+                                    finish_monitoring()
+                                    
+                                    if self.stop_reason:
+                                        print(f"\n{self.stop_reason}")
+                                        self.last_exit_reason = self.stop_reason
+                                        return None
+                                    
+                                    # Check if we stopped due to time limit or key target
+                                    elapsed = time.time() - self.start_time
+                                    if config.max_time and elapsed >= config.max_time:
+                                        time_str = format_time_limit(config.max_time)
+                                        print(f"\nReached time limit of {time_str}.")
+                                        self.last_exit_reason = f"Successfully completed time limit of {time_str} without finding a match."
+                                    else:
+                                        print(f"\nReached target of {shared_state.get('target_keys', 0):,} keys.")
+                                        self.last_exit_reason = f"Successfully completed target of {shared_state.get('target_keys', 0):,} keys without finding a match."
+                                    return None
+                                
+                                # Worker left the pool after a 'workers' control command
+                                if result.retired:
+                                    active_workers.discard(result.worker_id)
+                                    continue
+                                
+                                # Track worker progress for non-verbose mode
+                                worker_progress[result.worker_id] = result.attempts
+                                
+                                # Update progress bar immediately when worker completes batch
+                                if not config.verbose and progress_bar:
+                                    total_attempts = sum(worker_progress.values())
+                                    elapsed = time.time() - self.start_time
+                                    rate = total_attempts / elapsed if elapsed > 0 else 0
+                                    progress_bar.update(self.resume_attempts + total_attempts, rate)
+                                
+                                # Check if worker needs restart (performance degradation)
+                                if not result.batch_completed and config.health_check:
+                                    # Find which worker this was
+                                    worker_id = result.worker_id
+                                    worker_restarts[worker_id] = worker_restarts.get(worker_id, 0) + 1
+                                    
+                                    if worker_restarts[worker_id] <= max_restarts_per_worker:
+                                        if config.verbose:
+                                            print(f"Restarting worker {worker_id} (restart {worker_restarts[worker_id]}/{max_restarts_per_worker})")
+                                        if self.event_log:
+                                            self.event_log.emit('worker_restart', worker=worker_id,
+                                                                restarts=worker_restarts[worker_id])
+                                        if self.metrics_exporter:
+                                            self.metrics_exporter.worker_restarted(worker_id)
+                                        
+                                        # Start a new worker to replace the failed one
+                                        submit(worker_id)
+                                        
+                                        # Global health check
+                                        if global_health_monitor and config.verbose:
+                                            health_status = global_health_monitor.check_health(0, 0, 0)
+                                            if health_status['warnings']:
+                                                print("Global Health Check:")
+                                                for warning in health_status['warnings']:
+                                                    print(f"  ⚠️  {warning}")
+                                    else:
+                                        if config.verbose:
+                                            print(f"Worker {worker_id} exceeded maximum restarts, continuing with remaining workers")
+                                        active_workers.discard(worker_id)
+                                
+                            except Exception as e:
+                                worker_id = future_workers.get(future)
+                                if isinstance(e, BrokenProcessPool):
+                                    pool_broken = True  # A worker process died; handled below
+                                    continue
+                                message = f"Worker {worker_id} failed with exception: {e!r}"
+                                if self.event_log:
+                                    self.event_log.emit('worker_error', worker=worker_id, error=repr(e))
+                                
+                                # Replace the failed worker, within the same restart limit as degraded ones
+                                worker_restarts[worker_id] = worker_restarts.get(worker_id, 0) + 1
+                                if worker_restarts[worker_id] <= max_restarts_per_worker and \
+                                        not shared_state.get('key_found', False):
+                                    message += f"; restarting (restart {worker_restarts[worker_id]}/{max_restarts_per_worker})"
+                                    submit(worker_id)
+                                else:
+                                    active_workers.discard(worker_id)
+                                if progress_bar:
+                                    progress_bar.write(message)
+                                else:
+                                    print(message)
+                        
+                        # A dead worker process breaks the whole pool: start a new pool with the same workers
+                        if pool_broken and not shared_state.get('key_found', False):
+                            pool_rebuilds += 1
+                            dead = []
+                            if watchdog:
+                                # A process that just died may still be exiting; give it a moment to show as dead
+                                for _ in range(10):
+                                    dead = self._check_workers(watchdog, active_workers, control, progress_bar)
+                                    if dead:
+                                        break
+                                    time.sleep(0.1)
+                                # The pool does not always stop its other workers; they must not keep searching
+                                watchdog.stop_processes(sorted(active_workers))
+                            concurrent.futures.wait(futures, timeout=5.0)  # The pool fails every pending task
+                            futures.clear()
+                            lost = f" (worker {', '.join(map(str, dead))})" if dead else ""
+                            if pool_rebuilds > max_pool_rebuilds:
+                                message = f"A worker process died{lost}; pool restarted too often, stopping."
+                                active_workers.clear()
+                            else:
+                                message = (f"A worker process died{lost}; restarting the worker pool "
+                                           f"({pool_rebuilds}/{max_pool_rebuilds})")
+                                executor.shutdown(wait=False)
+                                executor = pools.enter_context(ProcessPoolExecutor(max_workers=max_workers))
+                                if watchdog:
+                                    watchdog.forget(sorted(active_workers))
+                                for worker_id in sorted(active_workers):
+                                    submit(worker_id)
+                            if progress_bar:
+                                progress_bar.write(message)
+                            else:
+                                print(message)
+                            if self.event_log:
+                                self.event_log.emit('pool_restart', rebuilds=pool_rebuilds, dead_workers=dead,
+                                                    workers=sorted(active_workers))
+                        
+                        # Start workers added by a control command
+                        if control and not shared_state.get('key_found', False):
+                            for worker_id in range(control.workers):
+                                if worker_id not in active_workers and \
+                                        worker_restarts.get(worker_id, 0) <= max_restarts_per_worker:
+                                    submit(worker_id)
+                        
+                        # Progress updates are now handled by the monitoring thread
+                        
+                        # Check if we still have active workers
+                        if not futures and not active_workers:
+                            if not config.verbose:
+                                print("All workers have completed or failed.")
+                            break
+                    
+                    # Stop progress monitoring and close progress bar before printing no match message
+                    finish_monitoring()
+                    
+                    print("\nNo match found after maximum iterations.")
+                    self.last_exit_reason = "No match found after maximum iterations."
+                    return None
+                    
+                except KeyboardInterrupt:
+                    # Stop progress monitoring and close progress bar on interrupt
+                    finish_monitoring()
+                    
+                    # Cancel all workers on interrupt
+                    for f in futures:
+                        if not f.done():
+                            f.cancel()
+                    raise
+
+
+    def _print_success(self, key_info: KeyInfo, num_workers: int):
+        """Print success information."""
+        elapsed = time.time() - self.start_time
+        
+        print("\n" + "="*60)
+        print("SUCCESS! Found matching Ed25519 key!")
+        print(f"Total time: {elapsed:.1f}s ({elapsed/60:.1f}m)")
+        print("="*60)
+    
+    def save_keys(self, key_info: KeyInfo, label: Optional[str] = None) -> Tuple[str, str]:
+        """Save keys to files and return filenames (label is added to the name if given)."""
+        key_id = key_info.public_hex[:8].upper()
+        if label:
+            key_id = f"{label}_{key_id}"
+        
+        pub_filename = f"meshcore_{key_id}_public.txt"
+        priv_filename = f"meshcore_{key_id}_private.txt"
+        
+        with open(pub_filename, 'w') as f:
+            f.write(key_info.public_hex)
+        
+        with open(priv_filename, 'w') as f:
+            f.write(key_info.private_hex)
+        
+        return pub_filename, priv_filename
+    
+    def save_keys_json(self, key_info: KeyInfo, label: Optional[str] = None) -> str:
+        """Save keys in JSON format for MeshCore app import."""
+        key_id = key_info.public_hex[:8].upper()
+        if label:
+            key_id = f"{label}_{key_id}"
+        json_filename = f"meshcore_{key_id}.json"
+        
+        meshcore_data = {
+            "public_key": key_info.public_hex,
+            "private_key": key_info.private_hex
+        }
+        
+        with open(json_filename, 'w') as f:
+            json.dump(meshcore_data, f, indent=2)
+        
+        return json_filename
+
+
+class MultiOrderSearch:
+    """Fills many independent vanity orders from a single stream of generated keys.
+    
+    All workers check every key against every open order through one
+    OrderMatcher. Each order is verified and saved as soon as it is hit,
+    and the search runs until every order is filled or the key/time budget
+    is exhausted.
+    """
+    
+    def __init__(self, orders: List[VanityOrder], config: VanityConfig, total_keys: Optional[int] = None,
+                 status_interval: float = 30.0):
+        self.orders = orders
+        self.config = config
+        self.total_keys = total_keys
+        self.status_interval = status_interval
+        self.generator = MeshCoreKeyGenerator()
+        self.start_time = None
+        self.total_attempts = 0
+        self.event_log = None
+        self.hit_writer = None
+        self.exit_reason = None
     
-    total_attempts = 0
-    consecutive_slow_batches = 0
-    max_slow_batches = 3  # Restart after 3 consecutive slow batches
+    def open_orders(self) -> List[VanityOrder]:
+        return [order for order in self.orders if order.key_info is None]
     
-    while True:
-        batch_start_time = time.time()
-        batch_attempts = 0
+    def run(self) -> List[VanityOrder]:
+        """Run the search; returns the orders (fulfilled ones carry their key)."""
+        config = self.config
+        num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+        self._print_orders(num_workers)
         
-        # Check if another worker found a key
-        if shared_state.get('key_found', False):
-            return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+        if config.events_file:
+            self.event_log = EventLog(config.events_file)
+            self.event_log.emit('run_start', config=config_to_dict(config), workers=num_workers,
+                                hardware=get_hardware_info(),
+                                orders=[{'name': o.name, 'pattern': describe_pattern(o.config),
+                                         'probability': o.probability} for o in self.orders])
         
-        # Check time limit
-        if max_time and (time.time() - start_time) > max_time:
-            return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+        self.start_time = time.time()
+        self.hit_writer = HitWriter.for_config(config)
+        try:
+            self._run(num_workers)
+        except KeyboardInterrupt:
+            print("\n\nMulti-order search interrupted by user.")
+            self.exit_reason = "Interrupted by user (Ctrl+C)."
+        finally:
+            if self.hit_writer:
+                self.hit_writer.stop()
         
-        # Process this batch
-        for attempt in range(batch_size):
-            # Check if another worker found a key (check every 50K attempts to reduce overhead)
-            if attempt % 50000 == 0 and attempt > 0 and shared_state.get('key_found', False):
-                return BatchResult(worker_id=worker_id, attempts=total_attempts + attempt, batch_completed=False)
+        self._print_summary()
+        if self.event_log:
+            self.event_log.emit('result', fulfilled=[o.name for o in self.orders if o.key_info],
+                                open=[o.name for o in self.open_orders()],
+                                total_attempts=self.total_attempts,
+                                elapsed=round(time.time() - self.start_time, 3))
+            self.event_log.emit('exit', reason=self.exit_reason)
+            self.event_log.close()
+        return self.orders
+    
+    def _run(self, num_workers: int):
+        order_configs = {order.order_id: order.config for order in self.orders}
+        with Manager() as manager:
+            shared_state = manager.dict()
+            shared_state['stop'] = False
+            if self.hit_writer:
+                shared_state['hit_sink'] = self.hit_writer.queue
+            shared_state['total_attempts'] = 0
+            shared_state['open_orders'] = [order.order_id for order in self.open_orders()]
+            shared_state['open_orders_version'] = 0
+            shared_state['hit_queue'] = manager.Queue()
+            hit_queue = shared_state['hit_queue']
+            last_status = time.time()
             
-            # Check time limit (check every 50K attempts to reduce overhead)
-            if attempt % 50000 == 0 and max_time and (time.time() - start_time) > max_time:
-                return BatchResult(worker_id=worker_id, attempts=total_attempts + attempt, batch_completed=False)
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                futures = [executor.submit(worker_process_orders, worker_id, order_configs, self.config, shared_state)
+                           for worker_id in range(num_workers)]
+                try:
+                    while True:
+                        try:
+                            self._handle_hit(hit_queue.get(timeout=0.5), shared_state)
+                        except queue.Empty:
+                            pass
+                        
+                        self.total_attempts = shared_state.get('total_attempts', 0)
+                        elapsed = time.time() - self.start_time
+                        
+                        if not self.open_orders():
+                            self.exit_reason = "All orders fulfilled."
+                            break
+                        if self.total_keys and self.total_attempts >= self.total_keys:
+                            self.exit_reason = f"Reached key budget of {self.total_keys:,} keys."
+                            break
+                        if self.config.max_time and elapsed >= self.config.max_time:
+                            self.exit_reason = f"Reached time budget of {format_duration(self.config.max_time)}."
+                            break
+                        if all(f.done() for f in futures):
+                            self.exit_reason = "All workers stopped."
+                            break
+                        
+                        if time.time() - last_status >= self.status_interval:
+                            self._print_status(elapsed)
+                            last_status = time.time()
+                finally:
+                    shared_state['stop'] = True
+                
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Worker failed with exception: {e}")
             
-            # Update progress (only in verbose mode, every 100K attempts)
-            if config.verbose and attempt % 100000 == 0 and tracker.should_update(total_attempts + attempt):
-                tracker.update(worker_id, total_attempts + attempt)
+            # Keys found while the workers were stopping still fill open orders
+            while True:
+                try:
+                    self._handle_hit(hit_queue.get_nowait(), shared_state)
+                except queue.Empty:
+                    break
+            self.total_attempts = shared_state.get('total_attempts', 0)
+    
+    def _handle_hit(self, hit: Tuple[int, List[int], str, str], shared_state: Dict[str, Any]):
+        """Verify, save and close the orders filled by a key reported by a worker."""
+        worker_id, order_ids, public_hex, private_hex = hit
+        for order_id in order_ids:
+            order = self.orders[order_id]
+            if order.key_info is not None:
+                continue  # Already filled by another worker
+            if not Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex):
+                print(f"⚠️  Worker {worker_id}: key for order {order.name} failed verification, ignoring")
+                continue
             
-            # Generate a single key and check both main pattern and watchlist
-            public_bytes, private_bytes = Ed25519KeyGenerator.generate_meshcore_keypair()
+            order.key_info = KeyInfo(
+                public_hex=public_hex,
+                private_hex=private_hex,
+                public_bytes=bytes.fromhex(public_hex),
+                private_bytes=bytes.fromhex(private_hex),
+                matching_pattern=public_hex[:8],
+                first_8_hex=public_hex[:8],
+                last_8_hex=public_hex[-8:]
+            )
+            order.fulfilled_attempts = shared_state.get('total_attempts', 0)
+            order.fulfilled_time = time.time() - self.start_time
+            if order.json_output:
+                order.files = [self.generator.save_keys_json(order.key_info, label=order.name)]
+            else:
+                order.files = list(self.generator.save_keys(order.key_info, label=order.name))
             
-            # Fast pattern checking using direct byte comparisons where possible
-            main_pattern_match = False
-            watchlist_matches = []
+            print(f"✓ Order {order.name} ({describe_pattern(order.config)}) fulfilled by worker {worker_id} "
+                  f"after {order.fulfilled_time:.1f}s: {public_hex[:8].upper()}... -> {', '.join(order.files)}")
+            if self.event_log:
+                self.event_log.emit('order_fulfilled', order=order.name, worker=worker_id, public_key=public_hex,
+                                    attempts=order.fulfilled_attempts, elapsed=round(order.fulfilled_time, 3))
+                self.event_log.flush()
+        
+        shared_state['open_orders'] = [order.order_id for order in self.open_orders()]
+        shared_state['open_orders_version'] = shared_state.get('open_orders_version', 0) + 1
+    
+    def _print_orders(self, num_workers: int):
+        print("Starting MeshCore multi-order search...")
+        print(f"Using {num_workers} worker processes")
+        print(f"Batch size: {self.config.batch_size:,} keys per batch")
+        if self.total_keys:
+            print(f"Key budget: {self.total_keys:,} keys")
+        if self.config.max_time:
+            print(f"Time budget: {format_duration(self.config.max_time)}")
+        print("-" * 60)
+        for order in self.orders:
+            print(f"  {order.name:<16} {describe_pattern(order.config):<28} {format_probability(order.probability)}")
+        print("-" * 60)
+    
+    def _print_status(self, elapsed: float):
+        """Print overall progress and per-order chance of success and ETA."""
+        rate = self.total_attempts / elapsed if elapsed > 0 else 0
+        open_orders = self.open_orders()
+        print(f"Progress: {self.total_attempts:,} keys | {rate:,.0f} keys/sec | {format_duration(elapsed)} elapsed | "
+              f"{len(self.orders) - len(open_orders)}/{len(self.orders)} orders filled")
+        for order in open_orders:
+            chance = 1 - math.exp(-order.probability * self.total_attempts)
+            expected = 0.693 / order.probability
+            if rate <= 0:
+                eta = "Calculating..."
+            elif self.total_attempts < expected:
+                eta = format_duration((expected - self.total_attempts) / rate)
+            else:
+                eta = f"overdue (90%: {format_duration(max(0, 2.3 / order.probability - self.total_attempts) / rate)})"
+            print(f"  {order.name:<16} {chance:6.1%} chance so far | 50% ETA: {eta}")
+    
+    def _print_summary(self):
+        elapsed = time.time() - self.start_time
+        filled = [order for order in self.orders if order.key_info]
+        print("\n" + "=" * 60)
+        print("MULTI-ORDER SEARCH COMPLETE")
+        print(f"Total keys: {self.total_attempts:,} in {format_duration(elapsed)}")
+        print(f"Orders fulfilled: {len(filled)}/{len(self.orders)}")
+        if self.exit_reason:
+            print(f"Stopped: {self.exit_reason}")
+        if self.hit_writer:
+            print(self.hit_writer.summary())
+        print("=" * 60)
+        for order in self.orders:
+            if order.key_info:
+                print(f"  ✓ {order.name:<16} {order.key_info.public_hex[:8].upper()}...  {', '.join(order.files)}")
+            else:
+                chance = 1 - math.exp(-order.probability * self.total_attempts)
+                print(f"  ✗ {order.name:<16} open ({describe_pattern(order.config)}, {chance:.1%} chance reached)")
+        if filled:
+            print("\n⚠️  Keep your private keys secure and never share them!")
+
+
+class CollectSearch:
+    """Collects every key matching a pattern within a key/time budget.
+    
+    Workers never stop at a match. Hits are deduplicated by public key,
+    verified and streamed to a JSONL sink as they arrive, until the requested
+    number of keys is collected or the budget is exhausted.
+    """
+    
+    def __init__(self, config: VanityConfig, output: str, limit: Optional[int] = None,
+                 total_keys: Optional[int] = None, status_interval: float = 10.0):
+        self.config = config
+        self.output = output
+        self.limit = limit
+        self.total_keys = total_keys
+        self.status_interval = status_interval
+        self.probability = calculate_pattern_probability(config)
+        self.sink = None
+        self.seen = set()
+        self.matches = 0
+        self.collected = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.total_attempts = 0
+        self.start_time = None
+        self.event_log = None
+        self.hit_writer = None
+        self.exit_reason = None
+    
+    def run(self) -> int:
+        """Run the search; returns the number of keys collected."""
+        config = self.config
+        num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+        print("Starting MeshCore collect search...")
+        print(f"Pattern: {describe_pattern(config)} ({format_probability(self.probability)})")
+        print(f"Using {num_workers} worker processes")
+        print(f"Collecting: {f'{self.limit:,} keys' if self.limit else 'all matches'} -> "
+              f"{'stdout' if self.output == '-' else self.output}")
+        if self.total_keys:
+            print(f"Key budget: {self.total_keys:,} keys (~{self.total_keys * self.probability:,.1f} matches expected)")
+        if config.max_time:
+            print(f"Time budget: {format_duration(config.max_time)}")
+        print("-" * 60)
+        
+        if config.events_file:
+            self.event_log = EventLog(config.events_file)
+            self.event_log.emit('run_start', config=config_to_dict(config), workers=num_workers,
+                                probability=self.probability, hardware=get_hardware_info(), collect=self.limit)
+        
+        self.sink = EventLog(self.output)
+        self.start_time = time.time()
+        self.hit_writer = HitWriter.for_config(config)
+        try:
+            self._run(num_workers)
+        except KeyboardInterrupt:
+            print("\n\nCollect search interrupted by user.")
+            self.exit_reason = "Interrupted by user (Ctrl+C)."
+        finally:
+            self.sink.close()
+            if self.hit_writer:
+                self.hit_writer.stop()
+        
+        self._print_summary()
+        if self.event_log:
+            self.event_log.emit('result', collected=self.collected, duplicates=self.duplicates,
+                                total_attempts=self.total_attempts,
+                                elapsed=round(time.time() - self.start_time, 3))
+            self.event_log.emit('exit', reason=self.exit_reason)
+            self.event_log.close()
+        return self.collected
+    
+    def _run(self, num_workers: int):
+        with Manager() as manager:
+            shared_state = manager.dict()
+            shared_state['stop'] = False
+            if self.hit_writer:
+                shared_state['hit_sink'] = self.hit_writer.queue
+            shared_state['total_attempts'] = 0
+            shared_state['hit_queue'] = manager.Queue()
+            hit_queue = shared_state['hit_queue']
+            last_status = time.time()
             
-            # Check for main pattern match (optimized)
-            if config.mode == VanityMode.SIMPLE and config.target_first_two:
-                # Fast 2-char prefix check using direct byte comparison
-                # Convert target to bytes once and cache it
-                if not hasattr(config, '_target_bytes'):
-                    config._target_bytes = bytes.fromhex(config.target_first_two)
-                # Ensure we have exactly 2 bytes for the comparison
-                if len(config._target_bytes) == 2:
-                    main_pattern_match = (public_bytes[0] == config._target_bytes[0] and 
-                                        public_bytes[1] == config._target_bytes[1])
-                else:
-                    # Fall back to hex comparison if target is not exactly 2 bytes
-                    public_hex = public_bytes.hex()
-                    main_pattern_match = public_hex[:2] == config.target_first_two.upper()
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                futures = [executor.submit(worker_process_collect, worker_id, self.config, shared_state)
+                           for worker_id in range(num_workers)]
+                try:
+                    while True:
+                        try:
+                            self._handle_hits(hit_queue.get(timeout=0.5))
+                            # Take everything else that is already queued before flushing
+                            while not self._done():
+                                self._handle_hits(hit_queue.get_nowait())
+                        except queue.Empty:
+                            pass
+                        self.sink.flush()
+                        
+                        self.total_attempts = shared_state.get('total_attempts', 0)
+                        elapsed = time.time() - self.start_time
+                        
+                        if self._done():
+                            self.exit_reason = f"Collected {self.limit:,} keys."
+                            break
+                        if self.total_keys and self.total_attempts >= self.total_keys:
+                            self.exit_reason = f"Reached key budget of {self.total_keys:,} keys."
+                            break
+                        if self.config.max_time and elapsed >= self.config.max_time:
+                            self.exit_reason = f"Reached time budget of {format_duration(self.config.max_time)}."
+                            break
+                        if all(f.done() for f in futures):
+                            self.exit_reason = "All workers stopped."
+                            break
+                        
+                        if time.time() - last_status >= self.status_interval:
+                            self._print_status(elapsed)
+                            last_status = time.time()
+                finally:
+                    shared_state['stop'] = True
                 
-                # Check for watchlist patterns (convert to hex for watchlist checking)
-                if config.watchlist_patterns:
-                    public_hex = public_bytes.hex()
-                    watchlist_matches = KeyValidator.check_watchlist_patterns(public_hex, config)
-            else:
-                # Fall back to hex conversion for complex patterns
-                public_hex = public_bytes.hex()
-                main_pattern_match = KeyValidator.check_vanity_pattern(public_hex, config)
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Worker failed with exception: {e}")
+            
+            # Keep the hits of the last batches (up to the limit)
+            while True:
+                try:
+                    self._handle_hits(hit_queue.get_nowait())
+                except queue.Empty:
+                    break
+            self.total_attempts = shared_state.get('total_attempts', 0)
+    
+    def _done(self) -> bool:
+        return bool(self.limit and self.collected >= self.limit)
+    
+    def _handle_hits(self, batch: Tuple[int, List[Tuple[str, str]]]):
+        """Deduplicate, verify and write the hits of one worker batch."""
+        worker_id, hits = batch
+        self.matches += len(hits)
+        elapsed = round(time.time() - self.start_time, 3)
+        for public_hex, private_hex in hits:
+            if self._done():
+                break
+            if public_hex in self.seen:
+                self.duplicates += 1
+                continue
+            if not Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex):
+                self.rejected += 1
+                print(f"⚠️  Worker {worker_id}: key {public_hex[:8].upper()}... failed verification, skipping")
+                continue
+            self.seen.add(public_hex)
+            self.collected += 1
+            self.sink.write({
+                'public_key': public_hex,
+                'private_key': private_hex,
+                'node_id': public_hex[:2].upper(),
+                'worker': worker_id,
+                'elapsed': elapsed
+            })
+    
+    def _print_status(self, elapsed: float):
+        """Print progress with the observed hit rate against the expected rate."""
+        rate = self.total_attempts / elapsed if elapsed > 0 else 0
+        print(f"Progress: {self.total_attempts:,} keys | {rate:,.0f} keys/sec | {format_duration(elapsed)} elapsed | "
+              f"{self.collected:,} collected | {self._hit_rate()}")
+    
+    def _hit_rate(self) -> str:
+        """Describe the observed match rate against the rate the pattern probability predicts."""
+        expected = self.total_attempts * self.probability
+        observed_per_m = self.matches / self.total_attempts * 1e6 if self.total_attempts else 0.0
+        ratio = f", {self.matches / expected:.0%} of expected" if expected > 0 else ""
+        return f"hit rate {observed_per_m:,.2f}/M keys vs {self.probability * 1e6:,.2f}/M expected{ratio}"
+    
+    def _print_summary(self):
+        elapsed = time.time() - self.start_time
+        print("\n" + "=" * 60)
+        print("COLLECT SEARCH COMPLETE")
+        print(f"Total keys: {self.total_attempts:,} in {format_duration(elapsed)}")
+        print(f"Keys collected: {self.collected:,} of {self.matches:,} matches ({self._hit_rate()})")
+        if self.duplicates or self.rejected:
+            print(f"Skipped: {self.duplicates:,} duplicates, {self.rejected:,} failed verification")
+        if self.exit_reason:
+            print(f"Stopped: {self.exit_reason}")
+        if self.hit_writer:
+            print(self.hit_writer.summary())
+        print("=" * 60)
+        if self.collected:
+            print(f"Keys written to: {'stdout' if self.output == '-' else self.output}")
+            print("\n⚠️  Keep your private keys secure and never share them!")
+
+
+class FleetSearch:
+    """Provisions one key per MeshCore node ID (first public key byte) in a single pass.
+    
+    A 256-entry slot table is filled as keys stream by: every key whose first
+    byte lands on a wanted, still-empty slot is verified and kept. Progress is
+    reported against the coupon-collector expectation, and the filled slots
+    are written as one JSON batch import file.
+    """
+    
+    SLOTS = 256
+    
+    def __init__(self, config: VanityConfig, slots: List[int], target: int, output: str,
+                 vanity_n: int = 0, total_keys: Optional[int] = None, status_interval: float = 10.0):
+        self.config = config
+        self.wanted = sorted(set(slots))
+        self.target = min(target, len(self.wanted))
+        self.output = output
+        self.vanity_n = vanity_n
+        self.total_keys = total_keys
+        self.status_interval = status_interval
+        # Chance that a key fills one particular empty slot
+        self.slot_probability = (calculate_pattern_probability(config) if vanity_n else 1.0) / self.SLOTS
+        self.table = [None] * self.SLOTS  # node id -> entry dict once filled
+        self.filled = 0
+        self.rejected = 0
+        self.total_attempts = 0
+        self.start_time = None
+        self.event_log = None
+        self.hit_writer = None
+        self.exit_reason = None
+    
+    def open_slots(self) -> List[int]:
+        return [slot for slot in self.wanted if self.table[slot] is None]
+    
+    def expected_keys(self, filled: Optional[int] = None) -> float:
+        """Coupon-collector expectation of the keys still needed to reach the target.
+        
+        With k wanted slots empty, the next one is filled after 1 / (k * p)
+        keys on average, p being the chance of a key filling one given slot.
+        """
+        filled = self.filled if filled is None else filled
+        open_count = len(self.wanted) - filled
+        needed = self.target - filled
+        return sum(1 / (k * self.slot_probability) for k in range(open_count - needed + 1, open_count + 1))
+    
+    def run(self) -> int:
+        """Run the search; returns the number of slots filled."""
+        config = self.config
+        num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+        print("Starting MeshCore fleet provisioning...")
+        if len(self.wanted) == self.SLOTS:
+            scope = "all 256 node IDs"
+        else:
+            scope = f"{len(self.wanted)} selected node IDs"
+        print(f"Filling: {self.target} of {scope}"
+              f"{f' with a {self.vanity_n}-char cosmetic pattern' if self.vanity_n else ''}")
+        print(f"Using {num_workers} worker processes")
+        print(f"Expected keys: ~{self.expected_keys():,.0f} (coupon collector)")
+        if self.total_keys:
+            print(f"Key budget: {self.total_keys:,} keys")
+        if config.max_time:
+            print(f"Time budget: {format_duration(config.max_time)}")
+        print(f"Batch import file: {self.output}")
+        print("-" * 60)
+        
+        if config.events_file:
+            self.event_log = EventLog(config.events_file)
+            self.event_log.emit('run_start', config=config_to_dict(config), workers=num_workers,
+                                hardware=get_hardware_info(), fleet_target=self.target,
+                                fleet_slots=[f"{slot:02X}" for slot in self.wanted],
+                                expected_keys=round(self.expected_keys()))
+        
+        self.start_time = time.time()
+        self.hit_writer = HitWriter.for_config(config)
+        try:
+            self._run(num_workers)
+        except KeyboardInterrupt:
+            print("\n\nFleet provisioning interrupted by user.")
+            self.exit_reason = "Interrupted by user (Ctrl+C)."
+        finally:
+            if self.hit_writer:
+                self.hit_writer.stop()
+            if self.filled:
+                self.write_import_file()
+        
+        self._print_summary()
+        if self.event_log:
+            self.event_log.emit('result', filled=self.filled, target=self.target,
+                                open=[f"{slot:02X}" for slot in self.open_slots()],
+                                total_attempts=self.total_attempts,
+                                elapsed=round(time.time() - self.start_time, 3))
+            self.event_log.emit('exit', reason=self.exit_reason)
+            self.event_log.close()
+        return self.filled
+    
+    def _run(self, num_workers: int):
+        with Manager() as manager:
+            shared_state = manager.dict()
+            shared_state['stop'] = False
+            if self.hit_writer:
+                shared_state['hit_sink'] = self.hit_writer.queue
+            shared_state['total_attempts'] = 0
+            shared_state['open_slots'] = self._open_flags()
+            shared_state['open_slots_version'] = 0
+            shared_state['hit_queue'] = manager.Queue()
+            hit_queue = shared_state['hit_queue']
+            last_status = time.time()
+            
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                futures = [executor.submit(worker_process_fleet, worker_id, self.vanity_n, self.config, shared_state)
+                           for worker_id in range(num_workers)]
+                try:
+                    while True:
+                        try:
+                            self._handle_hits(hit_queue.get(timeout=0.5), shared_state)
+                        except queue.Empty:
+                            pass
+                        
+                        self.total_attempts = shared_state.get('total_attempts', 0)
+                        elapsed = time.time() - self.start_time
+                        
+                        if self.filled >= self.target:
+                            self.exit_reason = f"Filled {self.target} node ID slots."
+                            break
+                        if self.total_keys and self.total_attempts >= self.total_keys:
+                            self.exit_reason = f"Reached key budget of {self.total_keys:,} keys."
+                            break
+                        if self.config.max_time and elapsed >= self.config.max_time:
+                            self.exit_reason = f"Reached time budget of {format_duration(self.config.max_time)}."
+                            break
+                        if all(f.done() for f in futures):
+                            self.exit_reason = "All workers stopped."
+                            break
+                        
+                        if time.time() - last_status >= self.status_interval:
+                            self._print_status(elapsed)
+                            last_status = time.time()
+                finally:
+                    shared_state['stop'] = True
                 
-                # Check for watchlist patterns (only if we have watchlist patterns)
-                if config.watchlist_patterns:
-                    watchlist_matches = KeyValidator.check_watchlist_patterns(public_hex, config)
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Worker failed with exception: {e}")
             
-            # Handle watchlist matches
-            if watchlist_matches:
-                public_hex = public_bytes.hex()  # Convert to hex only when needed
-                for pattern in watchlist_matches:
-                    print(f"Worker {worker_id}: Found WATCHLIST match! Pattern: {pattern.pattern}")
-                    if pattern.description:
-                        print(f"  Description: {pattern.description}")
+            # Keys found while the workers were stopping still fill empty slots
+            while True:
+                try:
+                    self._handle_hits(hit_queue.get_nowait(), shared_state)
+                except queue.Empty:
+                    break
+            self.total_attempts = shared_state.get('total_attempts', 0)
+    
+    def _open_flags(self) -> bytes:
+        """Slot table as 256 flags, set for slots that still need a key."""
+        flags = bytearray(self.SLOTS)
+        if self.filled < self.target:
+            for slot in self.open_slots():
+                flags[slot] = 1
+        return bytes(flags)
+    
+    def _handle_hits(self, batch: Tuple[int, List[Tuple[str, str]]], shared_state: Dict[str, Any]):
+        """Verify the keys of one worker batch and fill the slots they land on."""
+        worker_id, hits = batch
+        elapsed = round(time.time() - self.start_time, 3)
+        attempts = shared_state.get('total_attempts', 0)
+        changed = False
+        for public_hex, private_hex in hits:
+            slot = int(public_hex[:2], 16)
+            if self.filled >= self.target or self.table[slot] is not None:
+                continue  # Filled by another worker, or target already reached
+            if not Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex):
+                self.rejected += 1
+                print(f"⚠️  Worker {worker_id}: key for node ID {slot:02X} failed verification, skipping")
+                continue
+            self.table[slot] = {
+                'node_id': f"{slot:02X}",
+                'public_key': public_hex,
+                'private_key': private_hex
+            }
+            self.filled += 1
+            changed = True
+            if self.event_log:
+                self.event_log.emit('slot_filled', node_id=f"{slot:02X}", worker=worker_id, public_key=public_hex,
+                                    attempts=attempts, elapsed=elapsed, filled=self.filled)
+        if changed:
+            if self.event_log:
+                self.event_log.flush()
+            shared_state['open_slots'] = self._open_flags()
+            shared_state['open_slots_version'] = shared_state.get('open_slots_version', 0) + 1
+    
+    def write_import_file(self):
+        """Atomically write the filled slots, ordered by node ID, as a JSON list."""
+        entries = [entry for entry in self.table if entry is not None]
+        directory = os.path.dirname(os.path.abspath(self.output))
+        tmp_path = os.path.join(directory, f".{os.path.basename(self.output)}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(entries, f, indent=2)
+        os.replace(tmp_path, self.output)
+    
+    def _print_status(self, elapsed: float):
+        """Print slots filled and the coupon-collector estimate of the remaining work."""
+        rate = self.total_attempts / elapsed if elapsed > 0 else 0
+        remaining = self.expected_keys()
+        eta = format_duration(remaining / rate) if rate > 0 else "Calculating..."
+        print(f"Progress: {self.total_attempts:,} keys | {rate:,.0f} keys/sec | {format_duration(elapsed)} elapsed | "
+              f"{self.filled}/{self.target} slots | ~{remaining:,.0f} keys to go, ETA {eta}")
+    
+    def _print_slot_table(self):
+        """Print the 16x16 slot table: filled IDs, '--' for wanted slots still empty."""
+        wanted = set(self.wanted)
+        print("    " + " ".join(f" {col:X}" for col in range(16)))
+        for row in range(16):
+            cells = []
+            for col in range(16):
+                slot = row * 16 + col
+                if self.table[slot] is not None:
+                    cells.append(f"{slot:02X}")
+                elif slot in wanted:
+                    cells.append("--")
+                else:
+                    cells.append("  ")
+            print(f"  {row:X} " + " ".join(cells))
+    
+    def _print_summary(self):
+        elapsed = time.time() - self.start_time
+        print("\n" + "=" * 60)
+        print("FLEET PROVISIONING COMPLETE")
+        print(f"Total keys: {self.total_attempts:,} in {format_duration(elapsed)}")
+        print(f"Slots filled: {self.filled}/{self.target}")
+        if self.rejected:
+            print(f"Skipped: {self.rejected:,} failed verification")
+        if self.exit_reason:
+            print(f"Stopped: {self.exit_reason}")
+        if self.hit_writer:
+            print(self.hit_writer.summary())
+        print("=" * 60)
+        self._print_slot_table()
+        if self.filled < self.target:
+            print(f"\nStill needed: ~{self.expected_keys():,.0f} more keys for the remaining "
+                  f"{self.target - self.filled} slots")
+        if self.filled:
+            print(f"\nBatch import file: {self.output}")
+            print("\n⚠️  Keep your private keys secure and never share them!")
+
+
+class BestSearch:
+    """Keeps the best K near misses of a search that may not find a full match.
+    
+    Keys are ranked with a KeyScorer metric. Workers keep their own top-K
+    heaps and publish them only when they improve; the main process merges
+    them for progress reports and the final result. The search ends at a
+    full pattern match or when the --keys/--time budget runs out.
+    """
+    
+    def __init__(self, config: VanityConfig, metric: str, top_k: int, output: str,
+                 total_keys: Optional[int] = None, status_interval: float = 30.0):
+        self.config = config
+        self.metric = metric
+        self.top_k = top_k
+        self.output = output
+        self.total_keys = total_keys
+        self.status_interval = status_interval
+        self.probability = calculate_pattern_probability(config)
+        self.best = []
+        self.full_match = None
+        self.total_attempts = 0
+        self.start_time = None
+        self.hit_writer = None
+        self.exit_reason = None
+    
+    def run(self) -> List[Tuple[int, str, str]]:
+        """Run the search; returns the best (score, public_hex, private_hex) entries."""
+        config = self.config
+        num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+        print("Starting MeshCore best-so-far search...")
+        print(f"Pattern: {describe_pattern(config)} ({format_probability(self.probability)})")
+        print(f"Keeping the best {self.top_k} keys by {self.metric} score")
+        print(f"Using {num_workers} worker processes")
+        if self.total_keys:
+            print(f"Key budget: {self.total_keys:,} keys")
+        if config.max_time:
+            print(f"Time budget: {format_duration(config.max_time)}")
+        print("-" * 60)
+        
+        self.start_time = time.time()
+        self.hit_writer = HitWriter.for_config(config)
+        try:
+            self._run(num_workers)
+        except KeyboardInterrupt:
+            print("\n\nBest-so-far search interrupted by user.")
+            self.exit_reason = "Interrupted by user (Ctrl+C)."
+        finally:
+            if self.hit_writer:
+                self.hit_writer.stop()
+        
+        self._print_summary()
+        return self.best
+    
+    def _run(self, num_workers: int):
+        with Manager() as manager:
+            shared_state = manager.dict()
+            shared_state['stop'] = False
+            if self.hit_writer:
+                shared_state['hit_sink'] = self.hit_writer.queue
+            shared_state['total_attempts'] = 0
+            shared_state['full_match'] = None
+            last_status = time.time()
+            
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                futures = [executor.submit(worker_process_best, worker_id, self.config, shared_state,
+                                           self.metric, self.top_k)
+                           for worker_id in range(num_workers)]
+                try:
+                    while True:
+                        time.sleep(0.5)
+                        self.total_attempts = shared_state.get('total_attempts', 0)
+                        elapsed = time.time() - self.start_time
+                        
+                        if shared_state.get('full_match'):
+                            self.exit_reason = "Found a key matching the full pattern."
+                            break
+                        if self.total_keys and self.total_attempts >= self.total_keys:
+                            self.exit_reason = f"Reached key budget of {self.total_keys:,} keys."
+                            break
+                        if self.config.max_time and elapsed >= self.config.max_time:
+                            self.exit_reason = f"Reached time budget of {format_duration(self.config.max_time)}."
+                            break
+                        if all(f.done() for f in futures):
+                            self.exit_reason = "All workers stopped."
+                            break
+                        
+                        if time.time() - last_status >= self.status_interval:
+                            self._merge(shared_state, num_workers)
+                            self._print_status(elapsed)
+                            last_status = time.time()
+                finally:
+                    shared_state['stop'] = True
+                    # Workers publish their heaps after the batch they are in, so wait for them
+                    for future in futures:
+                        try:
+                            future.result()
+                        except Exception as e:
+                            print(f"Worker failed with exception: {e}")
+                    self._merge(shared_state, num_workers)
+                    self.total_attempts = shared_state.get('total_attempts', 0)
+    
+    def _merge(self, shared_state: Dict[str, Any], num_workers: int):
+        """Merge the published worker heaps into the overall top K."""
+        entries = {}
+        for worker_id in range(num_workers):
+            for entry in shared_state.get(worker_best_key(worker_id)) or []:
+                entries[entry[1]] = entry
+        self.full_match = shared_state.get('full_match')
+        self.best = heapq.nlargest(self.top_k, entries.values())
+    
+    def _print_status(self, elapsed: float):
+        rate = self.total_attempts / elapsed if elapsed > 0 else 0
+        top = self.best[0] if self.best else None
+        best = f"best score {top[0]} ({top[1][:8].upper()}...{top[1][-8:].upper()})" if top else "no keys yet"
+        print(f"Progress: {self.total_attempts:,} keys | {rate:,.0f} keys/sec | {format_duration(elapsed)} elapsed | "
+              f"{best}")
+    
+    def _print_summary(self):
+        elapsed = time.time() - self.start_time
+        print("\n" + "=" * 60)
+        print("BEST-SO-FAR SEARCH COMPLETE")
+        print(f"Total keys: {self.total_attempts:,} in {format_duration(elapsed)}")
+        if self.exit_reason:
+            print(f"Stopped: {self.exit_reason}")
+        if self.hit_writer:
+            print(self.hit_writer.summary())
+        print("=" * 60)
+        if self.full_match:
+            worker_id, public_hex, private_hex = self.full_match
+            if Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex):
+                pub_file, priv_file = MeshCoreKeyGenerator().save_keys(KeyInfo(
+                    public_hex=public_hex,
+                    private_hex=private_hex,
+                    public_bytes=bytes.fromhex(public_hex),
+                    private_bytes=bytes.fromhex(private_hex),
+                    matching_pattern=public_hex[:8],
+                    first_8_hex=public_hex[:8],
+                    last_8_hex=public_hex[-8:]
+                ))
+                print(f"✓ Worker {worker_id} found a full match: {public_hex.upper()}")
+                print(f"  Saved to {pub_file} and {priv_file}")
+        if not self.best:
+            print("No keys were scored.")
+            return
+        
+        print(f"{'Rank':<6}{'Score':<7}Public key")
+        verified = []
+        for rank, (score, public_hex, private_hex) in enumerate(self.best, 1):
+            if not Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex):
+                print(f"{rank:<6}{score:<7}{public_hex.upper()}  ✗ failed verification, not saved")
+                continue
+            print(f"{rank:<6}{score:<7}{public_hex.upper()}")
+            verified.append({
+                'rank': rank,
+                'score': score,
+                'metric': self.metric,
+                'public_key': public_hex,
+                'private_key': private_hex,
+                'node_id': public_hex[:2].upper()
+            })
+        
+        with open(self.output, 'w') as f:
+            json.dump(verified, f, indent=2)
+        print(f"\nBest keys saved to: {self.output}")
+        print("\n⚠️  Keep your private keys secure and never share them!")
+
+
+class BulkKeyWriter:
+    """Buffered, threaded sink for bulk key output.
+    
+    Chunks of packed records (see worker_generate_bulk) are queued and
+    written by a background thread, so formatting, compression and disk I/O
+    overlap with key generation. Formats:
+    
+        bin   - MAGIC header, then per key a little-endian u16 record length
+                followed by the 32-byte public and 64-byte private key
+        jsonl - one {"public_key", "private_key", "node_id"} object per line
+        tree  - jsonl sharded by node ID into DIR/<X>/<XY>.jsonl
+        raw   - bare 96-byte records on stdout, for piping into other tools
+    
+    Compressed output is written as one compressed member per chunk, which
+    gzip, bz2 and xz readers all treat as a single stream.
+    """
+    
+    FORMATS = ('bin', 'jsonl', 'tree')
+    COMPRESSORS = {
+        'gzip': ('.gz', lambda data: gzip.compress(data, compresslevel=1)),
+        'bz2': ('.bz2', lambda data: bz2.compress(data, compresslevel=1)),
+        'xz': ('.xz', lambda data: lzma.compress(data, preset=0)),
+    }
+    MAGIC = b'MCKEYS1\n'
+    RECORD_SIZE = 96
+    SHARD_FLUSH_BYTES = 1 << 20  # Buffered bytes per tree shard before it is appended to disk
+    
+    def __init__(self, path: Optional[str], fmt: str, compression: Optional[str] = None,
+                 stream=None, queue_size: int = 4):
+        self.format = 'raw' if stream is not None else fmt
+        self.compress = self.COMPRESSORS[compression][1] if compression else None
+        suffix = self.COMPRESSORS[compression][0] if compression else ''
+        self.path = path + suffix if path and fmt != 'tree' and not path.endswith(suffix) else path
+        self.suffix = suffix
+        self.stream = stream
+        self.file = None
+        self.shards = {}  # node id -> buffered jsonl lines (tree format)
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.thread = None
+        self.records = 0
+        self.bytes_written = 0
+        self.busy_time = 0.0
+        self.error = None
+    
+    def start(self):
+        if self.format == 'tree':
+            os.makedirs(self.path, exist_ok=True)
+        elif self.format != 'raw':
+            self.file = open(self.path, 'wb')
+            if self.format == 'bin':
+                self._emit(self.file, self.MAGIC)
+        self.thread = threading.Thread(target=self._run, name='bulk-writer', daemon=True)
+        self.thread.start()
+    
+    def put(self, blob: bytes) -> float:
+        """Queue a chunk of records; returns the seconds spent waiting for queue space."""
+        wait_start = time.time()
+        self.queue.put(blob)
+        return time.time() - wait_start
+    
+    def close(self):
+        """Write everything still queued and close the output."""
+        if self.thread:
+            self.queue.put(None)
+            self.thread.join()
+        if self.error is None:
+            try:
+                for node_id in list(self.shards):
+                    self._flush_shard(node_id)
+                if self.stream is not None:
+                    self.stream.flush()
+            except OSError as e:
+                self.error = e
+        if self.file:
+            self.file.close()
+    
+    def _run(self):
+        while True:
+            blob = self.queue.get()
+            if blob is None:
+                break
+            if self.error is not None:
+                continue  # Keep draining so producers never block on a dead sink
+            busy_start = time.time()
+            try:
+                self._write(blob)
+            except OSError as e:  # Includes BrokenPipeError when a downstream reader exits
+                self.error = e
+            self.busy_time += time.time() - busy_start
+    
+    def _write(self, blob: bytes):
+        size = self.RECORD_SIZE
+        count = len(blob) // size
+        if self.format == 'raw':
+            self._emit(self.stream, blob)
+        elif self.format == 'bin':
+            frame = struct.pack('<H', size)
+            self._emit(self.file, b''.join(frame + blob[i:i + size] for i in range(0, len(blob), size)))
+        else:
+            lines = {}
+            for i in range(0, len(blob), size):
+                public_hex = blob[i:i + 32].hex()
+                node_id = public_hex[:2].upper()
+                line = (f'{{"public_key": "{public_hex}", "private_key": "{blob[i + 32:i + size].hex()}", '
+                        f'"node_id": "{node_id}"}}\n')
+                lines.setdefault(node_id if self.format == 'tree' else '', []).append(line)
+            if self.format == 'jsonl':
+                self._emit(self.file, ''.join(lines['']).encode())
+            else:
+                for node_id, node_lines in lines.items():
+                    shard = self.shards.setdefault(node_id, [])
+                    shard.append(''.join(node_lines))
+                    if sum(len(part) for part in shard) >= self.SHARD_FLUSH_BYTES:
+                        self._flush_shard(node_id)
+        self.records += count
+    
+    def _flush_shard(self, node_id: str):
+        data = ''.join(self.shards.pop(node_id, [])).encode()
+        if not data:
+            return
+        directory = os.path.join(self.path, node_id[0])
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{node_id}.jsonl{self.suffix}"), 'ab') as f:
+            self._emit(f, data)
+    
+    def _emit(self, f, data: bytes):
+        if self.compress:
+            data = self.compress(data)
+        f.write(data)
+        self.bytes_written += len(data)
+
+
+def read_bulk_file(path: str):
+    """Yield (public_bytes, private_bytes) from a --bulk-format bin file (compressed or not)."""
+    opener = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}.get(os.path.splitext(path)[1], open)
+    with opener(path, 'rb') as f:
+        if f.read(len(BulkKeyWriter.MAGIC)) != BulkKeyWriter.MAGIC:
+            raise ValueError(f"{path} is not a bulk key file")
+        while True:
+            frame = f.read(2)
+            if not frame:
+                break
+            record = f.read(struct.unpack('<H', frame)[0])
+            yield record[:32], record[32:]
+
+
+class BulkKeyGeneration:
+    """Generates a fixed number of plain MeshCore keys as fast as the worker pool allows.
+    
+    Workers return packed chunks of keys through the executor; chunks are
+    handed to a BulkKeyWriter thread as they complete. Time spent waiting for
+    the writer is measured, so the summary shows whether output ever held
+    generation back.
+    """
+    
+    def __init__(self, config: VanityConfig, count: int, writer: BulkKeyWriter, output=None,
+                 status_interval: float = 10.0):
+        self.config = config
+        self.count = count
+        self.writer = writer
+        self.output = output or sys.stdout
+        self.status_interval = status_interval
+        self.generated = 0
+        self.writer_wait = 0.0
+        self.start_time = None
+        self.event_log = None
+        self.exit_reason = None
+    
+    def run(self) -> int:
+        """Run the generation; returns the number of keys written."""
+        config = self.config
+        num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+        chunk_size = max(1, min(config.batch_size, -(-self.count // num_workers)))
+        self._print("Starting MeshCore bulk key generation...")
+        self._print(f"Keys: {self.count:,} in chunks of {chunk_size:,}")
+        self._print(f"Using {num_workers} worker processes")
+        if config.max_time:
+            self._print(f"Time budget: {format_duration(config.max_time)}")
+        destination = 'stdout (raw 96-byte records)' if self.writer.format == 'raw' else self.writer.path
+        self._print(f"Output: {destination} [{self.writer.format}"
+                    f"{', ' + self.writer.suffix.lstrip('.') if self.writer.suffix else ''}]")
+        self._print("-" * 60)
+        
+        if config.events_file:
+            self.event_log = EventLog(config.events_file)
+            self.event_log.emit('run_start', config=config_to_dict(config), workers=num_workers,
+                                hardware=get_hardware_info(), bulk=self.count, format=self.writer.format)
+        
+        self.start_time = time.time()
+        self.writer.start()
+        try:
+            self._run(num_workers, chunk_size)
+        except KeyboardInterrupt:
+            self._print("\n\nBulk generation interrupted by user.")
+            self.exit_reason = "Interrupted by user (Ctrl+C)."
+        finally:
+            self.writer.close()
+        if self.writer.error is not None:
+            self.exit_reason = f"Output failed: {self.writer.error}"
+        
+        self._print_summary()
+        if self.event_log:
+            self.event_log.emit('result', written=self.writer.records, bytes=self.writer.bytes_written,
+                                writer_wait=round(self.writer_wait, 3),
+                                elapsed=round(time.time() - self.start_time, 3))
+            self.event_log.emit('exit', reason=self.exit_reason)
+            self.event_log.close()
+        return self.writer.records
+    
+    def _run(self, num_workers: int, chunk_size: int):
+        submitted = 0
+        pending = set()
+        last_status = time.time()
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            try:
+                while True:
+                    # Keep two chunks per worker in flight so the pool never idles on result transfer
+                    while submitted < self.count and len(pending) < num_workers * 2:
+                        size = min(chunk_size, self.count - submitted)
+                        pending.add(executor.submit(worker_generate_bulk, size))
+                        submitted += size
+                    if not pending:
+                        self.exit_reason = f"Generated {self.count:,} keys."
+                        break
                     
-                    # Create KeyInfo for watchlist key
-                    watchlist_key = KeyInfo(
-                        public_hex=public_hex,
-                        private_hex=private_bytes.hex(),
-                        public_bytes=public_bytes,
-                        private_bytes=private_bytes,
-                        matching_pattern=pattern.pattern,
-                        first_8_hex=public_hex[:8],
-                        last_8_hex=public_hex[-8:]
-                    )
+                    done, pending = concurrent.futures.wait(pending, timeout=0.5,
+                                                            return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        blob = future.result()
+                        self.writer_wait += self.writer.put(blob)
+                        self.generated += len(blob) // BulkKeyWriter.RECORD_SIZE
                     
-                    # Save watchlist key
-                    save_watchlist_key(watchlist_key, pattern)
-            
-            # Handle main pattern match
-            if main_pattern_match:
-                # Convert to hex only when we have a match
-                public_hex = public_bytes.hex()
-                
-                # Create KeyInfo for main pattern match
-                result = KeyInfo(
-                    public_hex=public_hex,
-                    private_hex=private_bytes.hex(),
-                    public_bytes=public_bytes,
-                    private_bytes=private_bytes,
-                    matching_pattern=public_hex[:8],
-                    first_8_hex=public_hex[:8],
-                    last_8_hex=public_hex[-8:]
-                )
-                
-                print(f"Worker {worker_id}: Found valid MeshCore Ed25519 key!")
-                # Set the shared state to indicate a key was found
-                shared_state['key_found'] = True
-                shared_state['found_key'] = result
-                return BatchResult(worker_id=worker_id, attempts=total_attempts + attempt + 1, found_key=result)
-            
-            batch_attempts += 1
+                    elapsed = time.time() - self.start_time
+                    if self.writer.error is not None:
+                        break
+                    if self.config.max_time and elapsed >= self.config.max_time:
+                        self.exit_reason = f"Reached time budget of {format_duration(self.config.max_time)}."
+                        break
+                    if time.time() - last_status >= self.status_interval:
+                        self._print_status(elapsed)
+                        last_status = time.time()
+            finally:
+                # Chunks not started yet are dropped instead of generated and discarded
+                for future in pending:
+                    future.cancel()
+    
+    def _print(self, message: str):
+        print(message, file=self.output)
+    
+    def _print_status(self, elapsed: float):
+        rate = self.generated / elapsed if elapsed > 0 else 0
+        busy = self.writer.busy_time / elapsed if elapsed > 0 else 0
+        self._print(f"Progress: {self.generated:,}/{self.count:,} keys | {rate:,.0f} keys/sec | "
+                    f"{self.writer.bytes_written / 1e6:,.1f} MB written | writer busy {busy:.0%}")
+    
+    def _print_summary(self):
+        elapsed = time.time() - self.start_time
+        rate = self.writer.records / elapsed if elapsed > 0 else 0
+        self._print("\n" + "=" * 60)
+        self._print("BULK GENERATION COMPLETE")
+        self._print(f"Keys written: {self.writer.records:,} of {self.count:,} in {format_duration(elapsed)} "
+                    f"({rate:,.0f} keys/sec)")
+        self._print(f"Output: {self.writer.bytes_written / 1e6:,.1f} MB "
+                    f"({self.writer.bytes_written / elapsed / 1e6 if elapsed > 0 else 0:,.1f} MB/s)")
+        self._print(f"Writer: busy {self.writer.busy_time:.1f}s, generation waited {self.writer_wait:.1f}s for output")
+        if elapsed > 0 and self.writer_wait / elapsed > 0.05:
+            self._print("⚠️  Output was the bottleneck; try a faster disk or a lighter --compress setting")
+        if self.exit_reason:
+            self._print(f"Stopped: {self.exit_reason}")
+        self._print("=" * 60)
+        if self.writer.records and self.writer.format != 'raw':
+            self._print("\n⚠️  Keep your private keys secure and never share them!")
+
+
+class InventoryMiner:
+    """Background mining mode that stocks a KeyInventory up to per-category quotas.
+    
+    One key stream is checked against every category still below its quota;
+    matching keys are verified and stored in batches, and a category stops
+    being mined once its stock reaches the quota. A key counts toward every
+    category it matches.
+    """
+    
+    def __init__(self, inventory: KeyInventory, quotas: List[InventoryQuota], config: VanityConfig,
+                 total_keys: Optional[int] = None, status_interval: float = 30.0):
+        self.inventory = inventory
+        self.quotas = quotas
+        self.config = config
+        self.total_keys = total_keys
+        self.status_interval = status_interval
+        self.mined = 0
+        self.rejected = 0
+        self.total_attempts = 0
+        self.start_time = None
+        self.event_log = None
+        self.hit_writer = None
+        self.exit_reason = None
+    
+    def open_categories(self) -> List[InventoryQuota]:
+        return [quota for quota in self.quotas if quota.stock < quota.quota]
+    
+    def run(self) -> int:
+        """Run the mining; returns the number of keys added to the inventory."""
+        config = self.config
+        num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+        for quota in self.quotas:
+            quota.stock = self.inventory.count(quota.config, limit=quota.quota)
         
-        total_attempts += batch_attempts
+        print("Starting MeshCore inventory mining...")
+        print(f"Inventory: {self.inventory.path} ({self.inventory.size():,} keys)")
+        print(f"Categories: {len(self.quotas)} ({len(self.quotas) - len(self.open_categories())} already full)")
+        print(f"Using {num_workers} worker processes")
+        if self.total_keys:
+            print(f"Key budget: {self.total_keys:,} keys")
+        if config.max_time:
+            print(f"Time budget: {format_duration(config.max_time)}")
+        print("-" * 60)
         
-        # Update shared state with progress (every batch)
-        shared_state['total_attempts'] = shared_state.get('total_attempts', 0) + batch_attempts
+        if config.events_file:
+            self.event_log = EventLog(config.events_file)
+            self.event_log.emit('run_start', config=config_to_dict(config), workers=num_workers,
+                                hardware=get_hardware_info(), inventory=self.inventory.path,
+                                categories=len(self.quotas), open_categories=len(self.open_categories()))
         
-        # Check if we've reached the target number of keys
-        target_keys = shared_state.get('target_keys')
-        if target_keys and shared_state['total_attempts'] >= target_keys:
-            shared_state['key_found'] = True  # Signal other workers to stop
-            return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
-        batch_time = time.time() - batch_start_time
-        current_rate = batch_attempts / batch_time if batch_time > 0 else 0
+        self.start_time = time.time()
+        if self.open_categories():
+            self.hit_writer = HitWriter.for_config(config)
+            try:
+                self._run(num_workers)
+            except KeyboardInterrupt:
+                print("\n\nInventory mining interrupted by user.")
+                self.exit_reason = "Interrupted by user (Ctrl+C)."
+            finally:
+                if self.hit_writer:
+                    self.hit_writer.stop()
+        else:
+            self.exit_reason = "All categories already at quota."
         
-        # Health monitoring and performance checks (only every 10 batches to reduce overhead)
-        if health_monitor and (total_attempts // batch_size) % 10 == 0:
-            health_status = health_monitor.check_health(current_rate, batch_attempts, batch_time)
+        self._print_summary()
+        if self.event_log:
+            self.event_log.emit('result', mined=self.mined, inventory_size=self.inventory.size(),
+                                open_categories=len(self.open_categories()), total_attempts=self.total_attempts,
+                                elapsed=round(time.time() - self.start_time, 3))
+            self.event_log.emit('exit', reason=self.exit_reason)
+            self.event_log.close()
+        return self.mined
+    
+    def _run(self, num_workers: int):
+        categories = {quota.category_id: quota.config for quota in self.quotas}
+        with Manager() as manager:
+            shared_state = manager.dict()
+            shared_state['stop'] = False
+            if self.hit_writer:
+                shared_state['hit_sink'] = self.hit_writer.queue
+            shared_state['total_attempts'] = 0
+            shared_state['open_categories'] = self._needed()
+            shared_state['open_categories_version'] = 0
+            shared_state['hit_queue'] = manager.Queue()
+            hit_queue = shared_state['hit_queue']
+            last_status = time.time()
             
-            # Report health status if there are warnings or actions (only in verbose mode)
-            if config.verbose and (health_status['warnings'] or health_status['actions_taken']):
-                print(f"Worker {worker_id} Health Check:")
-                for warning in health_status['warnings']:
-                    print(f"  ⚠️  {warning}")
-                for action in health_status['actions_taken']:
-                    print(f"  🔧 {action}")
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                futures = [executor.submit(worker_process_mine, worker_id, categories, self.config, shared_state)
+                           for worker_id in range(num_workers)]
+                try:
+                    while True:
+                        try:
+                            self._handle_hits(hit_queue.get(timeout=0.5), shared_state)
+                        except queue.Empty:
+                            pass
+                        
+                        self.total_attempts = shared_state.get('total_attempts', 0)
+                        elapsed = time.time() - self.start_time
+                        
+                        if not self.open_categories():
+                            self.exit_reason = "All categories at quota."
+                            break
+                        if self.total_keys and self.total_attempts >= self.total_keys:
+                            self.exit_reason = f"Reached key budget of {self.total_keys:,} keys."
+                            break
+                        if self.config.max_time and elapsed >= self.config.max_time:
+                            self.exit_reason = f"Reached time budget of {format_duration(self.config.max_time)}."
+                            break
+                        if all(f.done() for f in futures):
+                            self.exit_reason = "All workers stopped."
+                            break
+                        
+                        if time.time() - last_status >= self.status_interval:
+                            self._print_status(elapsed)
+                            last_status = time.time()
+                finally:
+                    shared_state['stop'] = True
                 
-                if health_status['memory_usage'] > 0:
-                    print(f"  📊 Memory: {health_status['memory_usage'] / 1024 / 1024:.1f}MB")
-                if health_status['cpu_usage'] > 0:
-                    print(f"  📊 CPU: {health_status['cpu_usage']:.1f}%")
-                if health_status['performance_ratio'] < 1.0:
-                    print(f"  📊 Performance: {health_status['performance_ratio']:.1%} of baseline")
+                for future in futures:
+                    try:
+                        future.result()
+                    except Exception as e:
+                        print(f"Worker failed with exception: {e}")
             
-            # Check for severe performance degradation
-            if not health_status['healthy']:
-                consecutive_slow_batches += 1
-                if config.verbose:
-                    print(f"Worker {worker_id}: Performance degradation detected ({consecutive_slow_batches}/{max_slow_batches})")
-                
-                if consecutive_slow_batches >= max_slow_batches:
-                    if config.verbose:
-                        print(f"Worker {worker_id}: Restarting due to performance degradation")
-                    # Force garbage collection before restart
-                    gc.collect()
-                    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
-            else:
-                consecutive_slow_batches = 0
-        
-        # Update tracker with current rate for performance analysis (only when verbose)
-        if config.verbose:
-            tracker.update(worker_id, total_attempts, current_rate)
-        
-        # Report batch completion (only in verbose mode)
-        if config.verbose and total_attempts % 500000 == 0:
-            print(f"Worker {worker_id}: Completed batch of {batch_attempts:,} keys in {batch_time:.1f}s "
-                  f"({current_rate:,.0f} keys/sec) | Total: {total_attempts:,}")
+            # Store the keys of the last batches too
+            while True:
+                try:
+                    self._handle_hits(hit_queue.get_nowait(), shared_state)
+                except queue.Empty:
+                    break
+            self.total_attempts = shared_state.get('total_attempts', 0)
+    
+    def _needed(self) -> Dict[int, int]:
+        """Keys still needed by every open category."""
+        return {quota.category_id: quota.quota - quota.stock for quota in self.open_categories()}
+    
+    def _handle_hits(self, batch: Tuple[int, List[Tuple[str, str]]], shared_state: Dict[str, Any]):
+        """Verify and store the keys of one worker batch, then close categories that reached quota."""
+        worker_id, hits = batch
+        open_quotas = {quota.category_id: quota for quota in self.open_categories()}
+        matcher = OrderMatcher({category_id: quota.config for category_id, quota in open_quotas.items()})
+        wanted = {}
+        for public_hex, private_hex in hits:
+            # Only keys that still count toward a category below quota are kept
+            category_ids = [category_id for category_id in matcher.match(public_hex.upper())
+                            if open_quotas[category_id].stock < open_quotas[category_id].quota]
+            if not category_ids:
+                continue
+            if not Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex):
+                self.rejected += 1
+                print(f"⚠️  Worker {worker_id}: key {public_hex[:8].upper()}... failed verification, skipping")
+                continue
+            wanted[public_hex] = (private_hex, category_ids)
+            for category_id in category_ids:
+                open_quotas[category_id].stock += 1
+        if not wanted:
+            return
         
-        # Check if we should continue (another worker might have found a key)
-        if shared_state.get('key_found', False):
-            return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+        added = set(self.inventory.add([(public_hex, private_hex)
+                                        for public_hex, (private_hex, _) in wanted.items()]))
+        self.mined += len(added)
+        for public_hex, (_, category_ids) in wanted.items():
+            if public_hex not in added:  # Already in stock, so it was counted when the run started
+                for category_id in category_ids:
+                    open_quotas[category_id].stock -= 1
+        if any(quota.stock >= quota.quota for quota in open_quotas.values()):
+            shared_state['open_categories'] = self._needed()
+            shared_state['open_categories_version'] = shared_state.get('open_categories_version', 0) + 1
     
-    return BatchResult(worker_id=worker_id, attempts=total_attempts, batch_completed=False)
+    def _print_status(self, elapsed: float):
+        rate = self.total_attempts / elapsed if elapsed > 0 else 0
+        print(f"Progress: {self.total_attempts:,} keys | {rate:,.0f} keys/sec | {format_duration(elapsed)} elapsed | "
+              f"{self.mined:,} mined | {len(self.quotas) - len(self.open_categories())}/{len(self.quotas)} "
+              f"categories full")
+    
+    def _print_summary(self):
+        elapsed = time.time() - self.start_time
+        open_categories = self.open_categories()
+        print("\n" + "=" * 60)
+        print("INVENTORY MINING COMPLETE")
+        print(f"Total keys: {self.total_attempts:,} in {format_duration(elapsed)}")
+        print(f"Keys mined: {self.mined:,} (inventory now holds {self.inventory.size():,} keys)")
+        print(f"Categories at quota: {len(self.quotas) - len(open_categories)}/{len(self.quotas)}")
+        if self.rejected:
+            print(f"Skipped: {self.rejected:,} failed verification")
+        if self.exit_reason:
+            print(f"Stopped: {self.exit_reason}")
+        if self.hit_writer:
+            print(self.hit_writer.summary())
+        print("=" * 60)
+        for quota in open_categories[:10]:
+            print(f"  {describe_pattern(quota.config):<28} {quota.stock}/{quota.quota}")
+        if len(open_categories) > 10:
+            print(f"  ... and {len(open_categories) - 10} more categories below quota")
 
 
-def worker_process(worker_id: int, config: VanityConfig) -> Tuple[Optional[KeyInfo], int]:
-    """Legacy worker process that generates keys until finding a match or hitting limits."""
-    max_iterations = config.max_iterations or 100000000
-    max_time = config.max_time
-    start_time = time.time()
+def scan_key_files(root: str):
+    """Walk a directory and yield the keys of every supported key file.
     
-    # Calculate probability for accurate ETA
-    probability = calculate_pattern_probability(config)
-    tracker = PerformanceTracker(probability)
+    Yields ('file', path) once per key file, then ('key', source, public_hex,
+    private_hex), ('malformed', source, error) or ('skipped', source, reason)
+    tuples for its contents. Supported formats are
+    *_public.txt / *_private.txt pairs, JSON files holding one key object or
+    a list of them (--json, --fleet, --best output), JSONL files (--collect,
+    --bulk-format jsonl/tree) and --bulk-format bin files, compressed or not.
+    """
+    openers = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+    for directory, subdirs, files in os.walk(root):
+        subdirs.sort()
+        names = set(files)
+        for name in sorted(files):
+            path = os.path.join(directory, name)
+            base, extension = os.path.splitext(name)
+            opener = openers.get(extension)
+            if opener:
+                base, extension = os.path.splitext(base)
+            opener = opener or open
+            
+            if name.endswith('_public.txt') or name.endswith('_private.txt'):
+                stem = name[:-len('_public.txt')] if name.endswith('_public.txt') else name[:-len('_private.txt')]
+                if name.endswith('_private.txt'):
+                    if f"{stem}_public.txt" not in names:
+                        yield 'malformed', path, 'private key file without a matching _public.txt'
+                    continue
+                private_path = os.path.join(directory, f"{stem}_private.txt")
+                if f"{stem}_private.txt" not in names:
+                    yield 'malformed', path, 'public key file without a matching _private.txt'
+                    continue
+                yield 'file', path
+                try:
+                    with open(path, 'r') as f:
+                        public_hex = f.read().strip().lower()
+                    with open(private_path, 'r') as f:
+                        private_hex = f.read().strip().lower()
+                except (OSError, UnicodeDecodeError) as e:
+                    yield 'malformed', path, f'unreadable: {e}'
+                    continue
+                yield 'key', path, public_hex, private_hex
+            
+            elif extension == '.json':
+                yield 'file', path
+                try:
+                    with opener(path, 'rt') as f:
+                        data = json.load(f)
+                except (OSError, ValueError, EOFError) as e:
+                    yield 'malformed', path, f'invalid JSON: {e}'
+                    continue
+                entries = data if isinstance(data, list) else [data]
+                keys = [entry for entry in entries if isinstance(entry, dict) and 'private_key' in entry]
+                if not keys:
+                    yield 'skipped', path, 'no key objects'
+                    continue
+                for index, entry in enumerate(keys):
+                    source = path if len(entries) == 1 else f"{path}[{index}]"
+                    if not isinstance(entry['private_key'], str) or not isinstance(entry.get('public_key'), str):
+                        yield 'malformed', source, 'key object without public_key/private_key strings'
+                        continue
+                    yield 'key', source, entry['public_key'].strip().lower(), entry['private_key'].strip().lower()
+            
+            elif extension == '.jsonl':
+                yield 'file', path
+                found = False
+                try:
+                    with opener(path, 'rt') as f:
+                        for line_num, line in enumerate(f, 1):
+                            if not line.strip():
+                                continue
+                            source = f"{path}:{line_num}"
+                            try:
+                                entry = json.loads(line)
+                            except ValueError:
+                                yield 'malformed', source, 'invalid JSON line'
+                                continue
+                            if not isinstance(entry, dict) or 'private_key' not in entry:
+                                continue  # Not a key record (e.g. an --events log line)
+                            found = True
+                            if not isinstance(entry['private_key'], str) or \
+                                    not isinstance(entry.get('public_key'), str):
+                                yield 'malformed', source, 'key object without public_key/private_key strings'
+                                continue
+                            yield 'key', source, entry['public_key'].strip().lower(), \
+                                entry['private_key'].strip().lower()
+                except (OSError, EOFError, UnicodeDecodeError) as e:
+                    yield 'malformed', path, f'unreadable: {e}'
+                    continue
+                if not found:
+                    yield 'skipped', path, 'no key records'
+            
+            elif extension == '.bin':
+                yield 'file', path
+                try:
+                    for index, (public_bytes, private_bytes) in enumerate(read_bulk_file(path)):
+                        yield 'key', f"{path}#{index}", public_bytes.hex(), private_bytes.hex()
+                except ValueError as e:
+                    yield 'skipped', path, str(e)
+                except (OSError, EOFError) as e:
+                    yield 'malformed', path, f'unreadable: {e}'
+
+
+class KeyFileVerifier:
+    """Audits a directory of saved keys by re-deriving every public key on the worker pool.
     
-    for attempt in range(max_iterations):
-        # Check time limit
-        if max_time and (time.time() - start_time) > max_time:
-            return None, attempt
-        
-        # Update progress
-        if tracker.should_update(attempt):
-            tracker.update(worker_id, attempt)
+    Files are streamed with scan_key_files and verified in chunks, so memory
+    stays bounded by the chunks in flight plus the set of public keys seen
+    (for duplicate detection). Mismatches, malformed files and duplicate
+    public keys go into a JSON report along with the throughput.
+    """
+    
+    CHUNK_SIZE = 2000
+    MAX_LISTED = 10  # Problems of each kind printed in the summary; the report lists them all
+    
+    def __init__(self, root: str, report_path: str, num_workers: int, status_interval: float = 10.0):
+        self.root = root
+        self.report_path = report_path
+        self.num_workers = num_workers
+        self.status_interval = status_interval
+        self.files_scanned = 0
+        self.keys_checked = 0
+        self.keys_malformed = 0  # Keys that reached a worker but could not be parsed
+        self.skipped = []
+        self.mismatches = []
+        self.malformed = []
+        self.seen = {}  # public key bytes -> first source
+        self.duplicates = {}  # public key hex -> [sources]
+        self.start_time = None
+        self.exit_reason = None
+    
+    def run(self) -> Dict[str, Any]:
+        """Verify the directory; returns the report that was written."""
+        print(f"Verifying key files in {self.root} with {self.num_workers} worker processes...")
+        print("-" * 60)
+        self.start_time = time.time()
+        try:
+            self._run()
+            self.exit_reason = "Directory fully verified."
+        except KeyboardInterrupt:
+            print("\n\nVerification interrupted by user.")
+            self.exit_reason = "Interrupted by user (Ctrl+C)."
         
-        # Generate and check key
-        result = Ed25519KeyGenerator.generate_single_key(config)
-        if result:
-            # Verify the generated key works correctly
-            if Ed25519KeyGenerator.verify_key_compatibility(result.private_hex, result.public_hex):
-                print(f"Worker {worker_id}: Found valid MeshCore Ed25519 key!")
-                return result, attempt + 1
-            else:
-                print(f"Worker {worker_id}: Generated key failed compatibility check!")
-                continue
+        report = self.report()
+        with open(self.report_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        self._print_summary(report)
+        return report
     
-    return None, max_iterations
+    def _run(self):
+        pending = set()
+        chunk = []
+        last_status = time.time()
+        with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+            try:
+                for item in scan_key_files(self.root):
+                    if item[0] == 'file':
+                        self.files_scanned += 1
+                        continue
+                    if item[0] == 'malformed':
+                        self.malformed.append({'source': item[1], 'error': item[2]})
+                        continue
+                    if item[0] == 'skipped':
+                        self.skipped.append({'source': item[1], 'reason': item[2]})
+                        continue
+                    
+                    _, source, public_hex, private_hex = item
+                    self._check_duplicate(source, public_hex)
+                    chunk.append((source, public_hex, private_hex))
+                    if len(chunk) >= self.CHUNK_SIZE:
+                        pending.add(executor.submit(worker_verify_keys, chunk))
+                        chunk = []
+                        # Keep two chunks per worker in flight while the scan continues
+                        while len(pending) >= self.num_workers * 2:
+                            pending = self._collect(pending, concurrent.futures.FIRST_COMPLETED)
+                    if time.time() - last_status >= self.status_interval:
+                        self._print_status()
+                        last_status = time.time()
+                if chunk:
+                    pending.add(executor.submit(worker_verify_keys, chunk))
+                while pending:
+                    pending = self._collect(pending, concurrent.futures.FIRST_COMPLETED)
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    def _check_duplicate(self, source: str, public_hex: str):
+        try:
+            key = bytes.fromhex(public_hex)
+        except ValueError:
+            return  # Reported as malformed by the worker
+        first = self.seen.setdefault(key, source)
+        if first != source:
+            self.duplicates.setdefault(public_hex, [first]).append(source)
+    
+    def _collect(self, pending: set, return_when) -> set:
+        done, pending = concurrent.futures.wait(pending, return_when=return_when)
+        for future in done:
+            checked, problems = future.result()
+            self.keys_checked += checked
+            for source, kind, public_hex, detail in problems:
+                if kind == 'mismatch':
+                    self.mismatches.append({'source': source, 'public_key': public_hex, 'error': detail})
+                else:
+                    self.keys_malformed += 1
+                    self.malformed.append({'source': source, 'error': detail})
+        return pending
+    
+    def report(self) -> Dict[str, Any]:
+        elapsed = time.time() - self.start_time
+        return {
+            'directory': os.path.abspath(self.root),
+            'completed': self.exit_reason == "Directory fully verified.",
+            'workers': self.num_workers,
+            'elapsed': round(elapsed, 3),
+            'files_scanned': self.files_scanned,
+            'keys_checked': self.keys_checked,
+            'keys_valid': self.keys_checked - len(self.mismatches) - self.keys_malformed,
+            'keys_per_sec': round(self.keys_checked / elapsed, 1) if elapsed > 0 else 0.0,
+            'mismatches': self.mismatches,
+            'malformed': self.malformed,
+            'duplicates': [{'public_key': public_hex, 'sources': sources}
+                           for public_hex, sources in self.duplicates.items()],
+            'skipped': self.skipped,
+        }
+    
+    def _print_status(self):
+        elapsed = time.time() - self.start_time
+        rate = self.keys_checked / elapsed if elapsed > 0 else 0
+        print(f"Progress: {self.keys_checked:,} keys verified | {rate:,.0f} keys/sec | "
+              f"{len(self.mismatches)} mismatches | {len(self.malformed)} malformed | "
+              f"{len(self.duplicates)} duplicates")
+    
+    def _print_summary(self, report: Dict[str, Any]):
+        print("\n" + "=" * 60)
+        print("KEY FILE VERIFICATION COMPLETE")
+        print(f"Files scanned: {report['files_scanned']:,}")
+        print(f"Keys verified: {report['keys_checked']:,} in {format_duration(report['elapsed'])} "
+              f"({report['keys_per_sec']:,.0f} keys/sec)")
+        print(f"Valid: {report['keys_valid']:,} | Mismatches: {len(self.mismatches)} | "
+              f"Malformed: {len(self.malformed)} | Duplicate public keys: {len(self.duplicates)}")
+        if self.skipped:
+            print(f"Skipped: {len(self.skipped)} files without keys")
+        if not report['completed']:
+            print(f"Stopped: {self.exit_reason}")
+        print("=" * 60)
+        for title, entries in (("Mismatches", [f"{e['source']}: {e['error']}" for e in self.mismatches]),
+                               ("Malformed", [f"{e['source']}: {e['error']}" for e in self.malformed]),
+                               ("Duplicates", [f"{public_hex[:8].upper()}...: {', '.join(sources)}"
+                                               for public_hex, sources in self.duplicates.items()])):
+            if entries:
+                print(f"{title}:")
+                for entry in entries[:self.MAX_LISTED]:
+                    print(f"  ✗ {entry}")
+                if len(entries) > self.MAX_LISTED:
+                    print(f"  ... and {len(entries) - self.MAX_LISTED} more")
+        if not (self.mismatches or self.malformed or self.duplicates):
+            print("✓ All keys verified")
+        print(f"Report written to: {self.report_path}")
 
 
-class ArgumentParser:
-    """Handles command line argument parsing and validation."""
+class DuplicateDetector:
+    """Counts repeated 32-byte public keys under a fixed memory ceiling.
     
-    @staticmethod
-    def create_parser() -> argparse.ArgumentParser:
-        parser = argparse.ArgumentParser(
-            description="MeshCore Ed25519 Vanity Key Generator (Fixed)",
-            formatter_class=argparse.RawDescriptionHelpFormatter,
-            epilog=ArgumentParser._get_examples()
-        )
+    Keys are kept as packed 32-byte NumPy records (instead of ~100-byte hex
+    strings in a set). While they fit under the ceiling, duplicates are found
+    by sorting in memory. Beyond that, buffered keys are spilled to 256
+    partition files by first byte, and each partition is sorted on its own
+    at the end (re-partitioned by the next byte if it is still too large).
+    
+    With use_bloom, a Bloom filter in front of the store flags every key
+    that may have been seen before. Bloom filters have no false negatives,
+    so the flagged candidates are the only keys that can be repeats: if
+    there are none the count is exactly zero with no sorting at all, and
+    otherwise only the candidates are counted in the stored keys.
+    """
+    
+    DEFAULT_MEMORY_MB = 256
+    RECORD = 'S32'  # Fixed-width records compare and sort as raw bytes
+    PARTITIONS = 256
+    MAX_BLOOM_HASHES = 8
+    
+    def __init__(self, memory_mb: int = DEFAULT_MEMORY_MB, expected_keys: int = 0, use_bloom: bool = False,
+                 spill_dir: Optional[str] = None):
+        self.memory_limit = memory_mb * 1024 * 1024
+        self.spill_dir = spill_dir
+        self.keys = 0
+        self.buffer = []
+        self.buffered_bytes = 0
+        self.partition_dir = None  # Created on the first spill
+        self.spills = 0
+        self.held_bytes = 0
+        self.peak_bytes = 0
         
-        ArgumentParser._add_arguments(parser)
-        return parser
+        self.bloom = None
+        self.candidates = []
+        self.candidate_count = 0
+        if use_bloom:
+            # A quarter of the ceiling for the filter, capped at 16 bits per expected key
+            bloom_bits = self.memory_limit * 2
+            if expected_keys:
+                bloom_bits = min(bloom_bits, max(1 << 16, expected_keys * 16))
+            self.bloom_bits = bloom_bits
+            self.bloom_hashes = max(1, min(self.MAX_BLOOM_HASHES,
+                                           round(bloom_bits / max(expected_keys, 1) * math.log(2))))
+            self.bloom = np.zeros(bloom_bits // 8, dtype=np.uint8)
+            self._hold(self.bloom.nbytes)
+        self.work_limit = self.memory_limit - (self.bloom.nbytes if self.bloom is not None else 0)
+    
+    def _hold(self, nbytes: int):
+        # Only the arrays tracked here; sort and np.isin temporaries are not counted
+        self.held_bytes += nbytes
+        self.peak_bytes = max(self.peak_bytes, self.held_bytes)
     
     @staticmethod
-    def _add_arguments(parser: argparse.ArgumentParser):
-        """Add command line arguments."""
-        parser.add_argument('--keys', type=ArgumentParser._parse_keys,
-                          help='Number of keys to check (e.g., 100 for 100M, 1b for 1B)')
-        parser.add_argument('--time', type=ArgumentParser._parse_time,
-                          help='Max runtime (e.g., 2 or 2:30)')
-        parser.add_argument('--batch-size', type=ArgumentParser._parse_batch_size,
-                          help='Batch size for worker processes (e.g., 500K, 1M, 2M)')
-        parser.add_argument('--workers', type=int,
-                          help='Number of worker processes to use (default: auto-detect optimal count)')
-        parser.add_argument('--watchlist', type=str,
-                          help='Path to watchlist file with patterns to monitor (auto-loads watchlist.txt if not specified)')
-        parser.add_argument('--first-two', type=str,
-                          help='First two hex chars to search for (e.g., F8)')
-        parser.add_argument('--prefix', type=str,
-                          help='Hex prefix to search for (e.g., F8A1)')
-        parser.add_argument('--simple', action='store_true',
-                          help='Simple mode: only check first two hex chars (requires --first-two)')
-        parser.add_argument('--four-char', action='store_true',
-                          help='Legacy 4-char vanity mode with optional --first-two constraint')
-
-        parser.add_argument('--pattern-2', action='store_true',
-                          help='2-char cosmetic pattern (first 2 hex == last 2 hex OR palindromic)')
-        parser.add_argument('--pattern-4', action='store_true',
-                          help='4-char cosmetic pattern (first 4 hex == last 4 hex OR palindromic)')
-        parser.add_argument('--pattern-6', action='store_true',
-                          help='6-char cosmetic pattern (first 6 hex == last 6 hex OR palindromic)')
-        parser.add_argument('--pattern-8', action='store_true',
-                          help='8-char cosmetic pattern (first 8 hex == last 8 hex OR palindromic)')
-        parser.add_argument('--health-check', action='store_true', default=True,
-                          help='Enable health monitoring (default) to restart workers if performance degrades.')
-        parser.add_argument('--no-health-check', action='store_false', dest='health_check',
-                          help='Disable health monitoring and do not restart workers on performance degradation.')
-        parser.add_argument('--verbose', '-v', action='store_true',
-                          help='Enable verbose output including per-worker progress and health monitoring details.')
-        
-        # Test functions
-        parser.add_argument('--test-compatibility', action='store_true',
-                          help='Test compatibility with known MeshCore keys')
-        parser.add_argument('--test-distribution', nargs='?', const=1, type=float,
-                          metavar='MILLIONS',
-                          help='Test distribution of first two hex chars (default: 1M keys)')
-        parser.add_argument('--test-entropy', nargs='?', const=1, type=float,
-                          metavar='THOUSANDS',
-                          help='Test entropy and randomness (default: 10K keys)')
-        parser.add_argument('--test-meshcore-id', nargs='?', const=1, type=float,
-                          metavar='THOUSANDS',
-                          help='Test MeshCore node ID format (default: 1K keys)')
+    def peak_rss() -> Optional[int]:
+        """Return the measured peak resident memory of this process in bytes, or None if unavailable."""
+        if not RESOURCE_AVAILABLE:
+            return None
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024  # Bytes on macOS, KB elsewhere
+    
+    def add(self, packed: bytes):
+        """Add packed 32-byte public keys."""
+        records = np.frombuffer(packed, dtype=self.RECORD)
+        # Spilling holds the buffer, its reordered copy and the sort order at once
+        buffer_limit = max(32, self.work_limit // 3)
+        step = buffer_limit // 32
+        for start in range(0, len(records), step):
+            batch = records[start:start + step]
+            if self.buffer and self.buffered_bytes + batch.nbytes > buffer_limit:
+                self._spill()
+            batch = batch.copy()
+            self.keys += len(batch)
+            self._hold(batch.nbytes)
+            if self.bloom is not None:
+                self._check_bloom(batch)
+            self.buffer.append(batch)
+            self.buffered_bytes += batch.nbytes
+    
+    def _bloom_positions(self, batch):
+        # The keys are uniformly random, so their own bytes serve as hash values (double hashing)
+        words = batch.view('<u8').reshape(-1, 4)
+        h1, h2 = words[:, 0], words[:, 1] | np.uint64(1)
+        return [(h1 + np.uint64(i) * h2) % np.uint64(self.bloom_bits) for i in range(self.bloom_hashes)]
+    
+    def _check_bloom(self, batch):
+        positions = self._bloom_positions(batch)
+        seen = np.ones(len(batch), dtype=bool)
+        for position in positions:
+            seen &= ((self.bloom[position >> np.uint64(3)] >> (position & np.uint64(7)).astype(np.uint8)) & 1).astype(bool)
+        # Repeats inside the batch are not in the filter yet
+        ordered = np.sort(batch)
+        repeats = ordered[1:][ordered[1:] == ordered[:-1]]
+        flagged = np.concatenate([batch[seen], repeats])
+        if len(flagged):
+            self.candidates.append(flagged)
+            self.candidate_count += len(flagged)
+            self._hold(flagged.nbytes)
+        for position in positions:
+            np.bitwise_or.at(self.bloom, position >> np.uint64(3),
+                             np.left_shift(1, (position & np.uint64(7)).astype(np.uint8)).astype(np.uint8))
+    
+    def _spill(self):
+        """Append the buffered keys to the partition files, split by first byte."""
+        if self.partition_dir is None:
+            self.partition_dir = tempfile.mkdtemp(prefix='meshcore_dedup_', dir=self.spill_dir)
+        data = np.concatenate(self.buffer)
+        self.buffer = []
+        self._write_partitions(data, self.partition_dir, 0)
+        self.held_bytes -= self.buffered_bytes
+        self.buffered_bytes = 0
+        self.spills += 1
+    
+    def _write_partitions(self, data, directory: str, depth: int):
+        first = data.view(np.uint8).reshape(-1, 32)[:, depth]
+        order = np.argsort(first, kind='stable')
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(first, minlength=self.PARTITIONS))])
+        ordered = data[order]
+        self._hold(order.nbytes + ordered.nbytes)
+        for partition in range(self.PARTITIONS):
+            if bounds[partition + 1] > bounds[partition]:
+                with open(os.path.join(directory, f"{partition:02x}.bin"), 'ab') as f:
+                    ordered[bounds[partition]:bounds[partition + 1]].tofile(f)
+        self.held_bytes -= order.nbytes + ordered.nbytes
+    
+    def finish(self) -> int:
+        """Count the repeated keys (total keys minus unique keys) and remove any spill files."""
+        try:
+            if self.bloom is not None:
+                return self._count_candidates()
+            if self.partition_dir is None:
+                data = np.concatenate(self.buffer) if self.buffer else np.empty(0, dtype=self.RECORD)
+                self._hold(data.nbytes)
+                data.sort()
+                return int(np.count_nonzero(data[1:] == data[:-1]))
+            self._spill()
+            return self._count_directory(self.partition_dir, 1)
+        finally:
+            self.close()
+    
+    def _count_directory(self, directory: str, depth: int) -> int:
+        repeats = 0
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            if os.path.getsize(path) > self.work_limit and depth < 32:
+                subdirectory = path + '.d'
+                os.mkdir(subdirectory)
+                block = max(1, self.work_limit // 3 // 32)
+                with open(path, 'rb') as f:
+                    while True:
+                        data = np.fromfile(f, dtype=self.RECORD, count=block)
+                        if not len(data):
+                            break
+                        self._hold(data.nbytes)
+                        self._write_partitions(data, subdirectory, depth)
+                        self.held_bytes -= data.nbytes
+                os.remove(path)
+                repeats += self._count_directory(subdirectory, depth + 1)
+                continue
+            data = np.fromfile(path, dtype=self.RECORD)
+            self._hold(data.nbytes)
+            data.sort()
+            repeats += int(np.count_nonzero(data[1:] == data[:-1]))
+            self.held_bytes -= data.nbytes
+        return repeats
+    
+    def _count_candidates(self) -> int:
+        """Exact repeat count from the Bloom candidates: occurrences of each candidate minus one."""
+        if not self.candidate_count:
+            return 0
+        candidates = np.unique(np.concatenate(self.candidates))
+        occurrences = np.zeros(len(candidates), dtype=np.int64)
         
-        # Output options
-        parser.add_argument('--json', action='store_true',
-                          help='Output keys in JSON format for MeshCore app import')
+        def count(data):
+            found = data[np.isin(data, candidates)]
+            occurrences[:] += np.bincount(np.searchsorted(candidates, found), minlength=len(candidates))
+        
+        for data in self.buffer:
+            count(data)
+        if self.partition_dir is not None:
+            block = max(1, self.work_limit // 8 // 32)  # np.isin sorts a few copies of each block
+            for name in sorted(os.listdir(self.partition_dir)):
+                with open(os.path.join(self.partition_dir, name), 'rb') as f:
+                    while True:
+                        data = np.fromfile(f, dtype=self.RECORD, count=block)
+                        if not len(data):
+                            break
+                        count(data)
+        return int(np.maximum(occurrences - 1, 0).sum())
     
-    @staticmethod
-    def _parse_keys(keys_str: str) -> int:
-        """Parse keys argument.
+    def close(self):
+        """Drop buffered keys and delete the spill directory."""
+        self.buffer = []
+        if self.partition_dir is not None:
+            shutil.rmtree(self.partition_dir, ignore_errors=True)
+            self.partition_dir = None
+    
+    def describe(self) -> str:
+        """One-line summary of how the count was made."""
+        parts = [f"{self.keys:,} keys as 32-byte records",
+                 f"spilled to disk {self.spills} times" if self.spills else "held in memory"]
+        if self.bloom is not None:
+            parts.append(f"Bloom filter {self.bloom.nbytes / 1048576:,.1f} MB with {self.bloom_hashes} hashes, "
+                         f"{self.candidate_count:,} candidates")
+        parts.append(f"~{self.peak_bytes / 1048576:,.1f} MB of key arrays at peak (estimate) "
+                     f"of {self.memory_limit / 1048576:,.0f} MB ceiling")
+        peak_rss = self.peak_rss()
+        if peak_rss:
+            parts.append(f"process peak RSS {peak_rss / 1048576:,.1f} MB")
+        return "; ".join(parts)
+
+
+class KeyCorpus:
+    """A flat file of 32-byte public keys for statistical analysis.
+    
+    The corpus is written once in parallel (each task fills its own record
+    range of a preallocated file) and analyzed any number of times as a
+    NumPy memmap, block by block, so RAM use does not grow with the corpus.
+    """
+    
+    RECORD_SIZE = 32
+    TASK_SIZE = 250000  # Keys per worker task
+    WRITE_CHUNK = 4096  # Keys per file write inside a task
+    BLOCK_ROWS = 1 << 20  # Rows per analysis block (32 MB)
+    P_THRESHOLD = 0.001  # Chi-square p-value below which a distribution is flagged
+    
+    def __init__(self, path: str, dedup_memory_mb: int = DuplicateDetector.DEFAULT_MEMORY_MB):
+        self.path = path
+        self.dedup_memory_mb = dedup_memory_mb  # Ceiling for the duplicate scan's sort arrays
+    
+    def size(self) -> int:
+        """Number of keys in the corpus file."""
+        return os.path.getsize(self.path) // self.RECORD_SIZE
+    
+    def generate(self, count: int, num_workers: int, status_interval: float = 10.0) -> int:
+        """Write count new public keys to the corpus; returns the number written.
         
-        Examples:
-            --keys 1     -> 1,000,000 keys (1 million)
-            --keys 100   -> 100,000,000 keys (100 million)
-            --keys 1500  -> 1,500,000,000 keys (1.5 billion)
-            --keys 1b    -> 1,000,000,000 keys (1 billion)
-            --keys 0.5b  -> 500,000,000 keys (500 million)
+        If interrupted, the file is truncated to the longest fully written
+        prefix, so it always holds only generated keys.
         """
+        print(f"Writing {count:,} public keys to corpus {self.path} with {num_workers} worker processes...")
+        print("-" * 60)
+        with open(self.path, 'wb') as f:
+            f.truncate(count * self.RECORD_SIZE)
+        
+        starts = list(range(0, count, self.TASK_SIZE))
+        done_starts = set()
+        written = 0
+        start_time = time.time()
+        last_status = start_time
+        pending = {}
+        next_task = 0
         try:
-            if keys_str.lower().endswith('b'):
-                return int(float(keys_str[:-1]) * 1000000000)
-            
-            keys = float(keys_str)
-            # Always multiply by 1 million unless it ends with 'b'
-            keys *= 1000000
-            return int(keys)
-        except ValueError:
-            raise argparse.ArgumentTypeError("Invalid number format")
+            with ProcessPoolExecutor(max_workers=num_workers) as executor:
+                try:
+                    while next_task < len(starts) or pending:
+                        while next_task < len(starts) and len(pending) < num_workers * 2:
+                            start = starts[next_task]
+                            future = executor.submit(worker_write_corpus, self.path, start,
+                                                     min(self.TASK_SIZE, count - start))
+                            pending[future] = start
+                            next_task += 1
+                        done, _ = concurrent.futures.wait(pending, timeout=0.5,
+                                                          return_when=concurrent.futures.FIRST_COMPLETED)
+                        for future in done:
+                            written += future.result()
+                            done_starts.add(pending.pop(future))
+                        if time.time() - last_status >= status_interval:
+                            elapsed = time.time() - start_time
+                            print(f"Progress: {written:,}/{count:,} keys ({written / count:.1%}) | "
+                                  f"{written / elapsed:,.0f} keys/sec")
+                            last_status = time.time()
+                finally:
+                    for future in pending:
+                        future.cancel()
+        except KeyboardInterrupt:
+            print("\n\nCorpus generation interrupted by user.")
+            prefix = 0
+            for start in starts:
+                if start not in done_starts:
+                    break
+                prefix = min(start + self.TASK_SIZE, count)
+            with open(self.path, 'r+b') as f:
+                f.truncate(prefix * self.RECORD_SIZE)
+            written = prefix
+        
+        elapsed = time.time() - start_time
+        print(f"Corpus written: {written:,} keys ({written * self.RECORD_SIZE / 1e6:,.1f} MB) in "
+              f"{format_duration(elapsed)} ({written / elapsed if elapsed > 0 else 0:,.0f} keys/sec)")
+        return written
     
-    @staticmethod
-    def _parse_time(time_str: str) -> int:
-        """Parse time argument."""
-        try:
-            if ':' in time_str:
-                hours, minutes = time_str.split(':')
-                return int(hours) * 3600 + int(minutes) * 60
-            else:
-                return int(time_str) * 3600
-        except ValueError:
-            raise argparse.ArgumentTypeError("Invalid time format")
+    def analyze(self) -> Dict[str, Any]:
+        """Run every analysis over the corpus and print the results."""
+        keys = np.memmap(self.path, dtype=np.uint8, mode='r').reshape(-1, self.RECORD_SIZE)
+        total = len(keys)
+        print(f"Analyzing corpus {self.path}: {total:,} public keys")
+        start_time = time.time()
+        
+        byte_counts = np.zeros((self.RECORD_SIZE, 256), dtype=np.int64)
+        for offset in range(0, total, self.BLOCK_ROWS):
+            block = np.asarray(keys[offset:offset + self.BLOCK_ROWS])
+            for position in range(self.RECORD_SIZE):
+                byte_counts[position] += np.bincount(block[:, position], minlength=256)
+        duplicates = self._count_duplicates(keys, byte_counts[0])
+        elapsed = time.time() - start_time
+        
+        results = {
+            'keys': total,
+            'elapsed': elapsed,
+            'byte_counts': byte_counts,
+            'duplicates': duplicates,
+        }
+        self._print_report(results)
+        return results
     
-    @staticmethod
-    def _parse_batch_size(size_str: str) -> int:
-        """Parse batch size argument."""
-        try:
-            if size_str.lower().endswith('k'):
-                return int(float(size_str[:-1]) * 1000)
-            elif size_str.lower().endswith('m'):
-                return int(float(size_str[:-1]) * 1000000)
-            else:
-                return int(size_str)
-        except ValueError:
-            raise argparse.ArgumentTypeError("Invalid batch size format")
+    def _count_duplicates(self, keys, first_byte_counts) -> int:
+        """Count repeated keys with a partitioned sort under the dedup memory ceiling.
+        
+        Keys are split into node-ID ranges small enough that one range's
+        fingerprints (bytes 1-8 as uint64), row indices and sort order fit in
+        the memory ceiling. Equal fingerprints are then confirmed by comparing
+        the full 32-byte records.
+        """
+        per_range = max(1, self.dedup_memory_mb * 1024 * 1024 // 24)  # fingerprint + index + argsort
+        ranges = []
+        low, in_range = 0, 0
+        for node_id, node_count in enumerate(first_byte_counts):
+            if in_range and in_range + node_count > per_range:
+                ranges.append((low, node_id))
+                low, in_range = node_id, 0
+            in_range += node_count
+        ranges.append((low, 256))
+        
+        duplicates = 0
+        for low, high in ranges:
+            fingerprints, rows = [], []
+            for offset in range(0, len(keys), self.BLOCK_ROWS):
+                block = np.asarray(keys[offset:offset + self.BLOCK_ROWS])
+                selected = np.nonzero((block[:, 0] >= low) & (block[:, 0] < high))[0]
+                fingerprints.append(np.ascontiguousarray(block[selected, 1:9]).view('<u8').ravel())
+                rows.append(selected + offset)
+            fingerprints = np.concatenate(fingerprints)
+            rows = np.concatenate(rows)
+            order = np.argsort(fingerprints, kind='stable')
+            fingerprints = fingerprints[order]
+            rows = rows[order]
+            del order
+            
+            candidates = np.nonzero(fingerprints[1:] == fingerprints[:-1])[0]
+            seen = set()
+            for i in candidates.tolist():
+                first, second = int(rows[i]), int(rows[i + 1])
+                if bytes(keys[first]) == bytes(keys[second]) and second not in seen:
+                    seen.add(second)
+                    duplicates += 1
+        return duplicates
     
     @staticmethod
-    def _get_examples() -> str:
-        return """
-Examples:
-  python meshcore_keygen.py --keys 100         # 100 million keys
-  python meshcore_keygen.py --keys 1b          # 1 billion keys
-  python meshcore_keygen.py --time 2           # 2 hours
-  python meshcore_keygen.py --time 2:30        # 2 hours 30 minutes
-  python meshcore_keygen.py --batch-size 500K  # 500K keys per batch
-  python meshcore_keygen.py --batch-size 2M    # 2M keys per batch
-  python meshcore_keygen.py --workers 4        # Use 4 worker processes
-  python meshcore_keygen.py --workers 8        # Use 8 worker processes
-  python meshcore_keygen.py --watchlist patterns.txt  # Monitor specific patterns file
-  python meshcore_keygen.py --first-two F8     # Keys starting with F8 (auto-loads watchlist.txt)
-  python meshcore_keygen.py --first-two F8 --simple  # Simple mode
-  python meshcore_keygen.py --prefix F8A1      # Keys starting with F8A1
-  python meshcore_keygen.py --four-char        # 4-char vanity (legacy mode)
-  python meshcore_keygen.py --four-char --first-two F8  # 4-char + F8 start
-  python meshcore_keygen.py --pattern-2         # 2-char cosmetic pattern
-  python meshcore_keygen.py --pattern-4         # 4-char cosmetic pattern
-  python meshcore_keygen.py --pattern-6         # 6-char cosmetic pattern
-  python meshcore_keygen.py --pattern-8         # 8-char cosmetic pattern
-  python meshcore_keygen.py --prefix F8 --pattern-8 # Prefix + cosmetic pattern
-  python meshcore_keygen.py --test-compatibility  # Test known MeshCore keys
-  python meshcore_keygen.py --test-distribution 0.1  # Test with 100K keys
-  python meshcore_keygen.py --test-entropy 10  # Test with 10K keys
-  python meshcore_keygen.py --pattern-4 --json  # Generate cosmetic pattern key in JSON format
-  python meshcore_keygen.py --first-two F8 --verbose  # Enable verbose output
-  python meshcore_keygen.py --pattern-6 -v  # Short form for verbose mode
-
-Cosmetic Pattern Modes:
-  --pattern-2: First 2 hex chars == last 2 hex chars OR palindromic
-  --pattern-4: First 4 hex chars == last 4 hex chars OR palindromic  
-  --pattern-6: First 6 hex chars == last 6 hex chars OR palindromic
-  --pattern-8: First 8 hex chars == last 8 hex chars OR palindromic (default)
-  --four-char: Legacy mode with 4-char vanity + optional --first-two constraint
-  --prefix: Keys starting with specific hex prefix (combine with --pattern-*)
-  --simple: Only check first two hex chars (requires --first-two)
+    def chi_square(counts) -> Tuple[float, float]:
+        """Chi-square statistic against a uniform distribution and its p-value.
+        
+        The p-value uses the Wilson-Hilferty normal approximation, which is
+        accurate for the 15 and 255 degrees of freedom used here.
+        """
+        counts = np.asarray(counts, dtype=np.float64)
+        expected = counts.sum() / len(counts)
+        if expected == 0:
+            return 0.0, 1.0
+        statistic = float(((counts - expected) ** 2).sum() / expected)
+        dof = len(counts) - 1
+        z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+        return statistic, 0.5 * math.erfc(z / math.sqrt(2))
+    
+    def _print_report(self, results: Dict[str, Any]):
+        total = results['keys']
+        byte_counts = results['byte_counts']
+        # Hex character 2i is the high nibble of byte i, 2i+1 the low nibble
+        grid = byte_counts.reshape(self.RECORD_SIZE, 16, 16)
+        nibble_counts = np.empty((self.RECORD_SIZE * 2, 16), dtype=np.int64)
+        nibble_counts[0::2] = grid.sum(axis=2)
+        nibble_counts[1::2] = grid.sum(axis=1)
+        
+        print("\n=== BYTE DISTRIBUTION ===")
+        statistic, p_value = self.chi_square(byte_counts.sum(axis=0))
+        print(f"All bytes: chi-square {statistic:,.1f} (255 df), p = {p_value:.4f}")
+        flagged = []
+        for position in range(self.RECORD_SIZE):
+            statistic, p_value = self.chi_square(byte_counts[position])
+            if p_value < self.P_THRESHOLD:
+                flagged.append(f"byte {position} (chi-square {statistic:,.1f}, p = {p_value:.2e})")
+        if flagged:
+            print(f"⚠️  Non-uniform byte positions (p < {self.P_THRESHOLD}):")
+            for entry in flagged:
+                print(f"  {entry}")
+        else:
+            print(f"✓ All {self.RECORD_SIZE} byte positions consistent with uniform (p >= {self.P_THRESHOLD})")
+        
+        print("\n=== HEX CHARACTER (NIBBLE) DISTRIBUTION ===")
+        flagged = []
+        for position in range(len(nibble_counts)):
+            statistic, p_value = self.chi_square(nibble_counts[position])
+            if p_value < self.P_THRESHOLD:
+                flagged.append(f"hex char {position + 1} (chi-square {statistic:,.1f}, p = {p_value:.2e})")
+        if flagged:
+            print(f"⚠️  Non-uniform hex positions (p < {self.P_THRESHOLD}):")
+            for entry in flagged:
+                print(f"  {entry}")
+        else:
+            print(f"✓ All {len(nibble_counts)} hex positions consistent with uniform (p >= {self.P_THRESHOLD})")
+        
+        print("\n=== MESHCORE NODE ID COVERAGE ===")
+        node_counts = byte_counts[0]
+        covered = int(np.count_nonzero(node_counts))
+        print(f"Unique node IDs found: {covered} of 256 ({covered / 256:.1%})")
+        print(f"Keys per node ID: min {int(node_counts.min()):,}, max {int(node_counts.max()):,}, "
+              f"expected {total / 256:,.1f}")
+        statistic, p_value = self.chi_square(node_counts)
+        print(f"Node ID chi-square: {statistic:,.1f} (255 df), p = {p_value:.4f}")
+        missing = [f"{node_id:02X}" for node_id in range(256) if node_counts[node_id] == 0]
+        if missing:
+            print(f"Missing node IDs: {', '.join(missing[:32])}{' ...' if len(missing) > 32 else ''}")
+        
+        print("\n=== DUPLICATES ===")
+        duplicates = results['duplicates']
+        print(f"Repeated keys: {duplicates:,}")
+        if duplicates == 0:
+            print("✓ Excellent: No key collisions detected")
+        else:
+            print("⚠️  Warning: Repeated public keys found in the corpus")
+        
+        elapsed = results['elapsed']
+        print(f"\nAnalyzed {total:,} keys in {format_duration(elapsed)} "
+              f"({total / elapsed if elapsed > 0 else 0:,.0f} keys/sec)")
 
-Batch Processing:
-  Workers now process keys in configurable batches and check in with the main process.
-  This allows for faster termination when a key is found and better resource utilization.
-  Default batch size is 100K keys. Use --batch-size to adjust (e.g., 50K, 500K, 2M).
 
-Watchlist Feature:
-  Use --watchlist to monitor for additional patterns while searching for your primary target.
-  If no --watchlist is specified, the script automatically loads watchlist.txt if it exists.
-  Watchlist keys are automatically saved when found, and the search continues.
-  
-  Watchlist file format (one pattern per line):
-    ABCD...EFGH                    # First 4 chars and last 4 chars
-    ABCD...ABCDEFGH               # First 4 chars and last 8 chars  
-    ABCDEFGH...ABCD               # First 8 chars and last 4 chars
-    ABCD...EFGH|My cool pattern   # With optional description
-    # This is a comment line
-        """
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """HTTP server listening on a Unix domain socket."""
+    daemon_threads = True
 
 
-class MeshCoreKeyGenerator:
-    """Main key generator class."""
+class KeygenDaemon:
+    """Long-running key generation service with a warm worker pool.
     
-    def __init__(self):
+    Jobs are submitted over a small JSON API served on localhost HTTP and/or a
+    Unix socket. The pool stays up between jobs and works in slices of
+    SLICE_SIZE keys: every time a worker frees up, the slice goes to the
+    active job using the smallest share of the pool relative to its priority,
+    so concurrent jobs share the cores in proportion to their priorities.
+    Results are returned through the API and never written to disk. Requests
+    on the HTTP port must carry the bearer token the daemon writes to a 0600
+    token file on start; the Unix socket is protected by its file mode.
+    
+    API:
+        GET    /status                  daemon and pool status
+        GET    /jobs                    list jobs
+        POST   /jobs                    submit {"options": "--prefix F8", "name", "priority", "max_keys", "max_time"}
+        GET    /jobs/ID                 job status
+        GET    /jobs/ID/result?wait=S   key of a finished job, optionally waiting up to S seconds
+        DELETE /jobs/ID                 cancel a job
+    """
+    
+    DEFAULT_PORT = 8765
+    DEFAULT_TOKEN_FILE = os.path.join('~', '.meshcore_keygen_token')
+    SLICE_SIZE = 20000
+    MAX_WAIT = 300
+    MAX_FINISHED_JOBS = 1000
+    
+    def __init__(self, config: VanityConfig, num_workers: int, socket_path: Optional[str] = None,
+                 port: Optional[int] = None, slice_size: int = SLICE_SIZE, token_file: Optional[str] = None):
+        self.config = config
+        self.num_workers = num_workers
+        self.socket_path = socket_path
+        self.port = port
+        self.token_file = os.path.expanduser(token_file or self.DEFAULT_TOKEN_FILE)
+        self.token = None
+        self.slice_size = slice_size
+        self.jobs: Dict[str, KeygenJob] = {}
+        self.lock = threading.Condition()
+        self.stopping = threading.Event()
+        self.servers = []
         self.start_time = None
+        self.total_attempts = 0
+        self.worker_pids = []
+        self.in_flight = {}
+        self.event_log = None
     
-    def generate_vanity_key(self, config: VanityConfig) -> Optional[KeyInfo]:
-        """Generate a vanity key using the specified configuration."""
-        # Load watchlist patterns if specified
-        if config.watchlist_file:
-            config.watchlist_patterns = load_watchlist_patterns(config.watchlist_file)
+    # Job API (called from the HTTP handler threads)
+    
+    def submit(self, request: Dict[str, Any]) -> KeygenJob:
+        """Create a job from a submit request; raises ValueError if the request is invalid."""
+        options = request.get('options')
+        if not isinstance(options, str) or not options.strip():
+            raise ValueError("'options' must be a string of pattern options, e.g. \"--prefix F8 --pattern-4\"")
+        config, args = parse_pattern_options(options)
+        if args.watchlist or args.json:
+            raise ValueError("--watchlist and --json are not supported for daemon jobs")
         
-        num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+        priority = request.get('priority', 1)
+        if not isinstance(priority, int) or isinstance(priority, bool) or not 1 <= priority <= 100:
+            raise ValueError("'priority' must be an integer between 1 and 100")
+        max_keys = request.get('max_keys')
+        if max_keys is not None and (not isinstance(max_keys, int) or max_keys < 1):
+            raise ValueError("'max_keys' must be a positive integer")
+        max_time = request.get('max_time')
+        if max_time is not None and (not isinstance(max_time, (int, float)) or max_time <= 0):
+            raise ValueError("'max_time' must be a positive number of seconds")
         
-        self._print_generation_info(config, num_workers)
+        with self.lock:
+            job_id = secrets.token_hex(4)
+            while job_id in self.jobs:
+                job_id = secrets.token_hex(4)
+            job = KeygenJob(
+                job_id=job_id,
+                name=str(request.get('name') or job_id),
+                options=options.strip(),
+                config=config,
+                priority=priority,
+                max_keys=max_keys,
+                max_time=max_time,
+                probability=calculate_pattern_probability(config),
+                submitted=time.time()
+            )
+            self.jobs[job_id] = job
+            self._trim_finished_jobs()
+            self.lock.notify_all()
         
-        self.start_time = time.time()
+        print(f"Job {job.job_id} ({job.name}) submitted: {describe_pattern(config)}, priority {priority}, "
+              f"probability {format_probability(job.probability)}")
+        self._emit('job_submitted', job=job.to_dict())
+        return job
+    
+    def get(self, job_id: str) -> Optional[KeygenJob]:
+        with self.lock:
+            return self.jobs.get(job_id)
+    
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [job.to_dict() for job in self.jobs.values()]
+    
+    def cancel(self, job_id: str) -> Optional[KeygenJob]:
+        """Cancel a job; slices already running for it finish but are discarded."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is None or not job.active:
+                return job
+            self._finish(job, 'cancelled', "Cancelled by client.")
+        return job
+    
+    def wait(self, job_id: str, timeout: float) -> Optional[KeygenJob]:
+        """Wait up to timeout seconds for a job to finish."""
+        deadline = time.time() + min(max(timeout, 0), self.MAX_WAIT)
+        with self.lock:
+            job = self.jobs.get(job_id)
+            while job is not None and job.active and not self.stopping.is_set():
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                self.lock.wait(remaining)
+            return job
+    
+    def status(self) -> Dict[str, Any]:
+        with self.lock:
+            counts = {}
+            for job in self.jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            busy = sum(job.running_slices for job in self.jobs.values())
+            uptime = time.time() - self.start_time if self.start_time else 0.0
+            return {
+                'workers': self.num_workers,
+                'busy_workers': busy,
+                'worker_pids': self.worker_pids,
+                'slice_size': self.slice_size,
+                'uptime': round(uptime, 3),
+                'total_attempts': self.total_attempts,
+                'keys_per_second': round(self.total_attempts / uptime, 1) if uptime > 0 else 0.0,
+                'jobs': counts,
+            }
+    
+    # Daemon
+    
+    def run(self):
+        """Start the pool and the API servers and schedule jobs until interrupted."""
+        if self.config.events_file:
+            self.event_log = EventLog(self.config.events_file)
+        
+        print("Starting MeshCore keygen daemon...")
+        print(f"Using {self.num_workers} worker processes, {self.slice_size:,} keys per slice")
+        
+        previous_sigterm = None
+        if threading.current_thread() is threading.main_thread():
+            previous_sigterm = signal.signal(signal.SIGTERM, lambda signum, frame: self.stopping.set())
         
         try:
-            return self._run_generation(config, num_workers)
-        except KeyboardInterrupt:
-            print("\n\nKey generation interrupted by user.")
-            self.last_exit_reason = "Key generation was interrupted by user (Ctrl+C)."
+            with ProcessPoolExecutor(max_workers=self.num_workers) as executor:
+                # Start every worker up front so the first job does not pay for process startup
+                warm_up = [executor.submit(worker_warm_up) for _ in range(self.num_workers)]
+                self.worker_pids = sorted(set(future.result() for future in warm_up))
+                self._start_servers()
+                self.start_time = time.time()
+                self._emit('run_start', config=config_to_dict(self.config), workers=self.num_workers,
+                           hardware=get_hardware_info())
+                print("Daemon ready. Press Ctrl+C to stop.")
+                try:
+                    self._schedule(executor)
+                except KeyboardInterrupt:
+                    print("\nDaemon interrupted by user.")
+                finally:
+                    self.stopping.set()
+                    self._stop_servers()
+                    with self.lock:
+                        for job in self.jobs.values():
+                            if job.active:
+                                self._finish(job, 'cancelled', "Daemon shut down.")
+                    # Drop queued slices and wait for the running ones to finish
+                    for future in self.in_flight:
+                        future.cancel()
+                    executor.shutdown(wait=True)
+        finally:
+            if previous_sigterm is not None:
+                signal.signal(signal.SIGTERM, previous_sigterm)
+            self._emit('exit', reason="Daemon stopped.", total_attempts=self.total_attempts)
+            if self.event_log:
+                self.event_log.close()
+        print(f"Daemon stopped after {self.total_attempts:,} keys.")
+    
+    def _schedule(self, executor: ProcessPoolExecutor):
+        """Keep every worker busy with slices of the active jobs."""
+        in_flight = self.in_flight
+        while not self.stopping.is_set():
+            with self.lock:
+                while len(in_flight) < self.num_workers:
+                    job = self._next_job()
+                    if job is None:
+                        break
+                    if job.status == 'queued':
+                        job.status = 'running'
+                        job.started = time.time()
+                    job.running_slices += 1
+                    future = executor.submit(worker_search_slice, job.job_id, job.config, self.slice_size)
+                    in_flight[future] = job.job_id
+                if not in_flight:
+                    # Idle: sleep until a job is submitted
+                    self.lock.wait(0.5)
+                    continue
+            
+            done, _ = concurrent.futures.wait(in_flight, timeout=0.5,
+                                              return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                self._complete_slice(in_flight.pop(future), future)
+            self._check_budgets()
+    
+    def _next_job(self) -> Optional[KeygenJob]:
+        """Pick the active job with the smallest share of the pool relative to its priority."""
+        active = [job for job in self.jobs.values() if job.active]
+        if not active:
             return None
+        return min(active, key=lambda job: (job.running_slices / job.priority, job.submitted))
     
-    def _print_generation_info(self, config: VanityConfig, num_workers: int):
-        """Print information about the generation process."""
-        print("Starting MeshCore Ed25519 key generation...")
-        print(f"Mode: {config.mode.value}")
-        print(f"Using {num_workers} worker processes")
-        print(f"Batch size: {config.batch_size:,} keys per batch")
+    def _complete_slice(self, job_id: str, future: concurrent.futures.Future):
+        try:
+            _, attempts, found = future.result()
+            error = None
+        except Exception as e:
+            attempts, found, error = 0, None, e
         
-        if config.max_iterations:
-            print(f"Max iterations per worker: {config.max_iterations:,}")
-        if config.max_time:
-            print(f"Max runtime: {config.max_time/3600:.1f} hours")
+        with self.lock:
+            self.total_attempts += attempts
+            job = self.jobs.get(job_id)
+            if job is None:
+                return
+            job.running_slices -= 1
+            if not job.active:
+                return  # Cancelled while the slice was running
+            job.attempts += attempts
+            
+            if error is not None:
+                self._finish(job, 'failed', f"Worker failed with exception: {error}")
+            elif found:
+                public_hex, private_hex = found
+                if not Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex):
+                    print(f"⚠️  Job {job.job_id}: generated key failed compatibility check, continuing")
+                    return
+                job.key_info = KeyInfo(
+                    public_hex=public_hex,
+                    private_hex=private_hex,
+                    public_bytes=bytes.fromhex(public_hex),
+                    private_bytes=bytes.fromhex(private_hex),
+                    matching_pattern=public_hex[:8],
+                    first_8_hex=public_hex[:8],
+                    last_8_hex=public_hex[-8:]
+                )
+                self._finish(job, 'done', "Found a matching key.")
+    
+    def _check_budgets(self):
+        with self.lock:
+            now = time.time()
+            for job in self.jobs.values():
+                if not job.active:
+                    continue
+                if job.max_keys and job.attempts >= job.max_keys:
+                    self._finish(job, 'exhausted', f"Reached key budget of {job.max_keys:,} keys.")
+                elif job.max_time and job.started and now - job.started >= job.max_time:
+                    self._finish(job, 'exhausted', f"Reached time budget of {format_duration(job.max_time)}.")
+    
+    def _finish(self, job: KeygenJob, status: str, reason: str):
+        """Move a job to a final state (called with the lock held)."""
+        job.status = status
+        job.reason = reason
+        job.finished = time.time()
+        self.lock.notify_all()
         
-        print("-" * 60)
+        if status == 'done':
+            print(f"✓ Job {job.job_id} ({job.name}) found {job.key_info.public_hex[:8].upper()}... "
+                  f"after {job.attempts:,} keys in {format_duration(job.finished - job.started)}")
+        else:
+            print(f"Job {job.job_id} ({job.name}) {status}: {reason}")
+        self._emit('job_finished', job=job.to_dict())
     
-    def _run_generation(self, config: VanityConfig, num_workers: int) -> Optional[KeyInfo]:
-        """Run the key generation process."""
-        with Manager() as manager:
-            shared_state = manager.dict()
-            shared_state['key_found'] = False
-            shared_state['found_key'] = None
-            shared_state['total_attempts'] = 0
-            shared_state['target_keys'] = config.max_iterations * num_workers if config.max_iterations else None
+    def _trim_finished_jobs(self):
+        """Forget the oldest finished jobs beyond MAX_FINISHED_JOBS (called with the lock held)."""
+        finished = [job_id for job_id, job in self.jobs.items() if not job.active]
+        for job_id in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+    
+    def _emit(self, event: str, **fields):
+        if self.event_log:
+            self.event_log.emit(event, **fields)
+            self.event_log.flush()
+    
+    # HTTP API
+    
+    def _start_servers(self):
+        handler = self._make_handler()
+        if self.port is not None:
+            self._write_token()
+            server = ThreadingHTTPServer(('127.0.0.1', self.port), handler)
+            server.daemon_threads = True
+            self.servers.append(server)
+            print(f"Job API: http://127.0.0.1:{self.port}/jobs")
+            print(f"API token: {self.token_file} (send as 'Authorization: Bearer <token>')")
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)  # Stale socket from a previous run
+            server = _UnixHTTPServer(self.socket_path, handler)
+            os.chmod(self.socket_path, 0o600)  # Results include private keys
+            self.servers.append(server)
+            print(f"Job API: unix socket {self.socket_path}")
+        for server in self.servers:
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+    
+    def _stop_servers(self):
+        for server in self.servers:
+            try:
+                server.shutdown()
+                server.server_close()
+            except Exception:
+                pass
+        self.servers = []
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        if self.token and os.path.exists(self.token_file):
+            os.unlink(self.token_file)
+    
+    def _write_token(self):
+        """Create a new API token and write it to the token file, readable by this user only."""
+        self.token = secrets.token_urlsafe(32)
+        tmp_path = f"{self.token_file}.{os.getpid()}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(self.token + '\n')
+        os.replace(tmp_path, self.token_file)
+    
+    def authorized(self, header: Optional[str]) -> bool:
+        """Check the Authorization header of a request on the HTTP port."""
+        scheme, _, token = (header or '').partition(' ')
+        return bool(self.token) and scheme.lower() == 'bearer' and \
+            secrets.compare_digest(token.strip().encode(), self.token.encode())
+    
+    def _make_handler(self):
+        daemon = self
+        
+        class JobAPIHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if not self._check_token():
+                    return
+                path, query = self._parse_path()
+                if path == ['status']:
+                    self._send(200, daemon.status())
+                elif path == ['jobs']:
+                    self._send(200, {'jobs': daemon.list_jobs()})
+                elif len(path) == 2 and path[0] == 'jobs':
+                    job = daemon.get(path[1])
+                    self._send_job(job, job.to_dict() if job else None)
+                elif len(path) == 3 and path[0] == 'jobs' and path[2] == 'result':
+                    try:
+                        wait = float(query.get('wait', 0))
+                    except ValueError:
+                        self._send(400, {'error': "'wait' must be a number of seconds"})
+                        return
+                    job = daemon.wait(path[1], wait)
+                    if job is None:
+                        self._send(404, {'error': 'unknown job'})
+                    elif job.status == 'done':
+                        self._send(200, job.to_dict(include_key=True))
+                    elif job.active:
+                        self._send(202, job.to_dict())
+                    else:
+                        self._send(410, job.to_dict())
+                else:
+                    self._send(404, {'error': 'not found'})
             
-            # Global health monitoring
-            global_health_monitor = None
-            if config.health_check:
+            def do_POST(self):
+                if not self._check_token():
+                    return
+                path, _ = self._parse_path()
+                if path != ['jobs']:
+                    self._send(404, {'error': 'not found'})
+                    return
                 try:
-                    global_health_monitor = HealthMonitor(-1, config)  # -1 indicates global monitor
-                    if config.verbose:
-                        print("Global health monitoring enabled")
-                except Exception as e:
-                    if config.verbose:
-                        print(f"Failed to initialize global health monitor: {e}")
-            
-            worker_restart_count = 0
-            max_restarts_per_worker = 5
-            worker_restarts = {}
-            
-            # Initialize progress bar for non-verbose mode
-            progress_bar = None
-            if not config.verbose:
-                if config.max_time:
-                    # Time-based progress bar
-                    progress_bar = ProgressBar(time_limit=config.max_time, verbose=config.verbose)
-                elif config.max_iterations:
-                    # Key-based progress bar
-                    total_target_keys = config.max_iterations * num_workers
-                    progress_bar = ProgressBar(total_attempts=total_target_keys, verbose=config.verbose)
-                else:
-                    # Probability-based progress bar (no specific target)
-                    probability = calculate_pattern_probability(config)
-                    progress_bar = ProgressBar(probability=probability, verbose=config.verbose)
+                    length = int(self.headers.get('Content-Length', 0))
+                    request = json.loads(self.rfile.read(length) or b'{}')
+                    if not isinstance(request, dict):
+                        raise ValueError("request body must be a JSON object")
+                    job = daemon.submit(request)
+                except ValueError as e:  # Includes JSON decode errors
+                    self._send(400, {'error': str(e)})
+                    return
+                self._send(201, job.to_dict())
             
-            # Progress tracking for non-verbose mode
-            worker_progress = {}
-            last_progress_update = time.time()
-            progress_update_interval = 1  # Update progress every 1 second for more responsive updates
+            def do_DELETE(self):
+                if not self._check_token():
+                    return
+                path, _ = self._parse_path()
+                if len(path) != 2 or path[0] != 'jobs':
+                    self._send(404, {'error': 'not found'})
+                    return
+                job = daemon.cancel(path[1])
+                self._send_job(job, job.to_dict() if job else None)
             
-            # Flag to stop progress monitoring thread
-            stop_progress_monitor = threading.Event()
+            def _check_token(self) -> bool:
+                # Anyone on the host can reach the TCP port; the Unix socket is mode 0600
+                if isinstance(self.server, _UnixHTTPServer) or daemon.authorized(self.headers.get('Authorization')):
+                    return True
+                self._send(401, {'error': f"missing or invalid bearer token (see {daemon.token_file})"},
+                           {'WWW-Authenticate': 'Bearer'})
+                return False
             
-            def progress_monitor():
-                """Monitor shared state and update progress bar."""
-                while not stop_progress_monitor.is_set():
-                    if not config.verbose and progress_bar:
-                        total_attempts = shared_state.get('total_attempts', 0)
-                        elapsed = time.time() - self.start_time
-                        
-                        # Update progress bar (always update for time-based progress)
-                        rate = total_attempts / elapsed if elapsed > 0 else 0
-                        progress_bar.update(total_attempts, rate)
-                        
-                        # Check if we've reached the target number of keys
-                        target_keys = shared_state.get('target_keys')
-                        if target_keys and total_attempts >= target_keys:
-                            shared_state['key_found'] = True  # Signal workers to stop
-                            break
-                        
-                        # Check if we've reached the time limit
-                        if config.max_time and elapsed >= config.max_time:
-                            shared_state['key_found'] = True  # Signal workers to stop
-                            break
-                    time.sleep(1.0)  # Check every 1.0 seconds for better performance
+            def _parse_path(self) -> Tuple[List[str], Dict[str, str]]:
+                path, _, query = self.path.partition('?')
+                params = dict(part.split('=', 1) for part in query.split('&') if '=' in part)
+                return [part for part in path.split('/') if part], params
             
-            # Start progress monitoring thread
-            progress_thread = threading.Thread(target=progress_monitor, daemon=True)
-            progress_thread.start()
+            def _send_job(self, job: Optional[KeygenJob], data: Optional[Dict[str, Any]]):
+                if job is None:
+                    self._send(404, {'error': 'unknown job'})
+                else:
+                    self._send(200, data)
             
-            with ProcessPoolExecutor(max_workers=num_workers) as executor:
-                futures = []
-                active_workers = set()
-                
-                # Start initial workers
-                for worker_id in range(num_workers):
-                    future = executor.submit(worker_process_batch, worker_id, config, shared_state)
-                    futures.append(future)
-                    active_workers.add(worker_id)
-                
-                try:
-                    while futures:
-                        # Wait for any future to complete
-                        done_futures, _ = concurrent.futures.wait(
-                            futures, 
-                            return_when=concurrent.futures.FIRST_COMPLETED
-                        )
-                        
-                        for future in done_futures:
-                            futures.remove(future)
-                            
-                            try:
-                                result = future.result()
-                                
-                                if result.found_key:
-                                    # Cancel all remaining futures immediately
-                                    for f in futures:
-                                        if not f.done():
-                                            f.cancel()
-                                    
-                                    # Give a small delay for cancellation to take effect
-                                    time.sleep(0.5)
-                                    
-                                    # Stop progress monitoring and close progress bar before printing success
-                                    stop_progress_monitor.set()
-                                    if progress_bar:
-                                        progress_bar.close()
-                                    
-                                    self._print_success(result.found_key, num_workers)
-                                    print("Note: Other workers may continue briefly - this is normal multiprocessing behavior.")
-                                    return result.found_key
-                                
-                                # Check if workers stopped due to reaching target (not finding a key)
-                                if shared_state.get('key_found', False) and not result.found_key:
-                                    # All workers have been signaled to stop due to reaching target
-                                    # Cancel remaining futures
-                                    for f in futures:
-                                        if not f.done():
-                                            f.cancel()
-                                    
-                                    # Stop progress monitoring and close progress bar
-                                    stop_progress_monitor.set()
-                                    if progress_bar:
-                                        progress_bar.close()
-                                    
-                                    # Check if we stopped due to time limit or key target
-                                    elapsed = time.time() - self.start_time
-                                    if config.max_time and elapsed >= config.max_time:
-                                        # Format time limit nicely
-                                        if config.max_time < 3600:  # Less than 1 hour
-                                            minutes = config.max_time // 60
-                                            seconds = config.max_time % 60
-                                            if minutes > 0:
-                                                time_str = f"{minutes}m {seconds}s"
-                                            else:
-                                                time_str = f"{seconds}s"
-                                        else:
-                                            time_str = f"{config.max_time/3600:.1f} hours"
-                                        
-                                        print(f"\nReached time limit of {time_str}.")
-                                        self.last_exit_reason = f"Successfully completed time limit of {time_str} without finding a match."
-                                    else:
-                                        print(f"\nReached target of {shared_state.get('target_keys', 0):,} keys.")
-                                        self.last_exit_reason = f"Successfully completed target of {shared_state.get('target_keys', 0):,} keys without finding a match."
-                                    return None
-                                
-                                # Track worker progress for non-verbose mode
-                                worker_progress[result.worker_id] = result.attempts
-                                
-                                # Update progress bar immediately when worker completes batch
-                                if not config.verbose and progress_bar:
-                                    total_attempts = sum(worker_progress.values())
-                                    elapsed = time.time() - self.start_time
-                                    rate = total_attempts / elapsed if elapsed > 0 else 0
-                                    progress_bar.update(total_attempts, rate)
-                                
-                                # Check if worker needs restart (performance degradation)
-                                if not result.batch_completed and config.health_check:
-                                    # Find which worker this was
-                                    worker_id = result.worker_id
-                                    worker_restarts[worker_id] = worker_restarts.get(worker_id, 0) + 1
-                                    
-                                    if worker_restarts[worker_id] <= max_restarts_per_worker:
-                                        if config.verbose:
-                                            print(f"Restarting worker {worker_id} (restart {worker_restarts[worker_id]}/{max_restarts_per_worker})")
-                                        
-                                        # Start a new worker to replace the failed one
-                                        new_future = executor.submit(worker_process_batch, worker_id, config, shared_state)
-                                        futures.append(new_future)
-                                        
-                                        # Global health check
-                                        if global_health_monitor and config.verbose:
-                                            health_status = global_health_monitor.check_health(0, 0, 0)
-                                            if health_status['warnings']:
-                                                print("Global Health Check:")
-                                                for warning in health_status['warnings']:
-                                                    print(f"  ⚠️  {warning}")
-                                    else:
-                                        if config.verbose:
-                                            print(f"Worker {worker_id} exceeded maximum restarts, continuing with remaining workers")
-                                        active_workers.discard(worker_id)
-                                
-                            except Exception as e:
-                                if config.verbose:
-                                    print(f"Worker failed with exception: {e}")
-                                # Don't restart on exceptions, just continue with remaining workers
-                        
-                        # Progress updates are now handled by the monitoring thread
-                        
-                        # Check if we still have active workers
-                        if not futures and not active_workers:
-                            if not config.verbose:
-                                print("All workers have completed or failed.")
-                            break
-                    
-                    # Stop progress monitoring and close progress bar before printing no match message
-                    stop_progress_monitor.set()
-                    if progress_bar:
-                        progress_bar.close()
-                    
-                    print("\nNo match found after maximum iterations.")
-                    self.last_exit_reason = "No match found after maximum iterations."
-                    return None
-                    
-                except KeyboardInterrupt:
-                    # Stop progress monitoring and close progress bar on interrupt
-                    stop_progress_monitor.set()
-                    if progress_bar:
-                        progress_bar.close()
-                    
-                    # Cancel all workers on interrupt
-                    for f in futures:
-                        if not f.done():
-                            f.cancel()
-                    raise
+            def _send(self, status: int, data: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+                body = (json.dumps(data, indent=2) + '\n').encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def address_string(self):
+                # Unix socket clients have no address
+                return self.client_address[0] if self.client_address else 'unix'
+            
+            def log_message(self, format, *args):
+                pass  # Job events are printed by the daemon itself
+        
+        return JobAPIHandler
 
 
-    def _print_success(self, key_info: KeyInfo, num_workers: int):
-        """Print success information."""
-        elapsed = time.time() - self.start_time
-        
-        print("\n" + "="*60)
-        print("SUCCESS! Found matching Ed25519 key!")
-        print(f"Total time: {elapsed:.1f}s ({elapsed/60:.1f}m)")
-        print("="*60)
+@dataclass
+class ClusterNodeInfo:
+    """A node taking part in a distributed search, as seen by the coordinator."""
+    node_id: int
+    name: str
+    address: str
+    workers: int
+    joined: float
+    last_seen: float
+    attempts: int = 0
+    rate: float = 0.0
+    left: Optional[float] = None
+    hits: int = 0
+
+
+def send_cluster_message(wfile, lock: threading.Lock, message: Dict[str, Any]):
+    """Send one newline-delimited JSON message on a cluster connection."""
+    data = (json.dumps(message) + '\n').encode('utf-8')
+    with lock:
+        wfile.write(data)
+        wfile.flush()
+
+
+def parse_host_port(value: str, default_host: str) -> Tuple[str, int]:
+    """Parse '[HOST:]PORT' into (host, port); raises ValueError if invalid."""
+    host, _, port = value.rpartition(':')
+    port = int(port)
+    if not 1 <= port <= 65535:
+        raise ValueError("port must be between 1 and 65535")
+    return host or default_host, port
+
+
+def is_loopback_host(host: str) -> bool:
+    """Return True if host only accepts connections from this machine."""
+    if host == 'localhost':
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class ClusterCoordinator:
+    """Coordinates a search spread over several hosts.
     
-    def save_keys(self, key_info: KeyInfo) -> Tuple[str, str]:
-        """Save keys to files and return filenames."""
-        key_id = key_info.public_hex[:8].upper()
+    Nodes connect over TCP and exchange newline-delimited JSON messages:
+    the node sends 'hello', receives the pattern as a 'job', and then streams
+    cumulative 'progress' counts and any 'hit' while it runs the normal
+    worker loop. The first verified hit (or the key/time budget) ends the
+    search and a 'stop' is broadcast to every node. Nodes may join or leave
+    at any time; attempts of departed nodes stay in the totals.
+    """
+    
+    PROTOCOL_VERSION = 1
+    NODE_TIMEOUT = 60  # Seconds without a message before a node is dropped
+    
+    def __init__(self, config: VanityConfig, host: str, port: int, total_keys: Optional[int] = None,
+                 token: Optional[str] = None, status_interval: float = 30.0):
+        self.config = config
+        self.host = host
+        self.port = port
+        self.total_keys = total_keys
+        self.token = token
+        self.status_interval = status_interval
+        self.probability = calculate_pattern_probability(config)
+        self.tracker = PerformanceTracker(self.probability)
+        self.generator = MeshCoreKeyGenerator()
+        self.nodes: Dict[int, ClusterNodeInfo] = {}
+        self.connections = {}
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.key_info = None
+        self.found_by = None
+        self.exit_reason = None
+        self.start_time = None
+        self.server = None
+    
+    def total_attempts(self) -> int:
+        with self.lock:
+            return sum(node.attempts for node in self.nodes.values())
+    
+    def combined_rate(self) -> float:
+        with self.lock:
+            return sum(node.rate for node in self.nodes.values() if node.left is None)
+    
+    def run(self) -> Optional[KeyInfo]:
+        """Serve nodes until a key is found or the budget runs out; returns the key."""
+        self.server = socketserver.ThreadingTCPServer((self.host, self.port), self._make_handler(),
+                                                      bind_and_activate=False)
+        self.server.daemon_threads = True
+        self.server.allow_reuse_address = True
+        self.server.server_bind()
+        self.server.server_activate()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
         
-        pub_filename = f"meshcore_{key_id}_public.txt"
-        priv_filename = f"meshcore_{key_id}_private.txt"
+        print("Starting MeshCore distributed search (coordinator)...")
+        print(f"Pattern: {describe_pattern(self.config)} ({format_probability(self.probability)})")
+        print(f"Listening for nodes on {self.host}:{self.port}")
+        if self.total_keys:
+            print(f"Key budget: {self.total_keys:,} keys")
+        if self.config.max_time:
+            print(f"Time budget: {format_duration(self.config.max_time)}")
+        print("-" * 60)
         
-        with open(pub_filename, 'w') as f:
-            f.write(key_info.public_hex)
+        terminated = threading.Event()
+        previous_sigterm = None
+        if threading.current_thread() is threading.main_thread():
+            previous_sigterm = signal.signal(signal.SIGTERM, lambda signum, frame: terminated.set())
         
-        with open(priv_filename, 'w') as f:
-            f.write(key_info.private_hex)
+        self.start_time = time.time()
+        last_status = time.time()
+        try:
+            while not self.stopped.is_set():
+                self.stopped.wait(1.0)
+                elapsed = time.time() - self.start_time
+                if terminated.is_set():
+                    self.stop("Terminated by SIGTERM.")
+                elif self.total_keys and self.total_attempts() >= self.total_keys:
+                    self.stop(f"Reached key budget of {self.total_keys:,} keys.")
+                elif self.config.max_time and elapsed >= self.config.max_time:
+                    self.stop(f"Reached time budget of {format_duration(self.config.max_time)}.")
+                elif time.time() - last_status >= self.status_interval:
+                    self._print_status(elapsed)
+                    last_status = time.time()
+        except KeyboardInterrupt:
+            print("\n\nDistributed search interrupted by user.")
+            self.stop("Interrupted by user (Ctrl+C).")
+        finally:
+            if previous_sigterm is not None:
+                signal.signal(signal.SIGTERM, previous_sigterm)
         
-        return pub_filename, priv_filename
+        # Give the nodes a moment to report their final counts
+        deadline = time.time() + 10
+        while time.time() < deadline and any(node.left is None for node in self.nodes.values()):
+            time.sleep(0.2)
+        self.server.shutdown()
+        self.server.server_close()
+        self._print_summary()
+        return self.key_info
     
-    def save_keys_json(self, key_info: KeyInfo) -> str:
-        """Save keys in JSON format for MeshCore app import."""
-        import json
+    def stop(self, reason: str):
+        """End the search and tell every connected node to stop."""
+        with self.lock:
+            if self.stopped.is_set():
+                return
+            self.exit_reason = reason
+            self.stopped.set()
+            connections = list(self.connections.values())
+        for wfile, send_lock in connections:
+            try:
+                send_cluster_message(wfile, send_lock, {'type': 'stop', 'reason': reason})
+            except OSError:
+                pass
+    
+    def _register(self, hello: Dict[str, Any], address: str, wfile, send_lock) -> ClusterNodeInfo:
+        with self.lock:
+            now = time.time()
+            node = ClusterNodeInfo(
+                node_id=len(self.nodes) + 1,
+                name=str(hello.get('name') or address),
+                address=address,
+                workers=int(hello.get('workers') or 0),
+                joined=now,
+                last_seen=now
+            )
+            self.nodes[node.node_id] = node
+            self.connections[node.node_id] = (wfile, send_lock)
+        print(f"Node {node.node_id} ({node.name}, {address}) joined with {node.workers} workers")
+        return node
+    
+    def _unregister(self, node: ClusterNodeInfo, reason: str):
+        with self.lock:
+            node.left = time.time()
+            node.rate = 0.0
+            self.connections.pop(node.node_id, None)
+        print(f"Node {node.node_id} ({node.name}) left: {reason} ({node.attempts:,} keys)")
+    
+    def _progress(self, node: ClusterNodeInfo, attempts: int):
+        with self.lock:
+            now = time.time()
+            if attempts > node.attempts and now > node.last_seen:
+                # Smooth the per-node rate over successive reports
+                rate = (attempts - node.attempts) / (now - node.last_seen)
+                node.rate = rate if node.rate == 0 else 0.7 * node.rate + 0.3 * rate
+            node.attempts = max(node.attempts, attempts)
+            node.last_seen = now
+    
+    def _hit(self, node: ClusterNodeInfo, public_hex: str, private_hex: str) -> Tuple[bool, str]:
+        """Verify a reported key and end the search with it; returns (accepted, reason)."""
+        if not (KeyValidator.check_vanity_pattern(public_hex, self.config) and
+                Ed25519KeyGenerator.verify_key_compatibility(private_hex, public_hex)):
+            print(f"⚠️  Node {node.node_id} ({node.name}) reported a key that failed verification, ignoring")
+            return False, "key failed verification"
+        with self.lock:
+            node.hits += 1
+            if self.key_info is not None:
+                return False, "search already finished with another key"
+            self.key_info = KeyInfo(
+                public_hex=public_hex,
+                private_hex=private_hex,
+                public_bytes=bytes.fromhex(public_hex),
+                private_bytes=bytes.fromhex(private_hex),
+                matching_pattern=public_hex[:8],
+                first_8_hex=public_hex[:8],
+                last_8_hex=public_hex[-8:]
+            )
+            self.found_by = node
+        print(f"✓ Node {node.node_id} ({node.name}) found {public_hex[:8].upper()}...")
+        self.stop(f"Key found by node {node.node_id} ({node.name}).")
+        return True, "accepted"
+    
+    def _make_handler(self):
+        coordinator = self
         
-        key_id = key_info.public_hex[:8].upper()
-        json_filename = f"meshcore_{key_id}.json"
+        class NodeHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                self.connection.settimeout(ClusterCoordinator.NODE_TIMEOUT)
+                send_lock = threading.Lock()
+                address = f"{self.client_address[0]}:{self.client_address[1]}"
+                try:
+                    hello = json.loads(self.rfile.readline() or b'{}')
+                except (ValueError, OSError):
+                    return
+                error = None
+                if hello.get('type') != 'hello' or hello.get('version') != ClusterCoordinator.PROTOCOL_VERSION:
+                    error = f"expected hello with protocol version {ClusterCoordinator.PROTOCOL_VERSION}"
+                elif coordinator.token and not secrets.compare_digest(
+                        str(hello.get('token') or '').encode(), coordinator.token.encode()):
+                    error = "invalid cluster token"
+                if error:
+                    print(f"Rejected node at {address}: {error}")
+                    send_cluster_message(self.wfile, send_lock, {'type': 'error', 'error': error})
+                    return
+                
+                node = coordinator._register(hello, address, self.wfile, send_lock)
+                if coordinator.stopped.is_set():
+                    send_cluster_message(self.wfile, send_lock, {'type': 'stop', 'reason': coordinator.exit_reason})
+                else:
+                    send_cluster_message(self.wfile, send_lock, {
+                        'type': 'job',
+                        'node_id': node.node_id,
+                        'config': {
+                            'mode': coordinator.config.mode.value,
+                            'target_first_two': coordinator.config.target_first_two,
+                            'target_prefix': coordinator.config.target_prefix,
+                            'vanity_length': coordinator.config.vanity_length,
+                        },
+                    })
+                
+                reason = "disconnected"
+                try:
+                    for line in self.rfile:
+                        message = json.loads(line)
+                        if message.get('type') == 'progress':
+                            coordinator._progress(node, int(message.get('attempts', 0)))
+                        elif message.get('type') == 'hit':
+                            accepted, detail = coordinator._hit(node, message.get('public_key', ''),
+                                                                message.get('private_key', ''))
+                            send_cluster_message(self.wfile, send_lock,
+                                                 {'type': 'hit_ack', 'accepted': accepted, 'reason': detail})
+                except socket.timeout:
+                    reason = f"no message for {ClusterCoordinator.NODE_TIMEOUT}s"
+                except (ValueError, OSError) as e:
+                    reason = f"connection error: {e}"
+                finally:
+                    coordinator._unregister(node, reason)
         
-        meshcore_data = {
-            "public_key": key_info.public_hex,
-            "private_key": key_info.private_hex
-        }
+        return NodeHandler
+    
+    def _print_status(self, elapsed: float):
+        """Print combined progress, ETA and per-node throughput."""
+        attempts = self.total_attempts()
+        rate = self.combined_rate()
+        chance = 1 - math.exp(-self.probability * attempts) if self.probability > 0 else 0.0
+        eta = self.tracker._estimate_eta(attempts, elapsed, rate)
+        with self.lock:
+            nodes = list(self.nodes.values())
+        active = [node for node in nodes if node.left is None]
+        print(f"Progress: {attempts:,} keys | {rate:,.0f} keys/sec | {format_duration(elapsed)} elapsed | "
+              f"{chance:.1%} chance so far | ETA: {eta} | {len(active)} nodes")
+        for node in active:
+            print(f"  node {node.node_id} {node.name:<20} {node.workers:>3} workers | "
+                  f"{node.rate:>10,.0f} keys/sec | {node.attempts:,} keys")
+        if not active:
+            print("  Waiting for nodes to join...")
+    
+    def _print_summary(self):
+        elapsed = time.time() - self.start_time
+        attempts = self.total_attempts()
+        print("\n" + "=" * 60)
+        print("DISTRIBUTED SEARCH COMPLETE")
+        print(f"Total keys: {attempts:,} in {format_duration(elapsed)} "
+              f"({attempts / elapsed if elapsed > 0 else 0:,.0f} keys/sec average)")
+        if self.exit_reason:
+            print(f"Stopped: {self.exit_reason}")
+        print("=" * 60)
+        for node in self.nodes.values():
+            duration = (node.left or time.time()) - node.joined
+            print(f"  node {node.node_id} {node.name:<20} {node.attempts:>16,} keys | "
+                  f"{node.attempts / duration if duration > 0 else 0:>10,.0f} keys/sec | "
+                  f"{format_duration(duration)}")
+
+
+class ClusterNode:
+    """Runs the normal worker loop on behalf of a ClusterCoordinator.
+    
+    The pattern comes from the coordinator; worker count, batch size, health
+    monitoring and watchlist are local settings. Progress is reported every
+    REPORT_INTERVAL seconds and the run stops when the coordinator says so or
+    the connection is lost. A found key that the coordinator does not accept
+    is saved locally instead.
+    """
+    
+    REPORT_INTERVAL = 2.0
+    
+    def __init__(self, config: VanityConfig, host: str, port: int, token: Optional[str] = None,
+                 name: Optional[str] = None):
+        self.config = config
+        self.host = host
+        self.port = port
+        self.token = token
+        self.name = name or platform.node()
+        self.generator = MeshCoreKeyGenerator()
+        self.generator.inline_allowed = False  # _report_progress reads the pool's shared state
+        self.send_lock = threading.Lock()
+        self.hit_ack = queue.Queue()
+        self.sock = None
+        self.wfile = None
+        self.done = threading.Event()
+    
+    def run(self) -> Optional[KeyInfo]:
+        """Join the coordinator and search; returns a found key that must be saved locally."""
+        try:
+            self.sock = socket.create_connection((self.host, self.port), timeout=30)
+        except OSError as e:
+            print(f"Error: Could not connect to coordinator at {self.host}:{self.port}: {e}")
+            return None
+        rfile = self.sock.makefile('rb')
+        self.wfile = self.sock.makefile('wb')
+        num_workers = self.config.num_workers or SystemUtils.get_optimal_worker_count()
         
-        with open(json_filename, 'w') as f:
-            json.dump(meshcore_data, f, indent=2)
+        try:
+            send_cluster_message(self.wfile, self.send_lock, {
+                'type': 'hello', 'version': ClusterCoordinator.PROTOCOL_VERSION,
+                'name': self.name, 'workers': num_workers, 'token': self.token
+            })
+            message = json.loads(rfile.readline() or b'{}')
+        except (ValueError, OSError) as e:
+            print(f"Error: No answer from coordinator: {e}")
+            self.sock.close()
+            return None
+        if message.get('type') != 'job':
+            print(f"Coordinator did not send a job: {message.get('error') or message.get('reason') or message}")
+            self.sock.close()
+            return None
         
-        return json_filename
+        job = message['config']
+        self.config.mode = VanityMode(job['mode'])
+        self.config.target_first_two = job.get('target_first_two')
+        self.config.target_prefix = job.get('target_prefix')
+        self.config.vanity_length = job.get('vanity_length', 8)
+        self.sock.settimeout(None)
+        print(f"Joined coordinator {self.host}:{self.port} as node {message.get('node_id')} ({self.name})")
+        print(f"Pattern: {describe_pattern(self.config)}")
+        
+        threading.Thread(target=self._read_messages, args=(rfile,), daemon=True).start()
+        threading.Thread(target=self._report_progress, daemon=True).start()
+        
+        key_info = None
+        try:
+            key_info = self.generator.generate_vanity_key(self.config)
+        finally:
+            self.done.set()
+            self._send({'type': 'progress', 'attempts': self.generator.total_attempts})
+        
+        if key_info is None:
+            self.sock.close()
+            return None
+        
+        self._send({'type': 'hit', 'public_key': key_info.public_hex, 'private_key': key_info.private_hex})
+        try:
+            ack = self.hit_ack.get(timeout=10)
+        except queue.Empty:
+            ack = {'accepted': False, 'reason': 'no answer from coordinator'}
+        self.sock.close()
+        if ack.get('accepted'):
+            print("Key delivered to the coordinator.")
+            return None
+        print(f"Coordinator did not take the key ({ack.get('reason')}); saving it locally.")
+        return key_info
+    
+    def _send(self, message: Dict[str, Any]) -> bool:
+        try:
+            send_cluster_message(self.wfile, self.send_lock, message)
+            return True
+        except (OSError, ValueError):
+            return False
+    
+    def _read_messages(self, rfile):
+        """Handle stop and hit_ack messages from the coordinator."""
+        try:
+            for line in rfile:
+                message = json.loads(line)
+                if message.get('type') == 'stop':
+                    self.generator.request_stop(f"Coordinator stopped the search: {message.get('reason')}")
+                elif message.get('type') == 'hit_ack':
+                    self.hit_ack.put(message)
+        except (ValueError, OSError):
+            pass
+        if not self.done.is_set():
+            self.generator.request_stop("Lost connection to the coordinator.")
+    
+    def _report_progress(self):
+        while not self.done.wait(self.REPORT_INTERVAL):
+            shared_state = self.generator.shared_state
+            if shared_state is None:
+                continue
+            try:
+                attempts = shared_state.get('total_attempts', 0)
+            except Exception:
+                continue  # The run is shutting down
+            if not self._send({'type': 'progress', 'attempts': attempts}):
+                break
 
 
-def calculate_pattern_probability(config: VanityConfig) -> float:
-    """Calculate the probability of finding the requested pattern."""
-    if config.mode == VanityMode.SIMPLE:
-        # Simple mode: first two hex chars match
-        return 1.0 / 256  # 1 in 256 chance
+def measure_core_rate(config: VanityConfig, seconds: float = 3.0) -> float:
+    """Keys/sec one core sustains generating and checking keys for the configured pattern."""
+    attempts = 0
+    start = time.perf_counter()
+    while True:
+        for _ in range(1000):
+            public_bytes, _ = Ed25519KeyGenerator.generate_meshcore_keypair()
+            KeyValidator.check_vanity_pattern(public_bytes.hex(), config)
+        attempts += 1000
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            return attempts / elapsed
+
+
+class CapacityPlanner:
+    """Time-to-find quantiles and required cores for a pattern, without running a search.
     
-    elif config.mode == VanityMode.PREFIX:
-        # Prefix mode: key starts with specific prefix
-        prefix_length = len(config.target_prefix) if config.target_prefix else 0
-        return 1.0 / (16 ** prefix_length)  # 1 in 16^length chance
-    
-    elif config.mode == VanityMode.VANITY_2:
-        # 2-char vanity: first 2 hex == last 2 hex OR palindromic
-        # Each hex char has 16 possibilities, so 2 chars = 16^2 = 256
-        # We need either direct match OR palindromic match
-        # Probability = 2 / 256 = 1/128
-        return 2.0 / 256
-    
-    elif config.mode == VanityMode.VANITY_4:
-        # 4-char vanity: first 4 hex == last 4 hex OR palindromic
-        # Each hex char has 16 possibilities, so 4 chars = 16^4 = 65,536
-        # We need either direct match OR palindromic match
-        # Probability = 2 / 65,536 = 1/32,768
-        return 2.0 / (16 ** 4)
-    
-    elif config.mode == VanityMode.VANITY_6:
-        # 6-char vanity: first 6 hex == last 6 hex OR palindromic
-        # Each hex char has 16 possibilities, so 6 chars = 16^6 = 16,777,216
-        # We need either direct match OR palindromic match
-        # Probability = 2 / 16,777,216 = 1/8,388,608
-        return 2.0 / (16 ** 6)
-    
-    elif config.mode == VanityMode.VANITY_8:
-        # 8-char vanity: first 8 hex == last 8 hex OR palindromic
-        # Each hex char has 16 possibilities, so 8 chars = 16^8 = 4,294,967,296
-        # We need either direct match OR palindromic match
-        # Probability = 2 / 4,294,967,296 = 1/2,147,483,648
-        return 2.0 / (16 ** 8)
+    Each key matches independently with the exact pattern probability p, so
+    the attempts until the first match are geometric: with k attempts the
+    chance of a match is 1 - (1 - p)^k, and the attempts needed for
+    confidence q are ln(1 - q) / ln(1 - p). Dividing by the keys/sec of the
+    planned capacity gives the time.
+    """
     
-    elif config.mode == VanityMode.FOUR_CHAR:
-        # Legacy 4-char mode with optional first-two constraint
-        base_prob = 2.0 / (16 ** 4)  # 4-char vanity
-        if config.target_first_two:
-            # Additional constraint: first two hex chars must match
-            base_prob *= (1.0 / 256)
-        return base_prob
+    QUANTILES = (0.5, 0.9, 0.99)
     
-    elif config.mode == VanityMode.PREFIX_VANITY:
-        # Prefix + 8-char vanity pattern
-        prefix_length = len(config.target_prefix) if config.target_prefix else 0
-        prefix_prob = 1.0 / (16 ** prefix_length)
-        vanity_prob = 2.0 / (16 ** 8)  # 8-char vanity
-        return prefix_prob * vanity_prob
+    def __init__(self, config: VanityConfig, core_rate: float, workers: int, hosts: int = 1):
+        self.config = config
+        self.probability = calculate_pattern_probability(config)
+        self.core_rate = core_rate
+        self.workers = workers
+        self.hosts = hosts
+        self.total_rate = core_rate * workers * hosts
+    
+    def attempts_for(self, confidence: float) -> float:
+        """Keys to generate for the given chance of at least one match."""
+        if self.probability >= 1:
+            return 1.0
+        return math.log1p(-confidence) / math.log1p(-self.probability)
+    
+    def chance_within(self, attempts: float) -> float:
+        """Chance of at least one match within the given number of keys."""
+        if self.probability >= 1:
+            return 1.0
+        return -math.expm1(attempts * math.log1p(-self.probability))
+    
+    def cores_for(self, deadline: float, confidence: float) -> int:
+        """Cores needed to reach the confidence within deadline seconds."""
+        return max(1, math.ceil(self.attempts_for(confidence) / deadline / self.core_rate))
     
-    else:  # DEFAULT
-        # Default: 8-char vanity with optional first-two constraint
-        base_prob = 2.0 / (16 ** 8)  # 8-char vanity
-        if config.target_first_two:
-            # Additional constraint: first two hex chars must match
-            base_prob *= (1.0 / 256)
-        return base_prob
+    @staticmethod
+    def format_span(seconds: float) -> str:
+        """Format a planning time span, extending format_duration to milliseconds, days and years."""
+        if seconds < 1:
+            return f"{seconds * 1000:.0f}ms"
+        elif seconds < 2 * 86400:
+            return format_duration(seconds)
+        elif seconds < 2 * 365 * 86400:
+            return f"{seconds / 86400:,.1f}d"
+        return f"{seconds / (365 * 86400):,.1f}y"
+    
+    def print_plan(self, rate_source: str, deadline: Optional[int] = None, confidence: float = 0.9):
+        """Print the time-to-find quantiles and, with a deadline, the capacity needed to meet it."""
+        print("=" * 60)
+        print("CAPACITY PLAN")
+        print(f"Pattern: {describe_pattern(self.config)}")
+        print(f"Probability per key: {format_probability(self.probability)}")
+        hosts = f" x {self.hosts} hosts" if self.hosts > 1 else ""
+        print(f"Capacity: {self.core_rate:,.0f} keys/sec per core ({rate_source}) x {self.workers} workers{hosts} "
+              f"= {self.total_rate:,.0f} keys/sec")
+        print("-" * 60)
+        print("Time to find:")
+        for quantile in self.QUANTILES:
+            attempts = self.attempts_for(quantile)
+            label = f"P{quantile * 100:.0f}:"
+            print(f"  {label:<5} {self.format_span(attempts / self.total_rate):>9}  ({attempts:,.0f} keys)")
+        mean = 1 / self.probability
+        print(f"  {'Mean:':<5} {self.format_span(mean / self.total_rate):>9}  ({mean:,.0f} keys)")
+        
+        if deadline:
+            print("-" * 60)
+            chance = self.chance_within(self.total_rate * deadline)
+            print(f"Deadline {format_duration(deadline)}: {chance:.1%} chance with the planned capacity")
+            cores = self.cores_for(deadline, confidence)
+            hosts_needed = math.ceil(cores / self.workers)
+            print(f"For {confidence:.0%} confidence: {cores:,} cores "
+                  f"({hosts_needed:,} host{'s' if hosts_needed != 1 else ''} of {self.workers} workers)")
+        print("=" * 60)
+
+
+def calculate_pattern_probability(config: VanityConfig) -> float:
+    """Calculate the probability of finding the requested pattern (exact, see PatternDifficulty)."""
+    return PatternDifficulty.probability(config)
+
+
+def format_duration(seconds: float) -> str:
+    """Format a duration in seconds as s, m or h."""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    elif seconds < 3600:
+        return f"{seconds/60:.1f}m"
+    else:
+        return f"{seconds/3600:.1f}h"
+
+
+def format_time_limit(max_time: int) -> str:
+    """Format a --time limit in seconds as "Xm Ys", "Ys" or "X.X hours"."""
+    if max_time < 3600:  # Less than 1 hour
+        minutes = max_time // 60
+        seconds = max_time % 60
+        if minutes > 0:
+            return f"{minutes}m {seconds}s"
+        return f"{seconds}s"
+    return f"{max_time/3600:.1f} hours"
 
 
 def format_probability(probability: float) -> str:
@@ -1673,6 +8260,26 @@ def get_system_resources() -> Dict[str, Any]:
         return {}
 
 
+def get_hardware_info() -> Dict[str, Any]:
+    """Describe the host hardware and runtime for telemetry."""
+    info = {
+        'hostname': platform.node(),
+        'system': platform.system(),
+        'release': platform.release(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python': platform.python_version(),
+        'logical_cores': mp.cpu_count()
+    }
+    if PSUTIL_AVAILABLE:
+        try:
+            info['physical_cores'] = psutil.cpu_count(logical=False)
+            info['memory_total'] = psutil.virtual_memory().total
+        except Exception:
+            pass
+    return info
+
+
 def print_system_status():
     """Print current system status."""
     resources = get_system_resources()
@@ -1779,22 +8386,71 @@ def test_meshcore_compatibility():
     print("="*60)
 
 
-def test_first_two_distribution(num_samples: int = 100000):
-    """Test the distribution of first two hex characters (MeshCore node IDs) in Ed25519 public keys."""
-    print(f"Testing distribution of first two hex characters (MeshCore node IDs) in {num_samples:,} Ed25519 keys...")
+def collect_key_statistics(num_samples: int, num_workers: Optional[int] = None, keep_keys: bool = False,
+                           on_keys=None, progress_interval: Optional[int] = None,
+                           progress_format: str = "Progress: {keys:,} keys ({percent:.1f}%)") -> Dict[str, Any]:
+    """Generate num_samples keys across the worker pool and merge their byte counts.
     
-    distribution = {}
-    for i in range(num_samples):
-        result = Ed25519KeyGenerator.generate_single_key(VanityConfig(mode=VanityMode.SIMPLE))
-        if result:
-            first_two_hex = result.public_hex[:2].upper()
-            distribution[first_two_hex] = distribution.get(first_two_hex, 0) + 1
-        
+    Each task counts its node IDs with worker_count_key_bytes (NumPy bincount
+    when available); small runs are counted in-process, where spawning the pool
+    would cost more than the work. If keep_keys is set, on_keys is called
+    with every task's packed public keys. Progress is printed with
+    progress_format every progress_interval keys, so each test keeps its own
+    progress line. Returns the merged first byte counts, the number of keys
+    and the keys/sec rate.
+    """
+    num_workers = num_workers or SystemUtils.get_optimal_worker_count()
+    chunk_size = max(1000, min(50000, num_samples // (num_workers * 4) or 1))
+    chunks = [min(chunk_size, num_samples - start) for start in range(0, num_samples, chunk_size)]
+    stats = {'first': [0] * 256, 'keys': 0}
+    if not progress_interval:
         # Show progress every 10% or every 100,000 keys, whichever is smaller
         progress_interval = min(100000, max(10000, num_samples // 10))
-        if (i + 1) % progress_interval == 0:
-            percentage = ((i + 1) / num_samples) * 100
-            print(f"Progress: {i + 1:,} keys ({percentage:.1f}%)")
+    next_progress = progress_interval
+    start_time = time.time()
+    
+    def merge(result):
+        nonlocal next_progress
+        first_counts, packed = result
+        for value, count in enumerate(first_counts):
+            stats['first'][value] += count
+        stats['keys'] += sum(first_counts)
+        if keep_keys and on_keys:
+            on_keys(packed)
+        while stats['keys'] >= next_progress and next_progress <= num_samples:
+            print(progress_format.format(keys=next_progress, percent=next_progress / num_samples * 100))
+            next_progress += progress_interval
+    
+    if num_samples <= 50000:  # Less work than a second of pool start-up
+        for count in chunks:
+            merge(worker_count_key_bytes(count, keep_keys))
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            pending = set()
+            next_chunk = 0
+            try:
+                while next_chunk < len(chunks) or pending:
+                    while next_chunk < len(chunks) and len(pending) < num_workers * 2:
+                        pending.add(executor.submit(worker_count_key_bytes, chunks[next_chunk], keep_keys))
+                        next_chunk += 1
+                    done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        merge(future.result())
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    stats['elapsed'] = time.time() - start_time
+    stats['rate'] = stats['keys'] / stats['elapsed'] if stats['elapsed'] > 0 else 0.0
+    return stats
+
+
+def test_first_two_distribution(num_samples: int = 100000, num_workers: Optional[int] = None):
+    """Test the distribution of first two hex characters (MeshCore node IDs) in Ed25519 public keys."""
+    print(f"Testing distribution of first two hex characters (MeshCore node IDs) in {num_samples:,} Ed25519 keys...")
+    
+    stats = collect_key_statistics(num_samples, num_workers)
+    distribution = {f"{value:02X}": count for value, count in enumerate(stats['first']) if count}
     
     print(f"\nDistribution of first two hex characters (top 20):")
     sorted_dist = sorted(distribution.items(), key=lambda x: x[1], reverse=True)
@@ -1816,48 +8472,54 @@ def test_first_two_distribution(num_samples: int = 100000):
     if len(found_patterns) > 10:
         sample_patterns = random.sample(found_patterns, 10)
         print(f"Sample of found patterns: {', '.join(sorted(sample_patterns))}")
+    print(f"Generated {stats['keys']:,} keys in {format_duration(stats['elapsed'])} ({stats['rate']:,.0f} keys/sec)")
     
     return distribution
 
 
-def test_entropy_and_randomness(num_samples: int = 10000):
+def test_entropy_and_randomness(num_samples: int = 10000, num_workers: Optional[int] = None,
+                               dedup_memory_mb: int = DuplicateDetector.DEFAULT_MEMORY_MB, dedup_bloom: bool = False,
+                               dedup_dir: Optional[str] = None):
     """Test the entropy and randomness of our Ed25519 key generation process."""
     print(f"Testing entropy and randomness of Ed25519 key generation...")
     print(f"Generating {num_samples:,} keys for analysis...")
     
     # Test 1: Check for repeated keys (should be extremely rare)
-    seen_keys = set()
+    detector = None
     repeated_count = 0
     
-    # Test 2: Analyze byte distribution
-    byte_counts = [0] * 256
-    first_byte_counts = [0] * 256
-    second_byte_counts = [0] * 256
+    if NUMPY_AVAILABLE:
+        # Packed records under a memory ceiling instead of a set of every key
+        detector = DuplicateDetector(dedup_memory_mb, num_samples, dedup_bloom, dedup_dir)
+        on_keys = detector.add
+    else:
+        seen_keys = set()
+        
+        def on_keys(packed: bytes):
+            nonlocal repeated_count
+            for offset in range(0, len(packed), 32):
+                key = packed[offset:offset + 32]
+                if key in seen_keys:
+                    repeated_count += 1
+                seen_keys.add(key)
     
-    for i in range(num_samples):
-        result = Ed25519KeyGenerator.generate_single_key(VanityConfig(mode=VanityMode.SIMPLE))
-        if result:
-            # Check for repeated keys
-            key_hex = result.public_hex
-            if key_hex in seen_keys:
-                repeated_count += 1
-            seen_keys.add(key_hex)
-            
-            # Count byte distributions
-            for j, byte in enumerate(result.public_bytes):
-                byte_counts[byte] += 1
-                if j == 0:
-                    first_byte_counts[byte] += 1
-                elif j == 1:
-                    second_byte_counts[byte] += 1
-        
-        if (i + 1) % 1000 == 0:
-            print(f"Progress: {i + 1:,} keys analyzed...")
+    # Test 2: Analyze first byte distribution
+    try:
+        stats = collect_key_statistics(num_samples, num_workers, keep_keys=True, on_keys=on_keys,
+                                       progress_interval=1000, progress_format="Progress: {keys:,} keys analyzed...")
+        if detector:
+            repeated_count = detector.finish()
+    finally:
+        if detector:
+            detector.close()
+    first_byte_counts = stats['first']
     
     print(f"\n=== ENTROPY TEST RESULTS ===")
     print(f"Total keys generated: {num_samples:,}")
-    print(f"Unique keys: {len(seen_keys):,}")
+    print(f"Unique keys: {num_samples - repeated_count:,}")
     print(f"Repeated keys: {repeated_count}")
+    if detector:
+        print(f"Duplicate check: {detector.describe()}")
     print(f"Collision rate: {repeated_count/num_samples*100:.6f}%")
     
     # Check if we have good entropy (should be close to 0% collision rate)
@@ -1875,22 +8537,16 @@ def test_entropy_and_randomness(num_samples: int = 10000):
     for i, (byte_val, count) in enumerate(sorted_first[:10]):
         percentage = (count / num_samples) * 100
         print(f"  {byte_val:3d} (0x{byte_val:02X}): {count:,} ({percentage:.3f}%)")
+    print(f"\nGenerated {stats['keys']:,} keys in {format_duration(stats['elapsed'])} ({stats['rate']:,.0f} keys/sec)")
 
 
-def test_meshcore_node_id_format(num_samples: int = 1000):
+def test_meshcore_node_id_format(num_samples: int = 1000, num_workers: Optional[int] = None):
     """Test MeshCore node ID format (first two hex characters)."""
     print(f"Testing MeshCore node ID format in {num_samples:,} keys...")
     
-    node_ids = {}
-    for i in range(num_samples):
-        result = Ed25519KeyGenerator.generate_single_key(VanityConfig(mode=VanityMode.SIMPLE))
-        if result:
-            # Get the hex representation for MeshCore node ID
-            node_id = result.public_hex[:2].upper()
-            node_ids[node_id] = node_ids.get(node_id, 0) + 1
-        
-        if (i + 1) % 100 == 0:
-            print(f"Progress: {i + 1:,} keys analyzed...")
+    stats = collect_key_statistics(num_samples, num_workers, progress_interval=100,
+                                   progress_format="Progress: {keys:,} keys analyzed...")
+    node_ids = {f"{value:02X}": count for value, count in enumerate(stats['first']) if count}
     
     print(f"\n=== MESHCORE NODE ID TEST RESULTS ===")
     print(f"Total keys analyzed: {num_samples:,}")
@@ -1907,6 +8563,52 @@ def test_meshcore_node_id_format(num_samples: int = 1000):
     
     # Show expected probability
     print(f"\nExpected probability per node ID: 1 in 256 = {100/256:.3f}%")
+    print(f"Generated {stats['keys']:,} keys in {format_duration(stats['elapsed'])} ({stats['rate']:,.0f} keys/sec)")
+
+
+
+def test_pattern_difficulty(num_samples: int = 1000000, num_workers: Optional[int] = None):
+    """Calibrate PatternDifficulty: compare predicted and observed hit rates on easy patterns."""
+    variants = [
+        ("--simple --first-two A5", VanityConfig(mode=VanityMode.SIMPLE, target_first_two='A5')),
+        ("--prefix 3", VanityConfig(mode=VanityMode.PREFIX, target_prefix='3')),
+        ("--prefix F8", VanityConfig(mode=VanityMode.PREFIX, target_prefix='F8')),
+        ("--pattern-2", VanityConfig(mode=VanityMode.VANITY_2, vanity_length=2)),
+        ("--prefix E --pattern-2", VanityConfig(mode=VanityMode.PREFIX_VANITY, target_prefix='E', vanity_length=2)),
+        ("--pattern-4", VanityConfig(mode=VanityMode.VANITY_4, vanity_length=4)),
+    ]
+    print(f"Calibrating pattern difficulty on {num_samples:,} keys...")
+    
+    hits = [0] * len(variants)
+    
+    def count_hits(packed: bytes):
+        keys_hex = packed.hex()
+        for offset in range(0, len(keys_hex), 64):
+            public_hex = keys_hex[offset:offset + 64]
+            for i, (_, config) in enumerate(variants):
+                if KeyValidator.check_vanity_pattern(public_hex, config):
+                    hits[i] += 1
+    
+    stats = collect_key_statistics(num_samples, num_workers, keep_keys=True, on_keys=count_hits)
+    
+    print("\n=== PATTERN DIFFICULTY CALIBRATION ===")
+    print(f"{'Pattern':<26} {'Probability':>14} {'Expected':>11} {'Observed':>9} {'Ratio':>7} {'z':>6}")
+    outliers = 0
+    for (name, config), observed in zip(variants, hits):
+        probability = calculate_pattern_probability(config)
+        expected = probability * num_samples
+        z = (observed - expected) / math.sqrt(num_samples * probability * (1 - probability))
+        ratio = f"{observed / expected:.3f}" if expected else "-"
+        flag = "  ⚠️" if abs(z) > 3 else ""
+        outliers += abs(z) > 3
+        print(f"{name:<26} {'1 in ' + f'{1 / probability:,.0f}':>14} {expected:>11,.1f} {observed:>9,} "
+              f"{ratio:>7} {z:>6.2f}{flag}")
+    
+    if outliers:
+        print(f"\n⚠️  Warning: {outliers} pattern(s) more than 3 standard deviations from the prediction")
+    else:
+        print("\n✓ All observed hit rates within 3 standard deviations of the predicted probabilities")
+    print(f"Generated {stats['keys']:,} keys in {format_duration(stats['elapsed'])} ({stats['rate']:,.0f} keys/sec)")
 
 
 def main():
@@ -1917,6 +8619,16 @@ def main():
     parser = ArgumentParser.create_parser()
     args = parser.parse_args()
     
+    if args.events == '-':
+        # Keep stdout clean for the event stream; every message goes to stderr
+        with console_to_stderr():
+            run_command(args)
+        return
+    run_command(args)
+
+
+def run_command(args):
+    """Validate the parsed command line and run the mode it selects."""
     # Handle test functions first
     if args.test_compatibility:
         test_meshcore_compatibility()
@@ -1924,17 +8636,50 @@ def main():
     
     if args.test_distribution is not None:
         num_keys_to_test = int(args.test_distribution * 1000000)
-        test_first_two_distribution(num_keys_to_test)
+        test_first_two_distribution(num_keys_to_test, args.workers)
+        return
+    
+    if args.dedup_memory < 1:
+        print("Error: --dedup-memory must be at least 1 MB.")
         return
     
     if args.test_entropy is not None:
         num_keys_to_test = int(args.test_entropy * 1000)
-        test_entropy_and_randomness(num_keys_to_test)
+        test_entropy_and_randomness(num_keys_to_test, args.workers, args.dedup_memory, args.dedup_bloom, args.dedup_dir)
         return
     
     if args.test_meshcore_id is not None:
         num_keys_to_test = int(args.test_meshcore_id * 1000)
-        test_meshcore_node_id_format(num_keys_to_test)
+        test_meshcore_node_id_format(num_keys_to_test, args.workers)
+        return
+    
+    if args.test_difficulty is not None:
+        num_keys_to_test = int(args.test_difficulty * 1000)
+        test_pattern_difficulty(num_keys_to_test, args.workers)
+        return
+    
+    if args.corpus or args.corpus_write or args.corpus_analyze:
+        if not args.corpus or not (args.corpus_write or args.corpus_analyze):
+            print("Error: --corpus requires --corpus-write and/or --corpus-analyze, and both require --corpus.")
+            return
+        if args.corpus_analyze and not NUMPY_AVAILABLE:
+            print("Error: --corpus-analyze requires numpy. Install with: pip install numpy")
+            return
+        if not args.corpus_write and not os.path.isfile(args.corpus):
+            print(f"Error: Corpus file {args.corpus} does not exist; create it with --corpus-write N.")
+            return
+        run_corpus(args)
+        return
+    
+    if args.control_socket and not hasattr(socketserver, 'UnixStreamServer'):
+        print("Error: --control-socket requires Unix domain socket support.")
+        return
+    
+    if args.control_send:
+        if not args.control_socket:
+            print("Error: --control-send requires --control-socket PATH of the running search.")
+            return
+        run_control_send(args)
         return
     
     # Validate arguments
@@ -1966,36 +8711,23 @@ def main():
             print("Error: Maximum batch size is 10 million keys.")
             return
     
-    if args.first_two:
-        # Validate first-two argument
-        if len(args.first_two) != 2:
-            print("Error: --first-two must be exactly 2 characters (e.g., F8)")
-            return
-        try:
-            # Try to convert to int to validate it's valid hex
-            int(args.first_two, 16)
-        except ValueError:
-            print("Error: --first-two must be a valid 2-character hex string (e.g., F8, 1A, 00)")
-            return
-    
-    if args.simple and not args.first_two:
-        print("Error: --simple mode requires --first-two to be specified.")
+    pattern_error = validate_pattern_args(args)
+    if pattern_error:
+        print(f"Error: {pattern_error}")
         return
     
-    if args.prefix:
-        # Validate prefix argument
-        if len(args.prefix) < 1:
-            print("Error: --prefix must be at least 1 character long.")
+    if args.plan:
+        if args.workers is not None and args.workers < 1:
+            print("Error: --workers must be at least 1.")
             return
-        if len(args.prefix) > 8:
-            print("Error: --prefix cannot be longer than 8 characters.")
+        if args.plan_hosts < 1 or (args.plan_rate is not None and args.plan_rate <= 0):
+            print("Error: --plan-hosts must be at least 1 and --plan-rate must be positive.")
             return
-        try:
-            # Try to convert to int to validate it's valid hex
-            int(args.prefix, 16)
-        except ValueError:
-            print("Error: --prefix must be a valid hex string (e.g., F8A1, 1234)")
+        if not 0 < args.plan_confidence < 100:
+            print("Error: --plan-confidence must be between 0 and 100.")
             return
+        run_plan(args)
+        return
     
     if args.workers is not None:
         # Validate workers argument
@@ -2006,12 +8738,155 @@ def main():
             print(f"Error: --workers cannot exceed the number of available CPU cores ({mp.cpu_count()}).")
             return
     
-    # Check for conflicting modes (allow combining --prefix with --pattern-*)
-    pattern_modes = [args.simple, args.four_char, args.pattern_8, args.pattern_4, args.pattern_2, args.pattern_6]
-    pattern_mode_count = sum(pattern_modes)
+    if args.verify_report and not args.verify_dir:
+        print("Error: --verify-report requires --verify-dir.")
+        return
+    
+    if args.verify_dir:
+        if not os.path.isdir(args.verify_dir):
+            print(f"Error: --verify-dir {args.verify_dir} is not a directory.")
+            return
+        run_verify_dir(args)
+        return
+    
+    if args.metrics_port is not None and not 1 <= args.metrics_port <= 65535:
+        print("Error: --metrics-port must be between 1 and 65535.")
+        return
+    
+    if args.profile_window < 1:
+        print("Error: --profile-window must be at least 1 second.")
+        return
+    
+    if args.stage_sample < 0:
+        print("Error: --stage-sample cannot be negative.")
+        return
+    
+    if args.checkpoint_interval < 1:
+        print("Error: --checkpoint-interval must be at least 1 second.")
+        return
+    
+    if (args.checkpoint or args.resume) and (args.orders or args.serve or args.serve_port is not None or
+                                             args.serve_socket or args.coordinator or args.join):
+        print("Error: --checkpoint and --resume only apply to a single-pattern search.")
+        return
+    
+    single_search = not (args.orders or args.mine or args.best is not None or args.bulk is not None or
+                         args.fleet is not None or args.collect is not None or args.serve or
+                         args.serve_port is not None or args.serve_socket or args.coordinator or args.join)
+    if args.control_socket and not single_search:
+        print("Error: --control-socket only applies to a single-pattern search.")
+        return
+    
+    if args.cpu_budget is not None:
+        if not 0 < args.cpu_budget <= 100:
+            print("Error: --cpu-budget must be greater than 0 and at most 100 (percent of all cores).")
+            return
+    if (args.cpu_budget is not None or args.idle_priority) and not single_search:
+        print("Error: --cpu-budget and --idle-priority only apply to a single-pattern search.")
+        return
+    
+    pattern_error = pattern_conflict(args)
+    if pattern_error:
+        print(f"Error: {pattern_error}")
+        return
+    
+    if args.orders:
+        run_multi_order_search(args)
+        return
+    
+    if args.mine or args.inventory_quotas:
+        if not args.mine or not args.inventory:
+            print("Error: --mine requires --inventory, and --inventory-quotas requires --mine.")
+            return
+        if args.best is not None or args.collect is not None or args.fleet is not None or args.bulk is not None or \
+                args.serve or args.serve_port is not None or args.serve_socket or args.coordinator or args.join or \
+                args.checkpoint or args.resume:
+            print("Error: --mine cannot be combined with other search modes.")
+            return
+        run_inventory_mining(args)
+        return
+    
+    if args.best is not None:
+        if args.best < 1:
+            print("Error: --best must be at least 1.")
+            return
+        if args.collect is not None or args.fleet is not None or args.bulk is not None or args.serve or \
+                args.serve_port is not None or args.serve_socket or args.coordinator or args.join or \
+                args.checkpoint or args.resume:
+            print("Error: --best cannot be combined with --collect, --fleet, --bulk, --serve, --coordinator, "
+                  "--join, --checkpoint or --resume.")
+            return
+        if args.score == 'prefix' and not (args.prefix or args.first_two):
+            print("Error: --score prefix requires --prefix or --first-two.")
+            return
+        run_best_search(args)
+        return
+    
+    if args.stdout_raw and args.bulk is None:
+        print("Error: --stdout-raw requires --bulk.")
+        return
+    
+    if args.bulk is not None:
+        if args.keys:
+            print("Error: --bulk sets the key count itself; use --time to bound it instead of --keys.")
+            return
+        if args.fleet is not None or args.collect is not None or args.serve or args.serve_port is not None or \
+                args.serve_socket or args.coordinator or args.join or args.checkpoint or args.resume:
+            print("Error: --bulk cannot be combined with --fleet, --collect, --serve, --coordinator, --join, "
+                  "--checkpoint or --resume.")
+            return
+        if args.stdout_raw and (args.bulk_output or args.events == '-'):
+            print("Error: --stdout-raw writes keys to stdout; drop --bulk-output and send --events to a file.")
+            return
+        run_bulk_generation(args)
+        return
+    
+    if args.fleet is not None:
+        if args.collect is not None or args.serve or args.serve_port is not None or args.serve_socket or \
+                args.coordinator or args.join or args.checkpoint or args.resume:
+            print("Error: --fleet cannot be combined with --collect, --serve, --coordinator, --join, "
+                  "--checkpoint or --resume.")
+            return
+        run_fleet_search(args)
+        return
+    
+    if args.collect is not None:
+        if args.serve or args.serve_port is not None or args.serve_socket or args.coordinator or args.join:
+            print("Error: --collect cannot be combined with --serve, --coordinator or --join.")
+            return
+        if args.checkpoint or args.resume:
+            print("Error: --collect cannot be combined with --checkpoint or --resume.")
+            return
+        run_collect_search(args)
+        return
+    
+    if args.serve or args.serve_port is not None or args.serve_socket:
+        if args.serve_port is not None and not 1 <= args.serve_port <= 65535:
+            print("Error: --serve-port must be between 1 and 65535.")
+            return
+        if args.serve_socket and not hasattr(socketserver, 'UnixStreamServer'):
+            print("Error: --serve-socket requires Unix domain socket support; use --serve-port.")
+            return
+        run_daemon(args)
+        return
+    
+    if args.coordinator and args.join:
+        print("Error: Cannot specify both --coordinator and --join.")
+        return
     
-    if pattern_mode_count > 1:
-        print("Error: Cannot specify multiple pattern modes. Choose one of --simple, --four-char, --pattern-8, --pattern-4, --pattern-2, or --pattern-6.")
+    if args.coordinator or args.join:
+        try:
+            host, port = parse_host_port(args.coordinator or args.join, '127.0.0.1')
+        except ValueError as e:
+            print(f"Error: Invalid address '{args.coordinator or args.join}': {e}")
+            return
+        if args.coordinator and not args.cluster_token and not is_loopback_host(host):
+            print("Error: --coordinator on a non-loopback address requires --cluster-token; "
+                  "any host that can reach the port could otherwise report progress and stop the search.")
+        elif args.coordinator:
+            run_cluster_coordinator(args, host, port)
+        else:
+            run_cluster_node(args, host, port)
         return
     
     # --prefix can be used alone or combined with pattern modes
@@ -2021,6 +8896,20 @@ def main():
     # Create configuration
     config = create_config_from_args(args)
     
+    if args.inventory and not args.resume:
+        key_info = serve_from_inventory(args.inventory, config)
+        if key_info:
+            print_key_result(key_info, MeshCoreKeyGenerator(), args.json)
+            return
+    
+    checkpoint = None
+    if args.checkpoint or args.resume:
+        try:
+            checkpoint = create_checkpoint_from_args(args, config)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+    
     # Show header information
     print("="*60)
     print("MESHCORE Ed25519 VANITY KEY GENERATOR")
@@ -2068,45 +8957,26 @@ def main():
     probability = calculate_pattern_probability(config)
     print(f"Probability of finding a key matching your pattern: {format_probability(probability)}")
     
+    if checkpoint and checkpoint.sessions > 1:
+        remaining = []
+        if checkpoint.total_keys:
+            remaining.append(f"{checkpoint.total_keys - checkpoint.attempts:,} keys")
+        if checkpoint.time_budget:
+            remaining.append(format_duration(checkpoint.remaining_time()))
+        chance = 1 - math.exp(-probability * checkpoint.attempts)
+        print(f"Resuming session {checkpoint.sessions}: {checkpoint.attempts:,} keys already checked in "
+              f"{format_duration(checkpoint.elapsed)} ({chance:.1%} chance reached)")
+        print(f"Remaining budget: {', '.join(remaining) if remaining else 'unlimited'}")
+    
     # Generate key
     generator = MeshCoreKeyGenerator()
+    if checkpoint:
+        generator.checkpoint = checkpoint
+        generator.resume_attempts = checkpoint.attempts
     key_info = generator.generate_vanity_key(config)
     
     if key_info:
-        # Display results
-        print("\nGenerated MeshCore Ed25519 Vanity Key:")
-        print("-" * 40)
-        print(f"Matching Pattern: {key_info.matching_pattern}")
-        print(f"First 8 hex:     {key_info.first_8_hex}")
-        print(f"Last 8 hex:      {key_info.last_8_hex}")
-        print(f"\nPublic Key (hex):\n{key_info.public_hex}")
-        print(f"\nPrivate Key (hex):\n{key_info.private_hex}")
-        
-        # Verify the key works
-        is_valid = Ed25519KeyGenerator.verify_key_compatibility(key_info.private_hex, key_info.public_hex)
-        print(f"\nKey Verification: {'✓ PASS' if is_valid else '✗ FAIL'}")
-        
-        if is_valid:
-            # Save keys
-            if args.json:
-                # Save in JSON format for MeshCore app
-                json_file = generator.save_keys_json(key_info)
-                print(f"\nKeys saved to JSON file for MeshCore app import:")
-                print(f"  {json_file}")
-            else:
-                # Save in text format
-                pub_file, priv_file = generator.save_keys(key_info)
-                print(f"\nKeys saved to:")
-                print(f"  Public:  {pub_file}")
-                print(f"  Private: {priv_file}")
-            
-            node_id = key_info.public_hex[:2].upper()
-            print(f"  Node ID: {node_id}")
-            print("\n⚠️  Keep your private key secure and never share it!")
-            print("\n✓ This Ed25519 key should now work with MeshCore!")
-        else:
-            print("\n⚠️  Warning: Generated key failed verification!")
-            print("This indicates a problem with the key format.")
+        print_key_result(key_info, generator, args.json)
     else:
         # Check if we have a specific reason for the failure
         if hasattr(generator, 'last_exit_reason'):
@@ -2117,9 +8987,380 @@ def main():
             print("You can also try different pattern modes or use --verbose for more details.")
 
 
-def create_config_from_args(args) -> VanityConfig:
-    """Create a VanityConfig from parsed arguments."""
-    # Determine mode and vanity length
+def print_key_result(key_info: KeyInfo, generator: 'MeshCoreKeyGenerator', json_output: bool = False):
+    """Display, verify and save a found key."""
+    # Display results
+    print("\nGenerated MeshCore Ed25519 Vanity Key:")
+    print("-" * 40)
+    print(f"Matching Pattern: {key_info.matching_pattern}")
+    print(f"First 8 hex:     {key_info.first_8_hex}")
+    print(f"Last 8 hex:      {key_info.last_8_hex}")
+    print(f"\nPublic Key (hex):\n{key_info.public_hex}")
+    print(f"\nPrivate Key (hex):\n{key_info.private_hex}")
+    
+    # Verify the key works
+    is_valid = Ed25519KeyGenerator.verify_key_compatibility(key_info.private_hex, key_info.public_hex)
+    print(f"\nKey Verification: {'✓ PASS' if is_valid else '✗ FAIL'}")
+    
+    if is_valid:
+        # Save keys
+        if json_output:
+            # Save in JSON format for MeshCore app
+            json_file = generator.save_keys_json(key_info)
+            print(f"\nKeys saved to JSON file for MeshCore app import:")
+            print(f"  {json_file}")
+        else:
+            # Save in text format
+            pub_file, priv_file = generator.save_keys(key_info)
+            print(f"\nKeys saved to:")
+            print(f"  Public:  {pub_file}")
+            print(f"  Private: {priv_file}")
+    
+        node_id = key_info.public_hex[:2].upper()
+        print(f"  Node ID: {node_id}")
+        print("\n⚠️  Keep your private key secure and never share it!")
+        print("\n✓ This Ed25519 key should now work with MeshCore!")
+    else:
+        print("\n⚠️  Warning: Generated key failed verification!")
+        print("This indicates a problem with the key format.")
+
+
+def run_multi_order_search(args):
+    """Run a multi-order search for the order file given on the command line."""
+    orders = load_orders(args.orders)
+    if not orders:
+        print("Error: No valid orders to search for.")
+        return
+    
+    config = create_config_from_args(args)
+    # Merge the global watchlist with the per-order watchlists
+    patterns = load_watchlist_patterns(config.watchlist_file) if config.watchlist_file else []
+    for order in orders:
+        if order.watchlist_file:
+            patterns.extend(load_watchlist_patterns(order.watchlist_file))
+    unique_patterns = {}
+    for pattern in patterns:
+        unique_patterns.setdefault(pattern.pattern, pattern)
+    config.watchlist_patterns = list(unique_patterns.values())
+    
+    search = MultiOrderSearch(orders, config, total_keys=args.keys)
+    search.run()
+
+
+def run_cluster_coordinator(args, host: str, port: int):
+    """Coordinate a distributed search for the pattern given on the command line."""
+    config = create_config_from_args(args)
+    coordinator = ClusterCoordinator(config, host, port, total_keys=args.keys, token=args.cluster_token)
+    try:
+        key_info = coordinator.run()
+    except OSError as e:
+        print(f"Error: Could not listen on {host}:{port}: {e}")
+        return
+    if key_info:
+        print_key_result(key_info, coordinator.generator, args.json)
+
+
+def run_cluster_node(args, host: str, port: int):
+    """Join a distributed search as a worker node."""
+    config = create_config_from_args(args)
+    node = ClusterNode(config, host, port, token=args.cluster_token, name=args.node_name)
+    key_info = node.run()
+    if key_info:
+        print_key_result(key_info, node.generator, args.json)
+
+
+def run_collect_search(args):
+    """Collect every key matching the pattern given on the command line."""
+    config = create_config_from_args(args)
+    if config.watchlist_file:
+        config.watchlist_patterns = load_watchlist_patterns(config.watchlist_file)
+    output = args.collect_output or f"meshcore_collect_{time.strftime('%Y%m%d_%H%M%S')}.jsonl"
+    search = CollectSearch(config, output, limit=args.collect or None, total_keys=args.keys)
+    if output == '-':
+        # Keep stdout clean for the key records; every message goes to stderr
+        with console_to_stderr():
+            search.run()
+        return
+    search.run()
+
+
+def run_fleet_search(args):
+    """Provision one key per node ID for the slots given on the command line."""
+    config = create_config_from_args(args)
+    if config.watchlist_file:
+        config.watchlist_patterns = load_watchlist_patterns(config.watchlist_file)
+    vanity_n = 0
+    if has_pattern_options(args):
+        vanity_n = OrderMatcher.constraints(config)[1]
+    slots, target = args.fleet
+    output = args.fleet_output or f"meshcore_fleet_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    search = FleetSearch(config, slots, target, output, vanity_n=vanity_n, total_keys=args.keys)
+    search.run()
+
+
+def run_bulk_generation(args):
+    """Generate the number of plain keys given on the command line to the chosen sink."""
+    if args.stdout_raw:
+        # Keep stdout clean for the key stream; every message goes to stderr
+        stream = sys.stdout.buffer
+        with contextlib.redirect_stdout(sys.stderr):
+            config = create_config_from_args(args)
+            writer = BulkKeyWriter(None, args.bulk_format, args.compress, stream=stream)
+            BulkKeyGeneration(config, args.bulk, writer, output=sys.stderr).run()
+        return
+    
+    config = create_config_from_args(args)
+    extension = 'bin' if args.bulk_format == 'bin' else 'jsonl'
+    default = f"meshcore_bulk_{time.strftime('%Y%m%d_%H%M%S')}"
+    output = args.bulk_output or (default if args.bulk_format == 'tree' else f"{default}.{extension}")
+    writer = BulkKeyWriter(output, args.bulk_format, args.compress)
+    BulkKeyGeneration(config, args.bulk, writer).run()
+
+
+def run_verify_dir(args):
+    """Verify every key file under the directory given on the command line."""
+    report_path = args.verify_report or f"meshcore_verify_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    num_workers = args.workers or SystemUtils.get_optimal_worker_count()
+    KeyFileVerifier(args.verify_dir, report_path, num_workers).run()
+
+
+def run_plan(args):
+    """Print the capacity plan for the pattern given on the command line."""
+    config = create_config_from_args(args)
+    # Planned workers may exceed this machine's cores (the plan can be for other hosts)
+    workers = args.workers or SystemUtils.get_optimal_worker_count()
+    if args.plan_rate:
+        core_rate, source = args.plan_rate, "given"
+    else:
+        print("Measuring keys/sec on one core...")
+        core_rate, source = measure_core_rate(config), "measured"
+    planner = CapacityPlanner(config, core_rate, workers, args.plan_hosts)
+    planner.print_plan(source, args.plan_deadline, args.plan_confidence / 100)
+
+
+def run_control_send(args):
+    """Send a --control-send command to a running search and print its reply."""
+    try:
+        reply = send_control_command(args.control_socket, args.control_send)
+    except (OSError, ValueError) as e:
+        print(f"Error: Could not reach the search on {args.control_socket}: {e}")
+        return
+    if not reply.get('ok'):
+        print(f"Error: {reply.get('error')}")
+        return
+    if reply.get('message'):
+        print(reply['message'])
+    status = reply['status']
+    limit = (f"{format_duration(status['time_limit'])} ({format_duration(status['time_remaining'])} left)"
+             if status['time_limit'] else "none")
+    print(f"Pattern:   {status['pattern']} (~{status['expected_keys']:,} expected keys)")
+    print(f"State:     {'paused' if status['paused'] else 'running'}, "
+          f"{status['running_workers']} of {status['workers']} workers running")
+    print(f"Keys:      {status['attempts']:,} at {status['rate']:,.0f} keys/sec")
+    print(f"Elapsed:   {format_duration(status['elapsed'])} ({format_duration(status['paused_time'])} paused)")
+    if status['contention']:
+        print(f"Host:      contended ({status['contention']})")
+    print(f"Budget:    time {limit}, keys "
+          f"{format(status['target_keys'], ',') if status['target_keys'] else 'none'}")
+    if len(status['segments']) > 1:
+        for segment in status['segments']:
+            print(f"  {segment['pattern']}: {segment['attempts']:,} keys")
+    for worker_id, health in sorted(status.get('worker_health', {}).items(), key=lambda item: int(item[0])):
+        rate = f"{health['rate']:,.0f} keys/sec" if health['rate'] is not None else "warming up"
+        print(f"  Worker {worker_id}: {health['status']}, {health['state']}, {rate}, "
+              f"last heartbeat {health['heartbeat_age']:.1f}s ago (pid {health['pid']})")
+
+
+def run_corpus(args):
+    """Write and/or analyze the public-key corpus given on the command line."""
+    corpus = KeyCorpus(args.corpus, args.dedup_memory)
+    if args.corpus_write:
+        num_workers = args.workers or SystemUtils.get_optimal_worker_count()
+        corpus.generate(args.corpus_write, num_workers)
+    if args.corpus_analyze:
+        if os.path.getsize(args.corpus) % KeyCorpus.RECORD_SIZE:
+            print(f"Error: {args.corpus} is not a corpus file (size is not a multiple of "
+                  f"{KeyCorpus.RECORD_SIZE} bytes).")
+            return
+        if corpus.size() == 0:
+            print(f"Error: Corpus {args.corpus} is empty.")
+            return
+        if args.corpus_write:
+            print()
+        corpus.analyze()
+
+
+def run_inventory_mining(args):
+    """Stock the key inventory given on the command line up to its category quotas."""
+    quotas = load_inventory_quotas(args.inventory_quotas)
+    if not quotas:
+        print("Error: No valid inventory categories to mine.")
+        return
+    config = create_config_from_args(args)
+    if config.watchlist_file:
+        config.watchlist_patterns = load_watchlist_patterns(config.watchlist_file)
+    try:
+        inventory = KeyInventory(args.inventory)
+    except sqlite3.Error as e:
+        print(f"Error: Could not open inventory {args.inventory}: {e}")
+        return
+    try:
+        InventoryMiner(inventory, quotas, config, total_keys=args.keys).run()
+    finally:
+        inventory.close()
+
+
+def serve_from_inventory(path: str, config: VanityConfig) -> Optional[KeyInfo]:
+    """Take a key matching the configuration from the inventory; None on a miss or error."""
+    start = time.time()
+    try:
+        inventory = KeyInventory(path)
+        try:
+            key_info = inventory.take(config)
+        finally:
+            inventory.close()
+    except sqlite3.Error as e:
+        print(f"Warning: Could not read inventory {path}: {e}; searching live")
+        return None
+    if key_info:
+        print(f"📦 Served {describe_pattern(config)} from inventory {path} in {(time.time() - start) * 1000:.1f} ms")
+    else:
+        print(f"Inventory {path} has no {describe_pattern(config)} key in stock; searching live")
+    return key_info
+
+
+def run_best_search(args):
+    """Search for the pattern given on the command line, keeping the best near misses."""
+    config = create_config_from_args(args)
+    if config.watchlist_file:
+        config.watchlist_patterns = load_watchlist_patterns(config.watchlist_file)
+    output = args.best_output or f"meshcore_best_{time.strftime('%Y%m%d_%H%M%S')}.json"
+    search = BestSearch(config, args.score, args.best, output, total_keys=args.keys)
+    search.run()
+
+
+def run_daemon(args):
+    """Run the keygen daemon with the API endpoints given on the command line."""
+    config = create_config_from_args(args)
+    port = args.serve_port
+    if port is None and not args.serve_socket:
+        port = KeygenDaemon.DEFAULT_PORT
+    num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+    KeygenDaemon(config, num_workers, socket_path=args.serve_socket, port=port,
+                 token_file=args.serve_token_file).run()
+
+
+def create_checkpoint_from_args(args, config: VanityConfig) -> RunCheckpoint:
+    """Create the checkpoint of a new run, or load the one to resume and apply it to config.
+    
+    Raises ValueError if the run cannot be resumed.
+    """
+    if not args.resume:
+        return RunCheckpoint(args.checkpoint, config, total_keys=args.keys, time_budget=args.time,
+                             interval=args.checkpoint_interval)
+    
+    checkpoint = RunCheckpoint.load(args.resume, config, interval=args.checkpoint_interval)
+    if checkpoint.status == 'found':
+        raise ValueError(f"the search in {args.resume} already found key {checkpoint.public_key}")
+    
+    # Hardware may differ from the host that wrote the checkpoint
+    if args.workers:
+        config.num_workers = args.workers
+    elif config.num_workers and config.num_workers > mp.cpu_count():
+        config.num_workers = None
+    if args.batch_size:
+        config.batch_size = args.batch_size
+    if args.watchlist:
+        config.watchlist_file = args.watchlist
+    if args.checkpoint:
+        checkpoint.path = args.checkpoint
+    
+    # --keys and --time add to what is left of the checkpointed run's budget
+    if args.keys:
+        checkpoint.total_keys = max(checkpoint.total_keys or 0, checkpoint.attempts) + args.keys
+    if args.time:
+        checkpoint.time_budget = max(checkpoint.time_budget or 0, checkpoint.elapsed) + args.time
+    if checkpoint.budget_exhausted():
+        raise ValueError(f"the budget of {args.resume} is used up; pass --keys or --time to extend it")
+    
+    num_workers = config.num_workers or SystemUtils.get_optimal_worker_count()
+    config.max_iterations = checkpoint.total_keys // num_workers if checkpoint.total_keys else None
+    config.max_time = checkpoint.remaining_time()
+    return checkpoint
+
+
+def validate_pattern_args(args) -> Optional[str]:
+    """Validate the pattern options of parsed arguments; returns an error message or None."""
+    if args.first_two:
+        # Validate first-two argument
+        if len(args.first_two) != 2:
+            return "--first-two must be exactly 2 characters (e.g., F8)"
+        try:
+            # Try to convert to int to validate it's valid hex
+            int(args.first_two, 16)
+        except ValueError:
+            return "--first-two must be a valid 2-character hex string (e.g., F8, 1A, 00)"
+    
+    if args.simple and not args.first_two:
+        return "--simple mode requires --first-two to be specified."
+    
+    if args.prefix:
+        # Validate prefix argument
+        if len(args.prefix) < 1:
+            return "--prefix must be at least 1 character long."
+        if len(args.prefix) > 8:
+            return "--prefix cannot be longer than 8 characters."
+        try:
+            # Try to convert to int to validate it's valid hex
+            int(args.prefix, 16)
+        except ValueError:
+            return "--prefix must be a valid hex string (e.g., F8A1, 1234)"
+    
+    # Check for conflicting modes (allow combining --prefix with --pattern-*)
+    pattern_modes = [args.simple, args.four_char, args.pattern_8, args.pattern_4, args.pattern_2, args.pattern_6]
+    if sum(pattern_modes) > 1:
+        return ("Cannot specify multiple pattern modes. Choose one of --simple, --four-char, "
+                "--pattern-8, --pattern-4, --pattern-2, or --pattern-6.")
+    
+    return None
+
+
+def has_pattern_options(args, vanity: bool = True) -> bool:
+    """Return True if parsed arguments select a pattern; --pattern-* only counts if vanity is True."""
+    if args.simple or args.four_char or args.prefix or args.first_two:
+        return True
+    return vanity and any([args.pattern_2, args.pattern_4, args.pattern_6, args.pattern_8])
+
+
+# Modes that take their pattern from elsewhere: (mode is selected, --pattern-* allowed, error)
+PATTERN_CONFLICTS = [
+    (lambda args: args.resume, False,
+     "--resume cannot be combined with pattern options; the pattern comes from the checkpoint."),
+    (lambda args: args.orders, False,
+     "--orders cannot be combined with pattern options; put them in the order file."),
+    (lambda args: args.mine, False,
+     "--mine cannot be combined with pattern options; put them in the quota file."),
+    (lambda args: args.bulk is not None, False,
+     "--bulk generates plain keys and cannot be combined with pattern options."),
+    (lambda args: args.fleet is not None, True,
+     "--fleet sets the first byte itself; only --pattern-* can be combined with it."),
+    (lambda args: args.serve or args.serve_port is not None or args.serve_socket, False,
+     "--serve cannot be combined with pattern options; submit jobs through the API."),
+    (lambda args: args.join, False,
+     "--join cannot be combined with pattern options; the coordinator sets the pattern."),
+]
+
+
+def pattern_conflict(args) -> Optional[str]:
+    """Return the error for a selected mode that rejects the given pattern options, or None."""
+    for selected, vanity_allowed, error in PATTERN_CONFLICTS:
+        if selected(args) and has_pattern_options(args, vanity=not vanity_allowed):
+            return error
+    return None
+
+
+def pattern_mode_from_args(args) -> Tuple[VanityMode, int]:
+    """Determine the vanity mode and pattern length selected by parsed arguments."""
     mode = VanityMode.DEFAULT
     vanity_length = 8  # Default
     
@@ -2169,6 +9410,14 @@ def create_config_from_args(args) -> VanityConfig:
         elif args.pattern_8:
             vanity_length = 8
     
+    return mode, vanity_length
+
+
+def create_config_from_args(args) -> VanityConfig:
+    """Create a VanityConfig from parsed arguments."""
+    # Determine mode and vanity length
+    mode, vanity_length = pattern_mode_from_args(args)
+    
     # Get number of workers (use provided value or auto-detect)
     num_workers = args.workers if args.workers else None
     
@@ -2204,7 +9453,17 @@ def create_config_from_args(args) -> VanityConfig:
         batch_size=batch_size,
         watchlist_file=watchlist_file,
         health_check=args.health_check, # Pass health_check argument
-        verbose=args.verbose # Pass verbose argument
+        verbose=args.verbose, # Pass verbose argument
+        metrics_port=args.metrics_port,
+        metrics_bind=args.metrics_bind,
+        events_file=args.events,
+        profile_dir=args.profile_dir,
+        profile_window=args.profile_window,
+        stage_sample=args.stage_sample,
+        hits_db=args.hits_db,
+        control_socket=args.control_socket,
+        cpu_budget=args.cpu_budget,
+        idle_priority=args.idle_priority
     )
 
 
@@ -0,0 +1,169 @@
+import pytest
+
+import meshcore_keygen as mk
+from meshcore_keygen import HostContention
+
+STAT = """cpu  {user} 0 {system} {idle} 0 0 0 {steal} 0 0
+cpu0 100 0 50 800 0 0 0 0 0 0
+intr 12345
+ctxt 67890
+"""
+
+PRESSURE = """some avg10={some:.2f} avg60=1.00 avg300=0.50 total=123456
+full avg10=0.00 avg60=0.00 avg300=0.00 total=0
+"""
+
+
+@pytest.fixture
+def proc(tmp_path):
+    """A fake /proc with a stat file and a pressure/cpu file."""
+    (tmp_path / 'pressure').mkdir()
+    return tmp_path
+
+
+def write_stat(proc, user=1000, system=500, idle=8000, steal=0):
+    (proc / 'stat').write_text(STAT.format(user=user, system=system, idle=idle, steal=steal))
+
+
+def write_pressure(proc, some):
+    (proc / 'pressure' / 'cpu').write_text(PRESSURE.format(some=some))
+
+
+def test_available_needs_stat(proc):
+    assert not HostContention.available(str(proc))
+    write_stat(proc)
+    assert HostContention.available(str(proc))
+
+
+def test_read_stat_returns_total_and_steal(proc):
+    write_stat(proc, user=1000, system=500, idle=8000, steal=250)
+    assert HostContention(str(proc))._read_stat() == (9750, 250)
+
+
+def test_read_stat_without_steal_column(proc):
+    (proc / 'stat').write_text("cpu  100 0 50 800\n")
+    assert HostContention(str(proc))._read_stat() == (950, 0)
+
+
+@pytest.mark.parametrize('content', [None, "intr 1 2 3\n", "cpu  100 x 50 800\n"])
+def test_read_stat_missing_or_malformed(proc, content):
+    if content is not None:
+        (proc / 'stat').write_text(content)
+    assert HostContention(str(proc))._read_stat() is None
+
+
+def test_read_pressure(proc):
+    write_pressure(proc, 42.5)
+    assert HostContention(str(proc))._read_pressure() == 42.5
+
+
+def test_read_pressure_missing_file(proc):
+    assert HostContention(str(proc))._read_pressure() is None
+
+
+def test_read_pressure_unreadable_file(proc):
+    (proc / 'pressure' / 'cpu').mkdir()  # Opening a directory fails like an unreadable file
+    assert HostContention(str(proc))._read_pressure() is None
+
+
+def test_read_pressure_malformed(proc):
+    (proc / 'pressure' / 'cpu').write_text("some avg10=n/a avg60=1.00\n")
+    assert HostContention(str(proc))._read_pressure() is None
+
+
+def test_sample_measures_steal_since_last_sample(proc):
+    write_stat(proc, user=1000, system=500, idle=8000, steal=0)
+    contention = HostContention(str(proc))
+    write_stat(proc, user=1500, system=700, idle=9000, steal=300)  # 2000 jiffies, 300 stolen
+
+    state = contention.sample(busy_workers=1)
+
+    assert state['steal'] == 0.15
+    assert state['pressure'] is None
+    assert state['contended']
+    assert state['reason'] == "steal time 15%"
+
+
+def test_sample_without_new_jiffies_has_no_steal(proc):
+    write_stat(proc)
+    contention = HostContention(str(proc))
+    state = contention.sample(busy_workers=1)
+    assert state['steal'] is None
+    assert not state['contended']
+
+
+def test_sample_below_thresholds_is_clear(proc):
+    write_stat(proc, steal=0)
+    contention = HostContention(str(proc))
+    write_stat(proc, user=2000, steal=50)
+    write_pressure(proc, 5.0)
+
+    state = contention.sample(busy_workers=1)
+
+    assert not state['contended']
+    assert state['reason'] == ''
+    assert state['pressure'] == 5.0
+
+
+def test_sample_reports_pressure(proc, monkeypatch):
+    monkeypatch.setattr(mk.os, 'cpu_count', lambda: 4)
+    write_stat(proc)
+    write_pressure(proc, 35.0)
+    state = HostContention(str(proc)).sample(busy_workers=4)
+    assert state['contended']
+    assert state['reason'] == "CPU pressure 35%"
+
+
+def test_sample_ignores_pressure_of_oversubscribed_workers(proc, monkeypatch):
+    monkeypatch.setattr(mk.os, 'cpu_count', lambda: 2)
+    write_stat(proc)
+    write_pressure(proc, 80.0)
+
+    state = HostContention(str(proc)).sample(busy_workers=4)
+
+    assert state['pressure'] == 80.0
+    assert not state['contended']
+
+
+def test_sample_without_psi(proc):
+    write_stat(proc)
+    state = HostContention(str(proc)).sample(busy_workers=1)
+    assert state['pressure'] is None
+    assert not state['contended']
+
+
+def test_advise_backs_off_after_sustained_contention(proc):
+    contention = HostContention(str(proc))
+    steps = [contention.advise(True) for _ in range(HostContention.BACKOFF_SAMPLES * 2)]
+    expected = ([0] * (HostContention.BACKOFF_SAMPLES - 1) + [-1]) * 2
+    assert steps == expected
+
+
+def test_advise_resets_on_a_clear_sample(proc):
+    contention = HostContention(str(proc))
+    steps = [contention.advise(contended) for contended in (True, True, False, True, True)]
+    assert steps == [0, 0, 0, 0, 0]
+
+
+def test_advise_never_restores_without_a_back_off(proc):
+    contention = HostContention(str(proc))
+    steps = [contention.advise(False) for _ in range(HostContention.RECOVER_SAMPLES * 2)]
+    assert steps == [0] * (HostContention.RECOVER_SAMPLES * 2)
+
+
+def test_advise_restores_after_sustained_clear_samples(proc):
+    contention = HostContention(str(proc))
+    assert [contention.advise(True) for _ in range(HostContention.BACKOFF_SAMPLES)][-1] == -1
+    contention.backed_off += 1  # As _check_contention does for the step it applied
+
+    steps = [contention.advise(False) for _ in range(HostContention.RECOVER_SAMPLES)]
+    assert steps == [0] * (HostContention.RECOVER_SAMPLES - 1) + [1]
+
+
+def test_current_ignores_stale_or_clear_samples():
+    now = mk.time.time()
+    contended = {'contended': True, 'reason': 'steal time 20%', 'steal': 0.2, 'pressure': None, 'ts': now}
+    assert HostContention.current({'host_contention': contended}) is contended
+    assert HostContention.current({'host_contention': dict(contended, contended=False)}) is None
+    assert HostContention.current({'host_contention': dict(contended, ts=now - 4 * HostContention.INTERVAL)}) is None
+    assert HostContention.current({}) is None
@@ -0,0 +1,115 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+import meshcore_keygen as mk
+from meshcore_keygen import HeartbeatBoard, WorkerWatchdog
+
+pytestmark = pytest.mark.skipif(os.name != 'posix' or not mk.SHARED_MEMORY_AVAILABLE,
+                                reason="needs POSIX signals and shared memory")
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'meshcore_keygen.py')
+
+
+def start_sleeper() -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])
+
+
+def wait_for(condition, timeout: float = 30.0, interval: float = 0.2):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        result = condition()
+        if result:
+            return result
+        time.sleep(interval)
+    raise AssertionError("condition not met within %.0fs" % timeout)
+
+
+@pytest.fixture
+def watchdog():
+    board = HeartbeatBoard.create(2)
+    watchdog = WorkerWatchdog(board)
+    yield watchdog
+    watchdog.close()
+
+
+def beat(watchdog: WorkerWatchdog, worker_id: int, pid: int, attempts: int = 1000):
+    HeartbeatBoard.SLOT.pack_into(watchdog.board.memory.buf, worker_id * HeartbeatBoard.SLOT.size,
+                                  attempts, time.time(), pid, HeartbeatBoard.SEARCHING)
+
+
+def test_unreaped_worker_is_dead(watchdog):
+    child = start_sleeper()
+    try:
+        beat(watchdog, 0, child.pid)
+        assert watchdog.check([0]) == []
+
+        os.kill(child.pid, signal.SIGKILL)  # Not waited for, so it stays a zombie
+        changes = wait_for(lambda: watchdog.check([0]))
+        os.kill(child.pid, 0)  # The pid still exists
+
+        assert [event for event, _, _ in changes] == ['worker_dead']
+        assert changes[0][2]['pid'] == child.pid
+        assert watchdog.dead([0, 1]) == [0]
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_stop_processes_ends_child_workers(watchdog):
+    children = [start_sleeper(), start_sleeper()]
+    try:
+        for worker_id, child in enumerate(children):
+            beat(watchdog, worker_id, child.pid)
+        watchdog.check([0, 1])
+
+        watchdog.stop_processes([0, 1], timeout=2.0)
+
+        assert all(not WorkerWatchdog._alive(child.pid) for child in children)
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+
+def test_killed_pool_worker_is_replaced(tmp_path):
+    events_file = tmp_path / 'events.jsonl'
+    control_socket = str(tmp_path / 'control.sock')
+    shm_before = set(os.listdir('/dev/shm')) if os.path.isdir('/dev/shm') else set()
+    env = dict(os.environ, TMPDIR=str(tmp_path))
+    run = subprocess.Popen([sys.executable, SCRIPT, '--pattern-8', '--workers', '1', '--time', '0:05',
+                            '--events', str(events_file), '--control-socket', control_socket],
+                           cwd=tmp_path, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def worker_pid():
+        try:
+            health = mk.send_control_command(control_socket, 'status')['status']['worker_health']
+        except (OSError, ValueError, KeyError):
+            return None
+        worker = health.get('0')
+        return worker['pid'] if worker and worker['state'] == 'searching' else None
+
+    try:
+        old_pid = wait_for(worker_pid, timeout=60)
+        os.kill(old_pid, signal.SIGKILL)
+        new_pid = wait_for(lambda: (worker_pid() or old_pid) != old_pid and worker_pid())
+        assert WorkerWatchdog._alive(new_pid)
+    finally:
+        run.send_signal(signal.SIGTERM)
+        run.wait(timeout=60)
+
+    events = [json.loads(line) for line in events_file.read_text().splitlines()]
+    dead = [e for e in events if e['event'] == 'worker_dead']
+    assert dead and dead[0]['worker'] == 0 and dead[0]['pid'] == old_pid
+    restarts = [e for e in events if e['event'] == 'pool_restart']
+    assert restarts and restarts[0]['dead_workers'] == [0] and restarts[0]['workers'] == [0]
+
+    # A SIGTERM run leaves neither the heartbeat segment nor the traceback directory behind
+    assert not [name for name in os.listdir(tmp_path) if name.startswith('meshcore-keygen-')]
+    if os.path.isdir('/dev/shm'):
+        assert set(os.listdir('/dev/shm')) <= shm_before